@@ -0,0 +1,19 @@
+"""
+Configuration Gunicorn de l'interface web (voir wsgi.py).
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv("WEB_BIND", "0.0.0.0:5000")
+
+# Workers gevent : requêtes limitées par les appels réseau aux API
+worker_class = "gevent"
+workers = int(os.getenv("WEB_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_connections = 1000
+
+# Recyclage périodique des workers (fuites mémoire éventuelles)
+max_requests = 500
+max_requests_jitter = 200
+
+timeout = 120
@@ -0,0 +1,47 @@
+-- Fonctions de lecture des documents par identifiant et par source
+-- ================================================================
+-- Utilisées par VectorRetriever.get_document_by_id et
+-- get_documents_by_source : requêtes paramétrées dont le plan est mis en
+-- cache par Postgres, et colonnes explicites (sans la colonne embedding,
+-- ~2 à 4 Ko par ligne).
+
+CREATE INDEX IF NOT EXISTS documents_source_idx ON documents (source);
+
+CREATE OR REPLACE FUNCTION get_doc_by_id(doc_id uuid)
+RETURNS TABLE (
+    id uuid,
+    content text,
+    metadata jsonb,
+    source text,
+    chunk_id int,
+    document_id text,
+    created_at timestamptz,
+    updated_at timestamptz
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT d.id, d.content, d.metadata, d.source, d.chunk_id, d.document_id, d.created_at, d.updated_at
+    FROM documents d
+    WHERE d.id = doc_id;
+$$;
+
+CREATE OR REPLACE FUNCTION get_docs_by_source(src text)
+RETURNS TABLE (
+    id uuid,
+    content text,
+    metadata jsonb,
+    source text,
+    chunk_id int,
+    document_id text,
+    created_at timestamptz,
+    updated_at timestamptz
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT d.id, d.content, d.metadata, d.source, d.chunk_id, d.document_id, d.created_at, d.updated_at
+    FROM documents d
+    WHERE d.source = src
+    ORDER BY d.chunk_id;
+$$;
@@ -0,0 +1,30 @@
+-- Export binaire des embeddings en demi-précision
+-- ===============================================
+-- Utilisée par VectorRetriever lorsque la recherche est faite côté client
+-- (fonctions match_documents indisponibles). Chaque embedding est envoyé au
+-- format binaire de pgvector (halfvec_send : dimension sur 2 octets, 2 octets
+-- réservés, puis 2 octets big-endian par composante) au lieu du texte
+-- '[0.0123,...]' : ~4 fois moins d'octets et aucun parsing JSON côté client.
+-- Prérequis : pgvector >= 0.7.
+
+CREATE OR REPLACE FUNCTION get_embeddings_fp16(
+    filter jsonb DEFAULT '{}'
+)
+RETURNS TABLE (
+    id uuid,
+    content text,
+    metadata jsonb,
+    emb bytea
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        d.id,
+        d.content,
+        d.metadata,
+        halfvec_send(d.embedding::halfvec)
+    FROM documents d
+    WHERE d.embedding IS NOT NULL
+      AND d.metadata @> filter;
+$$;
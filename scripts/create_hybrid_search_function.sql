@@ -0,0 +1,58 @@
+-- Fonction de recherche hybride pour Supabase
+-- Combine la similarité vectorielle (pgvector) et le classement plein texte
+-- (ts_rank_cd) par Reciprocal Rank Fusion, en un seul appel RPC.
+-- Les embeddings sont supposés normalisés (voir migrate_inner_product.sql) :
+-- le produit scalaire <#> est alors équivalent au cosinus.
+
+-- Index plein texte utilisé par la branche lexicale
+CREATE INDEX IF NOT EXISTS documents_content_idx
+ON documents USING gin(to_tsvector('french', content));
+
+CREATE OR REPLACE FUNCTION hybrid_search(
+    q_emb vector(1024),
+    q_text text,
+    k int DEFAULT 5,
+    rrf_k int DEFAULT 60
+)
+RETURNS TABLE (
+    id uuid,
+    content text,
+    metadata jsonb,
+    similarity float,
+    rrf float
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH vec AS (
+        SELECT
+            d.id,
+            row_number() OVER (ORDER BY d.embedding <#> q_emb) AS rank_vec
+        FROM documents d
+        ORDER BY d.embedding <#> q_emb
+        LIMIT k * 4
+    ),
+    lexical AS (
+        SELECT
+            d.id,
+            row_number() OVER (
+                ORDER BY ts_rank_cd(to_tsvector('french', d.content), query) DESC
+            ) AS rank_bm25
+        FROM documents d, websearch_to_tsquery('french', q_text) query
+        WHERE to_tsvector('french', d.content) @@ query
+        ORDER BY ts_rank_cd(to_tsvector('french', d.content), query) DESC
+        LIMIT k * 4
+    )
+    SELECT
+        d.id,
+        d.content,
+        d.metadata,
+        -(d.embedding <#> q_emb) AS similarity,
+        COALESCE(1.0 / (rrf_k + lexical.rank_bm25), 0.0)
+            + COALESCE(1.0 / (rrf_k + vec.rank_vec), 0.0) AS rrf
+    FROM vec
+    FULL OUTER JOIN lexical ON vec.id = lexical.id
+    JOIN documents d ON d.id = COALESCE(vec.id, lexical.id)
+    ORDER BY rrf DESC
+    LIMIT k;
+$$;
@@ -0,0 +1,36 @@
+-- Recherche plein texte de secours
+-- ================================
+-- Utilisée par VectorRetriever lorsque l'embedding de la requête est
+-- indisponible, à la place d'un filtre content ILIKE '%...%' : le motif
+-- commençant par un joker impose un parcours complet de la table, alors
+-- que websearch_to_tsquery utilise l'index GIN plein texte et classe les
+-- résultats par pertinence.
+-- Le rang (ts_rank_cd, normalisation 32) est ramené dans [0, 1[.
+
+-- Index plein texte (partagé avec hybrid_search)
+CREATE INDEX IF NOT EXISTS documents_content_idx
+ON documents USING gin(to_tsvector('french', content));
+
+CREATE OR REPLACE FUNCTION text_search(
+    q_text text,
+    k int DEFAULT 5
+)
+RETURNS TABLE (
+    id uuid,
+    content text,
+    metadata jsonb,
+    rank float
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        d.id,
+        d.content,
+        d.metadata,
+        ts_rank_cd(to_tsvector('french', d.content), query, 32) AS rank
+    FROM documents d, websearch_to_tsquery('french', q_text) query
+    WHERE to_tsvector('french', d.content) @@ query
+    ORDER BY rank DESC
+    LIMIT k;
+$$;
@@ -0,0 +1,140 @@
+-- Migration : stockage des embeddings en demi-précision (halfvec)
+-- ===============================================================
+-- Un embedding Mistral (1024 dimensions) passe de 4 Ko (FP32) à 2 Ko (FP16).
+-- Un index HNSW sur la quantification binaire (1 bit par dimension) permet
+-- en plus de présélectionner les candidats par distance de Hamming, puis de
+-- les reclasser avec les embeddings halfvec.
+-- Prérequis : pgvector >= 0.7 et migrate_inner_product.sql appliquée
+-- (embeddings normalisés, recherche par produit scalaire).
+-- Côté client : EMBEDDING_STORAGE_DTYPE=float16 (et ENABLE_BINARY_SEARCH=true
+-- pour la recherche en deux étapes).
+
+-- 1. Conversion de la colonne
+DROP INDEX IF EXISTS documents_embedding_idx;
+DROP INDEX IF EXISTS documents_embedding_ip_idx;
+
+ALTER TABLE documents
+ALTER COLUMN embedding TYPE halfvec(1024) USING embedding::halfvec(1024);
+
+-- 2. Index HNSW sur le produit scalaire en demi-précision
+CREATE INDEX IF NOT EXISTS documents_embedding_half_ip_idx
+ON documents USING hnsw (embedding halfvec_ip_ops);
+
+-- 3. Index HNSW sur la quantification binaire (distance de Hamming)
+CREATE INDEX IF NOT EXISTS documents_embedding_bit_idx
+ON documents USING hnsw ((binary_quantize(embedding)::bit(1024)) bit_hamming_ops);
+
+-- 4. Recherche vectorielle sur la colonne halfvec
+DROP FUNCTION IF EXISTS match_documents(vector, int, float);
+
+CREATE OR REPLACE FUNCTION match_documents(
+    query_embedding halfvec(1024),
+    match_count int DEFAULT 5,
+    match_threshold float DEFAULT 0.7
+)
+RETURNS TABLE (
+    id uuid,
+    content text,
+    metadata jsonb,
+    similarity float
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        d.id,
+        d.content,
+        d.metadata,
+        -(d.embedding <#> query_embedding) as similarity
+    FROM documents d
+    WHERE -(d.embedding <#> query_embedding) > match_threshold
+    ORDER BY d.embedding <#> query_embedding
+    LIMIT match_count;
+END;
+$$;
+
+-- 5. Recherche en deux étapes : Hamming sur les bits, puis produit scalaire
+CREATE OR REPLACE FUNCTION match_documents_binary(
+    query_embedding halfvec(1024),
+    match_count int DEFAULT 5,
+    match_threshold float DEFAULT 0.7,
+    candidate_count int DEFAULT 500
+)
+RETURNS TABLE (
+    id uuid,
+    content text,
+    metadata jsonb,
+    similarity float
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        c.id,
+        c.content,
+        c.metadata,
+        -(c.embedding <#> query_embedding) AS similarity
+    FROM (
+        SELECT d.id, d.content, d.metadata, d.embedding
+        FROM documents d
+        ORDER BY binary_quantize(d.embedding)::bit(1024)
+            <~> binary_quantize(query_embedding)
+        LIMIT candidate_count
+    ) c
+    WHERE -(c.embedding <#> query_embedding) > match_threshold
+    ORDER BY c.embedding <#> query_embedding
+    LIMIT match_count;
+$$;
+
+-- 6. Recherche hybride sur la colonne halfvec
+DROP FUNCTION IF EXISTS hybrid_search(vector, text, int, int);
+
+CREATE OR REPLACE FUNCTION hybrid_search(
+    q_emb halfvec(1024),
+    q_text text,
+    k int DEFAULT 5,
+    rrf_k int DEFAULT 60
+)
+RETURNS TABLE (
+    id uuid,
+    content text,
+    metadata jsonb,
+    similarity float,
+    rrf float
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH vec AS (
+        SELECT
+            d.id,
+            row_number() OVER (ORDER BY d.embedding <#> q_emb) AS rank_vec
+        FROM documents d
+        ORDER BY d.embedding <#> q_emb
+        LIMIT k * 4
+    ),
+    lexical AS (
+        SELECT
+            d.id,
+            row_number() OVER (
+                ORDER BY ts_rank_cd(to_tsvector('french', d.content), query) DESC
+            ) AS rank_bm25
+        FROM documents d, websearch_to_tsquery('french', q_text) query
+        WHERE to_tsvector('french', d.content) @@ query
+        ORDER BY ts_rank_cd(to_tsvector('french', d.content), query) DESC
+        LIMIT k * 4
+    )
+    SELECT
+        d.id,
+        d.content,
+        d.metadata,
+        -(d.embedding <#> q_emb) AS similarity,
+        COALESCE(1.0 / (rrf_k + lexical.rank_bm25), 0.0)
+            + COALESCE(1.0 / (rrf_k + vec.rank_vec), 0.0) AS rrf
+    FROM vec
+    FULL OUTER JOIN lexical ON vec.id = lexical.id
+    JOIN documents d ON d.id = COALESCE(vec.id, lexical.id)
+    ORDER BY rrf DESC
+    LIMIT k;
+$$;
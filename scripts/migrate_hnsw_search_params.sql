@@ -0,0 +1,116 @@
+-- Migration : paramètres de recherche HNSW par requête
+-- ===================================================
+-- Un parcours d'index HNSW ne renvoie au plus que hnsw.ef_search candidats
+-- (40 par défaut) avant l'application des clauses WHERE :
+-- - match_documents_binary demandait candidate_count (500) candidats à
+--   l'index binaire, mais n'en recevait que 40 ;
+-- - avec un filtre sur les métadonnées, les candidats écartés par le filtre
+--   ne sont pas remplacés et la recherche peut renvoyer moins de
+--   match_count documents.
+-- Les fonctions fixent donc hnsw.ef_search pour la transaction en cours
+-- (au moins candidate_count pour la présélection binaire) et activent le
+-- parcours itératif de l'index lorsqu'un filtre est fourni.
+-- Les embeddings étant normalisés côté client, le classement reste un
+-- produit scalaire. Comme migrate_metadata_filter.sql, les fonctions sont
+-- créées pour le type de la colonne embedding en place (vector ou halfvec).
+-- Prérequis : migrate_metadata_filter.sql appliquée, pgvector >= 0.8
+-- (hnsw.iterative_scan).
+-- Côté client : HNSW_EF_SEARCH=<valeur> pour transmettre ef_search.
+
+DO $migration$
+DECLARE
+    emb_type text;
+BEGIN
+    -- Type de la colonne embedding : 'vector' ou 'halfvec'
+    SELECT t.typname INTO emb_type
+    FROM pg_attribute a
+    JOIN pg_type t ON t.oid = a.atttypid
+    WHERE a.attrelid = 'documents'::regclass
+      AND a.attname = 'embedding';
+
+    -- 1. Recherche vectorielle filtrée
+    EXECUTE format('DROP FUNCTION IF EXISTS match_documents(%s, int, float, jsonb)', emb_type);
+    EXECUTE format($fn$
+        CREATE OR REPLACE FUNCTION match_documents(
+            query_embedding %1$s(1024),
+            match_count int DEFAULT 5,
+            match_threshold float DEFAULT 0.7,
+            filter jsonb DEFAULT '{}',
+            ef_search int DEFAULT 40
+        )
+        RETURNS TABLE (
+            id uuid,
+            content text,
+            metadata jsonb,
+            similarity float
+        )
+        LANGUAGE plpgsql
+        AS $body$
+        BEGIN
+            PERFORM set_config('hnsw.ef_search', greatest(ef_search, match_count)::text, true);
+            IF filter <> '{}' THEN
+                PERFORM set_config('hnsw.iterative_scan', 'relaxed_order', true);
+            END IF;
+
+            RETURN QUERY
+            SELECT
+                d.id,
+                d.content,
+                d.metadata,
+                -(d.embedding <#> query_embedding)::float AS similarity
+            FROM documents d
+            WHERE d.metadata @> filter
+              AND -(d.embedding <#> query_embedding) > match_threshold
+            ORDER BY d.embedding <#> query_embedding
+            LIMIT match_count;
+        END;
+        $body$
+    $fn$, emb_type);
+
+    -- 2. Recherche en deux étapes filtrée
+    EXECUTE format('DROP FUNCTION IF EXISTS match_documents_binary(%s, int, float, int, jsonb)', emb_type);
+    EXECUTE format($fn$
+        CREATE OR REPLACE FUNCTION match_documents_binary(
+            query_embedding %1$s(1024),
+            match_count int DEFAULT 5,
+            match_threshold float DEFAULT 0.7,
+            candidate_count int DEFAULT 500,
+            filter jsonb DEFAULT '{}',
+            ef_search int DEFAULT 40
+        )
+        RETURNS TABLE (
+            id uuid,
+            content text,
+            metadata jsonb,
+            similarity float
+        )
+        LANGUAGE plpgsql
+        AS $body$
+        BEGIN
+            PERFORM set_config('hnsw.ef_search', greatest(ef_search, candidate_count)::text, true);
+            IF filter <> '{}' THEN
+                PERFORM set_config('hnsw.iterative_scan', 'relaxed_order', true);
+            END IF;
+
+            RETURN QUERY
+            SELECT
+                c.id,
+                c.content,
+                c.metadata,
+                -(c.embedding <#> query_embedding)::float AS similarity
+            FROM (
+                SELECT d.id, d.content, d.metadata, d.embedding
+                FROM documents d
+                WHERE d.metadata @> filter
+                ORDER BY binary_quantize(d.embedding)::bit(1024)
+                    <~> binary_quantize(query_embedding)
+                LIMIT candidate_count
+            ) c
+            WHERE -(c.embedding <#> query_embedding) > match_threshold
+            ORDER BY c.embedding <#> query_embedding
+            LIMIT match_count;
+        END;
+        $body$
+    $fn$, emb_type);
+END
+$migration$;
@@ -0,0 +1,44 @@
+-- Migration : embeddings normalisés et recherche par produit scalaire
+-- ===================================================================
+-- Le client (VectorRetriever) stocke désormais des embeddings de norme 1.
+-- Pour des vecteurs unitaires, cosinus = produit scalaire : on peut donc
+-- utiliser l'opérateur <#> (produit scalaire négatif) et un index HNSW
+-- vector_ip_ops, plus rapide que la distance cosinus.
+
+-- 1. Normaliser les embeddings déjà présents (pgvector >= 0.7)
+UPDATE documents
+SET embedding = l2_normalize(embedding)
+WHERE embedding IS NOT NULL;
+
+-- 2. Remplacer l'index cosinus par un index HNSW sur le produit scalaire
+DROP INDEX IF EXISTS documents_embedding_idx;
+CREATE INDEX IF NOT EXISTS documents_embedding_ip_idx
+ON documents USING hnsw (embedding vector_ip_ops);
+
+-- 3. Recherche vectorielle par produit scalaire
+CREATE OR REPLACE FUNCTION match_documents(
+    query_embedding vector(1024),
+    match_count int DEFAULT 5,
+    match_threshold float DEFAULT 0.7
+)
+RETURNS TABLE (
+    id uuid,
+    content text,
+    metadata jsonb,
+    similarity float
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        d.id,
+        d.content,
+        d.metadata,
+        -(d.embedding <#> query_embedding) as similarity
+    FROM documents d
+    WHERE -(d.embedding <#> query_embedding) > match_threshold
+    ORDER BY d.embedding <#> query_embedding
+    LIMIT match_count;
+END;
+$$;
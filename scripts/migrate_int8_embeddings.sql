@@ -0,0 +1,37 @@
+-- Migration : copie int8 des embeddings pour la recherche côté client
+-- ===================================================================
+-- pgvector n'a pas de type vectoriel int8 : la colonne embedding (vector ou
+-- halfvec) reste la référence pour les index HNSW. Cette migration ajoute une
+-- copie quantifiée en int8 avec une échelle par vecteur (1 octet par
+-- dimension, 1 Ko pour 1024 dimensions), lue par VectorRetriever lorsque la
+-- recherche est faite côté client.
+-- Côté client : STORE_INT8_EMBEDDINGS=true, puis réinsérer les documents
+-- existants avec VectorRetriever.add_documents pour remplir les colonnes.
+
+ALTER TABLE documents
+ADD COLUMN IF NOT EXISTS embedding_i8 bytea,
+ADD COLUMN IF NOT EXISTS embedding_scale real;
+
+CREATE OR REPLACE FUNCTION get_embeddings_int8(
+    filter jsonb DEFAULT '{}'
+)
+RETURNS TABLE (
+    id uuid,
+    content text,
+    metadata jsonb,
+    emb bytea,
+    scale real
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        d.id,
+        d.content,
+        d.metadata,
+        d.embedding_i8,
+        d.embedding_scale
+    FROM documents d
+    WHERE d.embedding_i8 IS NOT NULL
+      AND d.metadata @> filter;
+$$;
@@ -0,0 +1,151 @@
+-- Migration : filtres sur les métadonnées dans la recherche vectorielle
+-- ====================================================================
+-- Les filtres passés à VectorRetriever.retrieve sont appliqués côté
+-- Postgres (metadata @> filter) : seuls les top-k documents correspondants
+-- quittent la base, au lieu de filtrer les résultats côté client.
+-- Les fonctions sont créées pour le type de la colonne embedding en place
+-- (vector par défaut, halfvec après migrate_halfvec.sql) : relancer ce
+-- script après avoir changé le type de la colonne.
+-- Prérequis : migrate_inner_product.sql appliquée (embeddings normalisés).
+
+-- 1. Index GIN pour l'opérateur de containment JSONB
+CREATE INDEX IF NOT EXISTS documents_metadata_idx
+ON documents USING gin (metadata jsonb_path_ops);
+
+DO $migration$
+DECLARE
+    emb_type text;
+BEGIN
+    -- Type de la colonne embedding : 'vector' ou 'halfvec'
+    SELECT t.typname INTO emb_type
+    FROM pg_attribute a
+    JOIN pg_type t ON t.oid = a.atttypid
+    WHERE a.attrelid = 'documents'::regclass
+      AND a.attname = 'embedding';
+
+    -- 2. Recherche vectorielle filtrée
+    EXECUTE format('DROP FUNCTION IF EXISTS match_documents(%s, int, float)', emb_type);
+    EXECUTE format($fn$
+        CREATE OR REPLACE FUNCTION match_documents(
+            query_embedding %1$s(1024),
+            match_count int DEFAULT 5,
+            match_threshold float DEFAULT 0.7,
+            filter jsonb DEFAULT '{}'
+        )
+        RETURNS TABLE (
+            id uuid,
+            content text,
+            metadata jsonb,
+            similarity float
+        )
+        LANGUAGE sql
+        STABLE
+        AS $body$
+            SELECT
+                d.id,
+                d.content,
+                d.metadata,
+                -(d.embedding <#> query_embedding) AS similarity
+            FROM documents d
+            WHERE d.metadata @> filter
+              AND -(d.embedding <#> query_embedding) > match_threshold
+            ORDER BY d.embedding <#> query_embedding
+            LIMIT match_count;
+        $body$
+    $fn$, emb_type);
+
+    -- 3. Recherche en deux étapes filtrée
+    EXECUTE format('DROP FUNCTION IF EXISTS match_documents_binary(%s, int, float, int)', emb_type);
+    EXECUTE format($fn$
+        CREATE OR REPLACE FUNCTION match_documents_binary(
+            query_embedding %1$s(1024),
+            match_count int DEFAULT 5,
+            match_threshold float DEFAULT 0.7,
+            candidate_count int DEFAULT 500,
+            filter jsonb DEFAULT '{}'
+        )
+        RETURNS TABLE (
+            id uuid,
+            content text,
+            metadata jsonb,
+            similarity float
+        )
+        LANGUAGE sql
+        STABLE
+        AS $body$
+            SELECT
+                c.id,
+                c.content,
+                c.metadata,
+                -(c.embedding <#> query_embedding) AS similarity
+            FROM (
+                SELECT d.id, d.content, d.metadata, d.embedding
+                FROM documents d
+                WHERE d.metadata @> filter
+                ORDER BY binary_quantize(d.embedding)::bit(1024)
+                    <~> binary_quantize(query_embedding)
+                LIMIT candidate_count
+            ) c
+            WHERE -(c.embedding <#> query_embedding) > match_threshold
+            ORDER BY c.embedding <#> query_embedding
+            LIMIT match_count;
+        $body$
+    $fn$, emb_type);
+
+    -- 4. Recherche hybride filtrée
+    EXECUTE format('DROP FUNCTION IF EXISTS hybrid_search(%s, text, int, int)', emb_type);
+    EXECUTE format($fn$
+        CREATE OR REPLACE FUNCTION hybrid_search(
+            q_emb %1$s(1024),
+            q_text text,
+            k int DEFAULT 5,
+            rrf_k int DEFAULT 60,
+            filter jsonb DEFAULT '{}'
+        )
+        RETURNS TABLE (
+            id uuid,
+            content text,
+            metadata jsonb,
+            similarity float,
+            rrf float
+        )
+        LANGUAGE sql
+        STABLE
+        AS $body$
+            WITH vec AS (
+                SELECT
+                    d.id,
+                    row_number() OVER (ORDER BY d.embedding <#> q_emb) AS rank_vec
+                FROM documents d
+                WHERE d.metadata @> filter
+                ORDER BY d.embedding <#> q_emb
+                LIMIT k * 4
+            ),
+            lexical AS (
+                SELECT
+                    d.id,
+                    row_number() OVER (
+                        ORDER BY ts_rank_cd(to_tsvector('french', d.content), query) DESC
+                    ) AS rank_bm25
+                FROM documents d, websearch_to_tsquery('french', q_text) query
+                WHERE to_tsvector('french', d.content) @@ query
+                  AND d.metadata @> filter
+                ORDER BY ts_rank_cd(to_tsvector('french', d.content), query) DESC
+                LIMIT k * 4
+            )
+            SELECT
+                d.id,
+                d.content,
+                d.metadata,
+                -(d.embedding <#> q_emb) AS similarity,
+                COALESCE(1.0 / (rrf_k + lexical.rank_bm25), 0.0)
+                    + COALESCE(1.0 / (rrf_k + vec.rank_vec), 0.0) AS rrf
+            FROM vec
+            FULL OUTER JOIN lexical ON vec.id = lexical.id
+            JOIN documents d ON d.id = COALESCE(vec.id, lexical.id)
+            ORDER BY rrf DESC
+            LIMIT k;
+        $body$
+    $fn$, emb_type);
+END
+$migration$;
@@ -0,0 +1,20 @@
+"""
+Module de cache
+===============
+
+Ce module contient les caches du système RAG :
+- PersistentEmbeddingCache : Cache d'embeddings LRU persistant (SQLite)
+- SemanticCache : Cache approximatif indexé par LSH sur les embeddings
+- CompletionCache : Cache persistant des réponses générées (SQLite)
+"""
+
+from .completion_cache import CompletionCache
+from .embedding_cache import PersistentEmbeddingCache, get_shared_embedding_cache
+from .semantic_cache import SemanticCache
+
+__all__ = [
+    "CompletionCache",
+    "PersistentEmbeddingCache",
+    "SemanticCache",
+    "get_shared_embedding_cache",
+]
@@ -0,0 +1,114 @@
+"""
+Cache de complétions
+====================
+
+Ce module implémente un cache persistant (SQLite) des réponses générées,
+indexé par un hash BLAKE2b du prompt et des paramètres de génération, avec
+une durée de validité par entrée.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class CompletionCache:
+    """Cache de réponses générées adossé à une base SQLite"""
+
+    def __init__(self, path: Union[str, Path], ttl: float = 7 * 86400):
+        """
+        Initialise le cache
+
+        Args:
+            path: Chemin de la base SQLite
+            ttl: Durée de validité d'une réponse (secondes)
+        """
+        self.path = str(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = self._init_db()
+
+    def _init_db(self) -> Optional[sqlite3.Connection]:
+        """Ouvre (et crée si besoin) la base SQLite"""
+        try:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions ("
+                "key TEXT PRIMARY KEY, answer TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.commit()
+            return conn
+        except sqlite3.Error as e:
+            logger.warning(f"Cache de complétions indisponible: {str(e)}")
+            return None
+
+    @staticmethod
+    def make_key(model: str, temperature: float, max_tokens: int, prompt: str) -> str:
+        """
+        Calcule la clé de cache d'un prompt
+
+        Args:
+            model: Modèle de génération
+            temperature: Température de génération
+            max_tokens: Nombre maximum de tokens générés
+            prompt: Prompt complet
+
+        Returns:
+            Hash hexadécimal BLAKE2b
+        """
+        raw = f"{model}|{temperature}|{max_tokens}|{prompt}"
+        return hashlib.blake2b(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Récupère une réponse encore valide
+
+        Args:
+            key: Clé de cache
+
+        Returns:
+            Réponse en cache ou None
+        """
+        if self._conn is None:
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT answer FROM completions WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, answer: str) -> None:
+        """
+        Enregistre une réponse
+
+        Args:
+            key: Clé de cache
+            answer: Réponse générée
+        """
+        if self._conn is None:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, answer, expires_at) VALUES (?, ?, ?)",
+                (key, answer, time.time() + self.ttl)
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Vide le cache"""
+        if self._conn is None:
+            return
+
+        with self._lock:
+            self._conn.execute("DELETE FROM completions")
+            self._conn.commit()
@@ -0,0 +1,300 @@
+"""
+Cache d'embeddings persistant
+=============================
+
+Ce module implémente un cache d'embeddings à deux niveaux :
+- Un cache LRU borné en mémoire
+- Une base SQLite sur disque, conservée entre les redémarrages
+
+Les vecteurs sont stockés en tableaux NumPy compacts (float32, float16, ou
+int8 avec un facteur d'échelle par vecteur) plutôt qu'en listes Python, et
+indexés par un hash BLAKE2b de (modèle, texte).
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..utils.config import config
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_DTYPES = ("float32", "float16", "int8")
+
+# Nombre maximum de paramètres par requête SQLite (limite historique : 999)
+_SQL_BATCH = 500
+
+
+def quantize(vector: np.ndarray, dtype: str) -> Tuple[np.ndarray, float]:
+    """
+    Quantifie un embedding
+    
+    Args:
+        vector: Embedding float32
+        dtype: Type de stockage ("float32", "float16" ou "int8")
+        
+    Returns:
+        Tuple (valeurs quantifiées, facteur d'échelle)
+    """
+    if dtype == "int8":
+        scale = float(np.abs(vector).max()) / 127.0 or 1.0
+        return np.round(vector / scale).astype(np.int8), scale
+    return vector.astype(dtype), 1.0
+
+
+def dequantize(values: np.ndarray, scale: float, dtype=np.float32) -> np.ndarray:
+    """
+    Reconstruit un embedding à partir de sa forme quantifiée
+    
+    Args:
+        values: Valeurs quantifiées
+        scale: Facteur d'échelle
+        dtype: Type NumPy du résultat
+        
+    Returns:
+        Embedding dans le type demandé
+    """
+    vector = values.astype(dtype)
+    if scale != 1.0:
+        vector *= scale
+    return vector
+
+
+class QueryKey:
+    """Requête dont l'égalité et le hash portent sur sa forme normalisée (clé des LRU d'embeddings de requêtes)"""
+    
+    __slots__ = ('text', 'key')
+    
+    def __init__(self, text: str):
+        self.text = text
+        self.key = ' '.join(text.lower().split())
+    
+    def __hash__(self) -> int:
+        return hash(self.key)
+    
+    def __eq__(self, other) -> bool:
+        return isinstance(other, QueryKey) and self.key == other.key
+
+
+class PersistentEmbeddingCache:
+    """Cache d'embeddings LRU en mémoire adossé à une base SQLite"""
+    
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        max_entries: int = 10000,
+        dtype: str = "float32"
+    ):
+        """
+        Initialise le cache
+        
+        Args:
+            path: Chemin de la base SQLite (optionnel, cache mémoire seul si None)
+            max_entries: Nombre maximum d'entrées conservées en mémoire
+            dtype: Type de stockage des vecteurs ("float32", "float16" ou "int8")
+        """
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Type de stockage non supporté: {dtype}")
+        
+        self.path = str(path) if path else None
+        self.max_entries = max_entries
+        self.dtype = dtype
+        self._memory: "OrderedDict[str, Tuple[np.ndarray, float]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._conn = self._init_db() if self.path else None
+    
+    def _init_db(self) -> Optional[sqlite3.Connection]:
+        """Ouvre (et crée si besoin) la base SQLite"""
+        try:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            # WAL : lectures non bloquées par les écritures, fsync allégés
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, dtype TEXT NOT NULL, "
+                "scale REAL NOT NULL, vector BLOB NOT NULL)"
+            )
+            conn.commit()
+            return conn
+        except sqlite3.Error as e:
+            logger.warning(f"Cache d'embeddings sur disque indisponible: {str(e)}")
+            return None
+    
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        """
+        Calcule la clé de cache d'un texte pour un modèle donné
+        
+        Args:
+            model: Nom du modèle d'embedding
+            text: Texte embeddé
+            
+        Returns:
+            Hash hexadécimal BLAKE2b
+        """
+        return hashlib.blake2b(f"{model}\0{text}".encode("utf-8")).hexdigest()
+    
+    def get(self, key: str, dtype=np.float32) -> Optional[np.ndarray]:
+        """
+        Récupère un embedding (mémoire puis disque)
+        
+        Args:
+            key: Clé de cache
+            dtype: Type NumPy du vecteur retourné (float32 par défaut)
+            
+        Returns:
+            Embedding déquantifié ou None si absent
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return dequantize(*entry, dtype=dtype)
+            
+            if self._conn is None:
+                return None
+            
+            row = self._conn.execute(
+                "SELECT dtype, scale, vector FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            entry = (np.frombuffer(row[2], dtype=row[0]), row[1])
+            self._remember(key, entry)
+            return dequantize(*entry, dtype=dtype)
+    
+    def get_many(self, keys: Sequence[str], dtype=np.float32) -> List[Optional[np.ndarray]]:
+        """
+        Récupère plusieurs embeddings en une passe
+        
+        Un seul verrou est pris pour tout le lot et les clés absentes de la
+        mémoire sont lues sur disque par requêtes groupées (IN) plutôt
+        qu'une requête par clé.
+        
+        Args:
+            keys: Clés de cache
+            dtype: Type NumPy des vecteurs retournés (float32 par défaut)
+            
+        Returns:
+            Embeddings déquantifiés, None pour les clés absentes
+        """
+        results: List[Optional[np.ndarray]] = [None] * len(keys)
+        missing: Dict[str, List[int]] = {}
+        
+        with self._lock:
+            for i, key in enumerate(keys):
+                entry = self._memory.get(key)
+                if entry is not None:
+                    self._memory.move_to_end(key)
+                    results[i] = dequantize(*entry, dtype=dtype)
+                else:
+                    missing.setdefault(key, []).append(i)
+            
+            if not missing or self._conn is None:
+                return results
+            
+            pending = list(missing)
+            for start in range(0, len(pending), _SQL_BATCH):
+                chunk = pending[start:start + _SQL_BATCH]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, dtype, scale, vector FROM embeddings WHERE key IN ({placeholders})",
+                    chunk
+                ).fetchall()
+                for key, stored_dtype, scale, blob in rows:
+                    entry = (np.frombuffer(blob, dtype=stored_dtype), scale)
+                    self._remember(key, entry)
+                    vector = dequantize(*entry, dtype=dtype)
+                    for i in missing[key]:
+                        results[i] = vector
+        
+        return results
+    
+    def set(self, key: str, embedding: Sequence[float]) -> None:
+        """
+        Ajoute un embedding au cache (mémoire et disque)
+        
+        Args:
+            key: Clé de cache
+            embedding: Embedding à stocker
+        """
+        entry = quantize(np.asarray(embedding, dtype=np.float32), self.dtype)
+        
+        with self._lock:
+            self._remember(key, entry)
+            
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO embeddings (key, dtype, scale, vector) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, self.dtype, entry[1], entry[0].tobytes())
+                )
+                self._conn.commit()
+    
+    def _remember(self, key: str, entry: Tuple[np.ndarray, float]) -> None:
+        """Insère en mémoire et applique la politique LRU"""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        self.evict()
+    
+    def evict(self) -> None:
+        """Retire de la mémoire les entrées les moins récemment utilisées"""
+        with self._lock:
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Vide le cache (mémoire et disque)"""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM embeddings")
+                self._conn.commit()
+    
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            if key in self._memory:
+                return True
+            if self._conn is None:
+                return False
+            return self._conn.execute(
+                "SELECT 1 FROM embeddings WHERE key = ?", (key,)
+            ).fetchone() is not None
+    
+    def __len__(self) -> int:
+        return len(self._memory)
+
+
+_shared_cache: Optional[PersistentEmbeddingCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_embedding_cache() -> PersistentEmbeddingCache:
+    """
+    Retourne le cache d'embeddings partagé par tout le processus
+    
+    Les clés incluant le nom du modèle, plusieurs fournisseurs peuvent
+    partager le même cache sans collision.
+    
+    Returns:
+        Cache d'embeddings configuré selon config
+    """
+    global _shared_cache
+    
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = PersistentEmbeddingCache(
+                config.embedding_cache_path,
+                max_entries=config.embedding_cache_max_entries,
+                dtype=config.embedding_cache_dtype
+            )
+        return _shared_cache
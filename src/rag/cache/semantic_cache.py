@@ -0,0 +1,182 @@
+"""
+Cache sémantique
+================
+
+Ce module implémente un cache approximatif indexé par embedding : une
+requête dont l'embedding est proche (similarité cosinus >= seuil) d'une
+entrée déjà vue retourne la valeur associée à cette entrée.
+
+La recherche des candidats utilise un index LSH par projections aléatoires
+(plusieurs tables de signatures binaires), puis les candidats sont vérifiés
+par similarité cosinus exacte.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..utils.similarity import l2_normalize, lsh_signatures, top1_similarity
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """Cache approximatif basé sur un index LSH (projections aléatoires)"""
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        max_entries: int = 1000,
+        n_tables: int = 8,
+        n_bits: int = 16,
+        seed: int = 0,
+        ttl: Optional[float] = None
+    ):
+        """
+        Initialise le cache sémantique
+
+        Args:
+            threshold: Similarité cosinus minimale pour un hit
+            max_entries: Nombre maximum d'entrées (éviction LRU)
+            n_tables: Nombre de tables de hachage
+            n_bits: Nombre de bits par signature
+            seed: Graine des projections aléatoires
+            ttl: Durée de validité d'une entrée (secondes, None pour illimitée)
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.seed = seed
+        self.ttl = ttl
+
+        self._projections: Optional[np.ndarray] = None  # (n_tables, d, n_bits)
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in range(n_tables)]
+        self._entries: "OrderedDict[int, Tuple[np.ndarray, Any, Tuple[int, ...], float]]" = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.RLock()
+
+        self._hits = 0
+        self._misses = 0
+        self._hit_similarity = 0.0
+
+    def _signatures(self, vector: np.ndarray) -> Tuple[int, ...]:
+        """Calcule la signature LSH du vecteur dans chaque table"""
+        if self._projections is None:
+            rng = np.random.default_rng(self.seed)
+            self._projections = rng.standard_normal(
+                (self.n_tables, vector.shape[0], self.n_bits)
+            ).astype(np.float32)
+
+        return lsh_signatures(vector, self._projections)
+
+    def _candidates(self, signatures: Tuple[int, ...]) -> List[int]:
+        """Sonde les buckets correspondants et leurs voisins à distance de Hamming 1"""
+        candidates = set()
+        for table, signature in zip(self._tables, signatures):
+            candidates.update(table.get(signature, ()))
+            for bit in range(self.n_bits):
+                candidates.update(table.get(signature ^ (1 << bit), ()))
+        return list(candidates)
+
+    def get(self, embedding: Sequence[float]) -> Optional[Tuple[Any, float]]:
+        """
+        Recherche une entrée sémantiquement proche
+
+        Args:
+            embedding: Embedding de la requête
+
+        Returns:
+            Tuple (valeur, similarité) ou None si aucun candidat ne dépasse le seuil
+        """
+        vector = l2_normalize(np.asarray(embedding, dtype=np.float32))
+
+        with self._lock:
+            if not self._entries:
+                self._misses += 1
+                return None
+
+            candidates = self._candidates(self._signatures(vector))
+            if self.ttl is not None:
+                now = time.monotonic()
+                for entry_id in [i for i in candidates if self._entries[i][3] <= now]:
+                    self._remove(entry_id)
+                candidates = [i for i in candidates if i in self._entries]
+            if not candidates:
+                self._misses += 1
+                return None
+
+            matrix = np.stack([self._entries[i][0] for i in candidates])
+            best, similarity = top1_similarity(matrix, vector)
+            if similarity < self.threshold:
+                self._misses += 1
+                return None
+
+            entry_id = candidates[best]
+            self._entries.move_to_end(entry_id)
+            self._hits += 1
+            self._hit_similarity += similarity
+            return self._entries[entry_id][1], similarity
+
+    def set(self, embedding: Sequence[float], value: Any) -> None:
+        """
+        Ajoute une entrée au cache
+
+        Args:
+            embedding: Embedding de la requête
+            value: Valeur associée (embedding, résultats de recherche, ...)
+        """
+        vector = l2_normalize(np.asarray(embedding, dtype=np.float32))
+
+        with self._lock:
+            signatures = self._signatures(vector)
+            entry_id = self._next_id
+            self._next_id += 1
+
+            expires_at = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+            self._entries[entry_id] = (vector, value, signatures, expires_at)
+            for table, signature in zip(self._tables, signatures):
+                table.setdefault(signature, []).append(entry_id)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, entry_id: int) -> None:
+        """Retire une entrée du cache et de ses buckets"""
+        _, _, signatures, _ = self._entries.pop(entry_id)
+        for table, signature in zip(self._tables, signatures):
+            bucket = table.get(signature)
+            if bucket is not None:
+                bucket.remove(entry_id)
+                if not bucket:
+                    del table[signature]
+
+    def clear(self) -> None:
+        """Vide le cache"""
+        with self._lock:
+            self._entries.clear()
+            self._tables = [{} for _ in range(self.n_tables)]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Statistiques d'utilisation du cache
+
+        Returns:
+            Dictionnaire {entries, hits, misses, hit_rate, avg_similarity}
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "avg_similarity": self._hit_similarity / self._hits if self._hits else 0.0
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -7,11 +7,11 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional, Union
 import asyncio
 
-from ..retrieval.vector_retriever import VectorRetriever
-from ..retrieval.reranker import CohereReranker
+from ..retrieval.vector_retriever import get_default_retriever
+from ..retrieval.reranker import get_default_reranker
 from ..generation.mistral_generator import MistralGenerator
 from ..generation.openai_generator import OpenAIGenerator
-from ..utils.config import config
+from ..utils.config import config, get_config
 from ..utils.text_processing import TextProcessor
 
 logger = logging.getLogger(__name__)
@@ -22,15 +22,38 @@ class RAGSystem:
     """
     
     def __init__(self):
-        """Initialise le système RAG."""
-        self.retriever = VectorRetriever()
-        self.reranker = CohereReranker() if config.enable_reranking else None
+        """
+        Initialise le système RAG.
+        
+        Le récupérateur et le reranker sont partagés entre les instances :
+        créer un RAGSystem par requête ne recrée ni les clients ni leurs
+        connexions.
+        """
+        self.retriever = get_default_retriever()
+        self.reranker = get_default_reranker() if config.enable_reranking else None
         self.mistral_generator = MistralGenerator()
         self.openai_generator = OpenAIGenerator()
         self.text_processor = TextProcessor()
+        self.reload_config()
         
         logger.info("Système RAG initialisé avec succès")
     
+    def reload_config(self):
+        """
+        Relit les paramètres de configuration utilisés à chaque requête.
+        
+        Les valeurs sont copiées sur l'instance pour éviter de repasser par
+        l'objet config global sur le chemin critique ; appeler cette méthode
+        après avoir modifié config (ex: dans les tests).
+        """
+        cfg = get_config()
+        self.max_chunks = cfg.max_retrieved_chunks
+        self.enable_reranking = cfg.enable_reranking
+        if self.enable_reranking and self.reranker is None:
+            self.reranker = get_default_reranker()
+        self.mistral_generator.reload_config()
+        self.openai_generator.reload_config()
+    
     def query(self, question: str, max_chunks: int = None) -> str:
         """
         Traite une requête utilisateur et retourne une réponse générée.
@@ -43,16 +66,16 @@ class RAGSystem:
             La réponse générée par le système RAG
         """
         try:
-            logger.info(f"Traitement de la requête: {question}")
+            logger.info("Traitement de la requête: %s", question)
             
             # 1. Récupération des documents pertinents
-            retrieved_docs = self.retriever.retrieve(question, max_chunks or config.max_retrieved_chunks)
+            retrieved_docs = self.retriever.retrieve(question, max_chunks or self.max_chunks)
             
             if not retrieved_docs:
                 return "Aucun document pertinent trouvé dans la base de données."
             
             # 2. Reranking si activé
-            if self.reranker and len(retrieved_docs) > 1:
+            if self.enable_reranking and self.reranker and len(retrieved_docs) > 1:
                 retrieved_docs = self.reranker.rerank(question, retrieved_docs)
             
             # 3. Construction du contexte
@@ -68,6 +91,67 @@ class RAGSystem:
             logger.error(f"Erreur lors du traitement de la requête: {e}")
             return f"Erreur lors du traitement de votre question: {str(e)}"
     
+    async def aquery(self, question: str, max_chunks: int = None) -> str:
+        """
+        Version asynchrone de query().
+        
+        Le pipeline (récupération, reranking, génération) étant dominé par
+        l'attente réseau, il est exécuté dans un thread pour ne pas bloquer
+        la boucle d'événements.
+        
+        Args:
+            question: La question de l'utilisateur
+            max_chunks: Nombre maximum de chunks à récupérer
+            
+        Returns:
+            La réponse générée par le système RAG
+        """
+        return await asyncio.to_thread(self.query, question, max_chunks)
+    
+    async def abatch_query(
+        self,
+        questions: List[str],
+        max_chunks: int = None,
+        max_concurrency: int = None
+    ) -> List[str]:
+        """
+        Traite plusieurs requêtes en parallèle.
+        
+        Args:
+            questions: Liste des questions
+            max_chunks: Nombre maximum de chunks à récupérer par question
+            max_concurrency: Nombre maximum de requêtes simultanées
+            
+        Returns:
+            Les réponses, dans l'ordre des questions
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or config.query_concurrency)
+        
+        async def one(question: str) -> str:
+            async with semaphore:
+                return await self.aquery(question, max_chunks)
+        
+        return await asyncio.gather(*[one(question) for question in questions])
+    
+    def batch_query(
+        self,
+        questions: List[str],
+        max_chunks: int = None,
+        max_concurrency: int = None
+    ) -> List[str]:
+        """
+        Version synchrone de abatch_query() (ex: campagnes d'évaluation).
+        
+        Args:
+            questions: Liste des questions
+            max_chunks: Nombre maximum de chunks à récupérer par question
+            max_concurrency: Nombre maximum de requêtes simultanées
+            
+        Returns:
+            Les réponses, dans l'ordre des questions
+        """
+        return asyncio.run(self.abatch_query(questions, max_chunks, max_concurrency))
+    
     def _build_context(self, documents: List[Dict[str, Any]]) -> str:
         """
         Construit le contexte à partir des documents récupérés.
@@ -126,12 +210,12 @@ class RAGSystem:
             # Découper le document en chunks
             chunks = self.text_processor.split_into_chunks(content, metadata or {})
             
-            # Ajouter chaque chunk à la base vectorielle
-            for chunk in chunks:
-                self.retriever.add_document(chunk['content'], chunk['metadata'])
+            # Ajouter les chunks par lots (un appel d'embeddings et une
+            # insertion par lot)
+            added = self.retriever.add_documents(chunks)
             
-            logger.info(f"Document ajouté avec {len(chunks)} chunks")
-            return True
+            logger.info(f"Document ajouté avec {added}/{len(chunks)} chunks")
+            return added == len(chunks)
             
         except Exception as e:
             logger.error(f"Erreur lors de l'ajout du document: {e}")
@@ -8,20 +8,140 @@ Ce module implémente la génération d'embeddings avec :
 - Support pour différents modèles
 """
 
+import asyncio
+import base64
+import contextlib
+import json
+import time
 import numpy as np
-from typing import List, Dict, Any, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Union
 from abc import ABC, abstractmethod
 import logging
 from mistralai import Mistral
-from openai import OpenAI
-from ..utils.config import config
+from openai import AsyncOpenAI
+from ..cache import PersistentEmbeddingCache, get_shared_embedding_cache
+from ..utils.clients import get_http_client, get_mistral_client, get_openai_client, make_async_http_client
+from ..utils.config import config, get_config
+from ..utils.retry import api_retry, is_batch_size_error
 
 logger = logging.getLogger(__name__)
 
 
+def _has_running_loop() -> bool:
+    """Indique si une boucle asyncio tourne dans le thread courant"""
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+def _wait_for_batch(
+    fetch: Callable[[], Any],
+    get_status: Callable[[Any], str],
+    done: Set[str],
+    failed: Set[str],
+    poll_interval: float,
+    max_poll_interval: float,
+    timeout: float
+) -> Any:
+    """
+    Attend la fin d'un job batch avec un backoff exponentiel
+    
+    Args:
+        fetch: Fonction récupérant l'état courant du job
+        get_status: Fonction extrayant le statut du job
+        done: Statuts de succès
+        failed: Statuts d'échec
+        poll_interval: Délai initial entre deux interrogations (secondes)
+        max_poll_interval: Délai maximal entre deux interrogations (secondes)
+        timeout: Durée maximale d'attente (secondes)
+        
+    Returns:
+        Le job terminé
+    """
+    deadline = time.monotonic() + timeout
+    delay = poll_interval
+    
+    while True:
+        job = fetch()
+        status = get_status(job)
+        if status in done:
+            return job
+        if status in failed:
+            raise RuntimeError(f"Job batch terminé avec le statut: {status}")
+        if time.monotonic() + delay > deadline:
+            raise TimeoutError(f"Job batch non terminé après {timeout} secondes (statut: {status})")
+        
+        time.sleep(delay)
+        delay = min(delay * 2, max_poll_interval)
+
+
+def _decode_base64_embeddings(data: List[Any]) -> List[List[float]]:
+    """
+    Décode des embeddings reçus avec encoding_format="base64"
+    
+    Chaque embedding arrive sous forme d'octets float32 encodés en base64 :
+    le décodage est une copie mémoire au lieu d'un parsing JSON flottant
+    par flottant.
+    
+    Args:
+        data: Éléments "data" de la réponse de l'API
+        
+    Returns:
+        Liste des embeddings
+    """
+    return [
+        np.frombuffer(base64.b64decode(item.embedding), dtype=np.float32).tolist()
+        for item in data
+    ]
+
+
+def _parse_batch_output(content: str, count: int) -> List[List[float]]:
+    """
+    Extrait les embeddings du fichier de résultats JSONL d'un job batch
+    
+    Args:
+        content: Contenu du fichier de résultats
+        count: Nombre de textes soumis
+        
+    Returns:
+        Embeddings réordonnés selon leur custom_id
+    """
+    embeddings: List[Optional[List[float]]] = [None] * count
+    
+    for line in content.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if record.get("error"):
+            raise RuntimeError(f"Erreur dans le job batch ({record.get('custom_id')}): {record['error']}")
+        body = record["response"]["body"]
+        embeddings[int(record["custom_id"])] = body["data"][0]["embedding"]
+    
+    missing = sum(1 for embedding in embeddings if embedding is None)
+    if missing:
+        raise RuntimeError(f"{missing} embeddings manquants dans le résultat du job batch")
+    
+    return embeddings
+
+
 class EmbeddingProvider(ABC):
     """Classe abstraite pour les fournisseurs d'embeddings"""
     
+    # Tailles et concurrence lues dans la configuration à l'utilisation ;
+    # une sous-classe ou une instance peut les fixer
+    sub_batch_size: Optional[int] = None
+    concurrency: Optional[int] = None
+    
+    # Ajustement automatique de la taille des sous-lots : divisée par deux
+    # sur une erreur de taille de lot, doublée après grow_after succès
+    min_sub_batch_size: int = 8
+    max_sub_batch_size: Optional[int] = None
+    grow_after: int = 8
+    _current_sub_batch: Optional[int] = None
+    _success_streak: int = 0
+    
     @abstractmethod
     def embed_text(self, text: str) -> List[float]:
         """Génère un embedding pour un texte"""
@@ -31,6 +151,136 @@ class EmbeddingProvider(ABC):
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
         """Génère des embeddings pour plusieurs textes"""
         pass
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Alias de embed_texts (compatibilité avec l'interface Langchain)"""
+        return self.embed_texts(list(texts))
+    
+    def _embed_batch(self, texts: Union[str, List[str]]) -> List[List[float]]:
+        """Génère les embeddings d'un sous-lot en un seul appel API"""
+        raise NotImplementedError(f"{type(self).__name__} ne supporte pas les sous-lots")
+    
+    def _async_client(self):
+        """
+        Ouvre le client asynchrone d'une exécution de embed_texts_async
+        
+        Un client HTTP asynchrone reste lié à la boucle d'événements qui
+        l'utilise : il est créé puis fermé à chaque exécution (chaque
+        asyncio.run) au lieu d'être conservé sur l'instance.
+        
+        Returns:
+            Gestionnaire de contexte asynchrone fournissant le client
+        """
+        return contextlib.nullcontext()
+    
+    async def _aembed_batch(self, texts: List[str], client: Any = None) -> List[List[float]]:
+        """Génère de manière asynchrone les embeddings d'un sous-lot"""
+        raise NotImplementedError(f"{type(self).__name__} ne supporte pas l'API asynchrone")
+    
+    def current_sub_batch_size(self) -> int:
+        """Taille de sous-lot courante (ajustée selon les erreurs observées)"""
+        return self._current_sub_batch or self.sub_batch_size or get_config().embedding_sub_batch_size
+    
+    def _record_success(self) -> None:
+        """Enregistre un sous-lot réussi et agrandit les lots après une série de succès"""
+        self._success_streak += 1
+        current = self.current_sub_batch_size()
+        max_size = self.max_sub_batch_size or 2 * get_config().embedding_sub_batch_size
+        if self._success_streak >= self.grow_after and current < max_size:
+            self._current_sub_batch = min(max_size, current * 2)
+            self._success_streak = 0
+    
+    def _shrink_sub_batch(self, failed_size: int, error: Exception) -> None:
+        """Divise par deux la taille des sous-lots après une erreur de taille de lot"""
+        self._current_sub_batch = max(self.min_sub_batch_size, failed_size // 2)
+        self._success_streak = 0
+        logger.warning(
+            f"Lot de {failed_size} textes refusé, sous-lots réduits à "
+            f"{self._current_sub_batch}: {str(error)}"
+        )
+    
+    def _embed_adaptive(self, texts: List[str]) -> List[List[float]]:
+        """
+        Génère des embeddings par sous-lots séquentiels de taille adaptative
+        
+        Args:
+            texts: Liste des textes à embedder
+            
+        Returns:
+            Liste des embeddings, dans l'ordre des textes
+        """
+        embeddings = []
+        start = 0
+        
+        while start < len(texts):
+            chunk = texts[start:start + self.current_sub_batch_size()]
+            try:
+                embeddings.extend(self._embed_batch(chunk))
+            except Exception as e:
+                if not is_batch_size_error(e) or len(chunk) <= self.min_sub_batch_size:
+                    raise
+                self._shrink_sub_batch(len(chunk), e)
+                continue
+            
+            self._record_success()
+            start += len(chunk)
+        
+        return embeddings
+    
+    async def embed_texts_async(
+        self,
+        texts: List[str],
+        sub_batch: int = None,
+        concurrency: int = None
+    ) -> List[List[float]]:
+        """
+        Génère des embeddings en parallélisant des sous-lots
+        
+        Args:
+            texts: Liste des textes à embedder
+            sub_batch: Taille maximale d'un sous-lot (optionnel)
+            concurrency: Nombre maximum de requêtes simultanées (optionnel)
+            
+        Returns:
+            Liste des embeddings, dans l'ordre des textes
+        """
+        sub_batch = sub_batch or self.current_sub_batch_size()
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency or get_config().embedding_concurrency)
+        chunks = [texts[i:i + sub_batch] for i in range(0, len(texts), sub_batch)]
+        
+        async def one(chunk: List[str]) -> List[List[float]]:
+            async with semaphore:
+                try:
+                    result = await self._aembed_batch(chunk, client)
+                except Exception as e:
+                    if not is_batch_size_error(e) or len(chunk) <= self.min_sub_batch_size:
+                        raise
+                    self._shrink_sub_batch(len(chunk), e)
+                else:
+                    self._record_success()
+                    return result
+            
+            # Lot refusé : le redécouper en deux (hors du sémaphore)
+            half = len(chunk) // 2
+            left, right = await asyncio.gather(one(chunk[:half]), one(chunk[half:]))
+            return left + right
+        
+        async with self._async_client() as client:
+            results = await asyncio.gather(*[one(chunk) for chunk in chunks])
+        return [embedding for result in results for embedding in result]
+    
+    def embed_texts_batch(self, texts: List[str], **kwargs) -> List[List[float]]:
+        """Génère des embeddings via l'API Batch du fournisseur (traitements hors ligne)"""
+        raise NotImplementedError(f"{type(self).__name__} ne supporte pas l'API Batch")
+    
+    def embed_texts_concurrent(
+        self,
+        texts: List[str],
+        sub_batch: int = None,
+        concurrency: int = None
+    ) -> List[List[float]]:
+        """Version synchrone de embed_texts_async"""
+        return asyncio.run(self.embed_texts_async(texts, sub_batch, concurrency))
 
 
 class MistralEmbeddingProvider(EmbeddingProvider):
@@ -46,24 +296,47 @@ class MistralEmbeddingProvider(EmbeddingProvider):
         """
         self.api_key = api_key or config.mistral_api_key
         self.model = model or config.mistral_embedding_model
-        self.client = Mistral(api_key=self.api_key)
+        self.client = get_mistral_client(self.api_key)
+    
+    @api_retry()
+    def _embed_batch(self, texts: Union[str, List[str]]) -> List[List[float]]:
+        """Appelle l'API d'embeddings Mistral (relancé sur erreur transitoire)"""
+        response = self.client.embeddings.create(
+            model=self.model,
+            input=texts
+        )
+        return [data.embedding for data in response.data]
     
     def embed_text(self, text: str) -> List[float]:
         """Génère un embedding pour un texte avec Mistral"""
         try:
-            response = self.client.embeddings.create(
-                model=self.model,
-                input=text
-            )
-            return response.data[0].embedding
+            return self._embed_batch(text)[0]
         except Exception as e:
             logger.error(f"Erreur lors de la génération d'embedding Mistral: {str(e)}")
             raise
     
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
         """Génère des embeddings pour plusieurs textes avec Mistral"""
+        if len(texts) > self.current_sub_batch_size() and not _has_running_loop():
+            return self.embed_texts_concurrent(texts)
+        
+        try:
+            return self._embed_adaptive(texts)
+        except Exception as e:
+            logger.error(f"Erreur lors de la génération d'embeddings Mistral: {str(e)}")
+            raise
+    
+    @contextlib.asynccontextmanager
+    async def _async_client(self):
+        """Client Mistral dont le client HTTP asynchrone est propre à la boucle courante"""
+        async with make_async_http_client() as http_client:
+            yield Mistral(api_key=self.api_key, client=get_http_client(), async_client=http_client)
+    
+    @api_retry()
+    async def _aembed_batch(self, texts: List[str], client: Mistral = None) -> List[List[float]]:
+        """Génère de manière asynchrone les embeddings d'un sous-lot avec Mistral"""
         try:
-            response = self.client.embeddings.create(
+            response = await client.embeddings.create_async(
                 model=self.model,
                 input=texts
             )
@@ -71,6 +344,59 @@ class MistralEmbeddingProvider(EmbeddingProvider):
         except Exception as e:
             logger.error(f"Erreur lors de la génération d'embeddings Mistral: {str(e)}")
             raise
+    
+    def embed_texts_batch(
+        self,
+        texts: List[str],
+        poll_interval: float = 10.0,
+        max_poll_interval: float = 300.0,
+        timeout: float = 86400.0
+    ) -> List[List[float]]:
+        """
+        Génère des embeddings via l'API Batch de Mistral
+        
+        Moins chère et avec des quotas plus élevés que l'API synchrone, mais
+        asynchrone côté serveur : réservée aux traitements hors ligne.
+        
+        Args:
+            texts: Liste des textes à embedder
+            poll_interval: Délai initial entre deux interrogations (secondes)
+            max_poll_interval: Délai maximal entre deux interrogations (secondes)
+            timeout: Durée maximale d'attente (secondes)
+            
+        Returns:
+            Liste des embeddings, dans l'ordre des textes
+        """
+        try:
+            payload = "".join(
+                json.dumps({"custom_id": str(i), "body": {"input": text}}) + "\n"
+                for i, text in enumerate(texts)
+            ).encode("utf-8")
+            
+            batch_file = self.client.files.upload(
+                file={"file_name": "embeddings.jsonl", "content": payload},
+                purpose="batch"
+            )
+            job = self.client.batch.jobs.create(
+                input_files=[batch_file.id],
+                model=self.model,
+                endpoint="/v1/embeddings"
+            )
+            job = _wait_for_batch(
+                lambda: self.client.batch.jobs.get(job_id=job.id),
+                lambda j: j.status,
+                done={"SUCCESS"},
+                failed={"FAILED", "TIMEOUT_EXCEEDED", "CANCELLATION_REQUESTED", "CANCELLED"},
+                poll_interval=poll_interval,
+                max_poll_interval=max_poll_interval,
+                timeout=timeout
+            )
+            
+            content = self.client.files.download(file_id=job.output_file).read().decode("utf-8")
+            return _parse_batch_output(content, len(texts))
+        except Exception as e:
+            logger.error(f"Erreur lors du batch d'embeddings Mistral: {str(e)}")
+            raise
 
 
 class OpenAIEmbeddingProvider(EmbeddingProvider):
@@ -86,31 +412,112 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
         """
         self.api_key = api_key or config.openai_api_key
         self.model = model or config.openai_embedding_model
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = get_openai_client(self.api_key)
+    
+    @api_retry()
+    def _embed_batch(self, texts: Union[str, List[str]]) -> List[List[float]]:
+        """Appelle l'API d'embeddings OpenAI (relancé sur erreur transitoire)"""
+        response = self.client.embeddings.create(
+            model=self.model,
+            input=texts,
+            encoding_format="base64"
+        )
+        return _decode_base64_embeddings(response.data)
     
     def embed_text(self, text: str) -> List[float]:
         """Génère un embedding pour un texte avec OpenAI"""
         try:
-            response = self.client.embeddings.create(
-                model=self.model,
-                input=text
-            )
-            return response.data[0].embedding
+            return self._embed_batch(text)[0]
         except Exception as e:
             logger.error(f"Erreur lors de la génération d'embedding OpenAI: {str(e)}")
             raise
     
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
         """Génère des embeddings pour plusieurs textes avec OpenAI"""
+        if len(texts) > self.current_sub_batch_size() and not _has_running_loop():
+            return self.embed_texts_concurrent(texts)
+        
         try:
-            response = self.client.embeddings.create(
+            return self._embed_adaptive(texts)
+        except Exception as e:
+            logger.error(f"Erreur lors de la génération d'embeddings OpenAI: {str(e)}")
+            raise
+    
+    def _async_client(self) -> AsyncOpenAI:
+        """Client OpenAI asynchrone propre à la boucle courante (fermé en sortie de contexte)"""
+        return AsyncOpenAI(api_key=self.api_key, http_client=make_async_http_client())
+    
+    @api_retry()
+    async def _aembed_batch(self, texts: List[str], client: AsyncOpenAI = None) -> List[List[float]]:
+        """Génère de manière asynchrone les embeddings d'un sous-lot avec OpenAI"""
+        try:
+            response = await client.embeddings.create(
                 model=self.model,
-                input=texts
+                input=texts,
+                encoding_format="base64"
             )
-            return [data.embedding for data in response.data]
+            return _decode_base64_embeddings(response.data)
         except Exception as e:
             logger.error(f"Erreur lors de la génération d'embeddings OpenAI: {str(e)}")
             raise
+    
+    def embed_texts_batch(
+        self,
+        texts: List[str],
+        poll_interval: float = 10.0,
+        max_poll_interval: float = 300.0,
+        timeout: float = 86400.0
+    ) -> List[List[float]]:
+        """
+        Génère des embeddings via l'API Batch d'OpenAI
+        
+        Moins chère et avec des quotas plus élevés que l'API synchrone, mais
+        asynchrone côté serveur : réservée aux traitements hors ligne.
+        
+        Args:
+            texts: Liste des textes à embedder
+            poll_interval: Délai initial entre deux interrogations (secondes)
+            max_poll_interval: Délai maximal entre deux interrogations (secondes)
+            timeout: Durée maximale d'attente (secondes)
+            
+        Returns:
+            Liste des embeddings, dans l'ordre des textes
+        """
+        try:
+            payload = "".join(
+                json.dumps({
+                    "custom_id": str(i),
+                    "method": "POST",
+                    "url": "/v1/embeddings",
+                    "body": {"model": self.model, "input": text}
+                }) + "\n"
+                for i, text in enumerate(texts)
+            ).encode("utf-8")
+            
+            batch_file = self.client.files.create(
+                file=("embeddings.jsonl", payload),
+                purpose="batch"
+            )
+            batch = self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/embeddings",
+                completion_window="24h"
+            )
+            batch = _wait_for_batch(
+                lambda: self.client.batches.retrieve(batch.id),
+                lambda b: b.status,
+                done={"completed"},
+                failed={"failed", "expired", "cancelling", "cancelled"},
+                poll_interval=poll_interval,
+                max_poll_interval=max_poll_interval,
+                timeout=timeout
+            )
+            
+            content = self.client.files.content(batch.output_file_id).text
+            return _parse_batch_output(content, len(texts))
+        except Exception as e:
+            logger.error(f"Erreur lors du batch d'embeddings OpenAI: {str(e)}")
+            raise
 
 
 class HybridEmbeddingProvider(EmbeddingProvider):
@@ -134,6 +541,13 @@ class HybridEmbeddingProvider(EmbeddingProvider):
         self.openai_provider = openai_provider or OpenAIEmbeddingProvider()
         self.primary_provider = primary_provider
     
+    @property
+    def model(self) -> str:
+        """Modèle du fournisseur principal"""
+        if self.primary_provider == "mistral":
+            return self.mistral_provider.model
+        return self.openai_provider.model
+    
     def embed_text(self, text: str) -> List[float]:
         """Génère un embedding avec le fournisseur principal"""
         if self.primary_provider == "mistral":
@@ -148,29 +562,80 @@ class HybridEmbeddingProvider(EmbeddingProvider):
         else:
             return self.openai_provider.embed_texts(texts)
     
-    def embed_texts_hybrid(self, texts: List[str]) -> Dict[str, List[List[float]]]:
-        """Génère des embeddings avec les deux fournisseurs"""
-        mistral_embeddings = self.mistral_provider.embed_texts(texts)
-        openai_embeddings = self.openai_provider.embed_texts(texts)
+    def _async_client(self):
+        """Client asynchrone du fournisseur principal"""
+        if self.primary_provider == "mistral":
+            return self.mistral_provider._async_client()
+        else:
+            return self.openai_provider._async_client()
+    
+    async def _aembed_batch(self, texts: List[str], client: Any = None) -> List[List[float]]:
+        """Génère de manière asynchrone les embeddings avec le fournisseur principal"""
+        if self.primary_provider == "mistral":
+            return await self.mistral_provider._aembed_batch(texts, client)
+        else:
+            return await self.openai_provider._aembed_batch(texts, client)
+    
+    def embed_texts_batch(self, texts: List[str], **kwargs) -> List[List[float]]:
+        """Génère des embeddings via l'API Batch du fournisseur principal"""
+        if self.primary_provider == "mistral":
+            return self.mistral_provider.embed_texts_batch(texts, **kwargs)
+        else:
+            return self.openai_provider.embed_texts_batch(texts, **kwargs)
+    
+    async def embed_texts_hybrid_async(self, texts: List[str]) -> Dict[str, List[List[float]]]:
+        """Génère des embeddings avec les deux fournisseurs en parallèle"""
+        mistral_embeddings, openai_embeddings = await asyncio.gather(
+            self.mistral_provider.embed_texts_async(texts),
+            self.openai_provider.embed_texts_async(texts)
+        )
         
         return {
             'mistral': mistral_embeddings,
             'openai': openai_embeddings
         }
+    
+    def embed_texts_hybrid(self, texts: List[str]) -> Dict[str, List[List[float]]]:
+        """Génère des embeddings avec les deux fournisseurs"""
+        if _has_running_loop():
+            # Appel depuis une boucle asyncio : utiliser embed_texts_hybrid_async
+            return {
+                'mistral': self.mistral_provider.embed_texts(texts),
+                'openai': self.openai_provider.embed_texts(texts)
+            }
+        
+        return asyncio.run(self.embed_texts_hybrid_async(texts))
 
 
 class EmbeddingManager:
     """Gestionnaire d'embeddings avec cache et optimisation"""
     
-    def __init__(self, provider: EmbeddingProvider = None):
+    def __init__(
+        self,
+        provider: EmbeddingProvider = None,
+        cache: PersistentEmbeddingCache = None,
+        shared: bool = True
+    ):
         """
         Initialise le gestionnaire d'embeddings
         
         Args:
             provider: Fournisseur d'embeddings (optionnel)
+            cache: Cache d'embeddings (optionnel, LRU + SQLite par défaut)
+            shared: Sans cache explicite, utiliser le cache partagé par tout
+                le processus plutôt qu'un cache propre à cette instance
         """
         self.provider = provider or MistralEmbeddingProvider()
-        self.cache = {}  # Cache simple pour les embeddings
+        if cache is None:
+            cache = get_shared_embedding_cache() if shared else PersistentEmbeddingCache(
+                max_entries=config.embedding_cache_max_entries,
+                dtype=config.embedding_cache_dtype
+            )
+        self.cache = cache
+    
+    def _cache_key(self, text: str) -> str:
+        """Clé de cache d'un texte pour le modèle du fournisseur"""
+        return self.cache.make_key(self.provider.model, text)
     
     def get_embedding(self, text: str, use_cache: bool = True) -> List[float]:
         """
@@ -183,58 +648,98 @@ class EmbeddingManager:
         Returns:
             Embedding du texte
         """
-        if use_cache and text in self.cache:
-            return self.cache[text]
+        if not use_cache:
+            return self.provider.embed_text(text)
         
-        embedding = self.provider.embed_text(text)
+        key = self._cache_key(text)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached.tolist()
         
-        if use_cache:
-            self.cache[text] = embedding
+        embedding = self.provider.embed_text(text)
+        self.cache.set(key, embedding)
         
         return embedding
     
-    def get_embeddings(self, texts: List[str], use_cache: bool = True) -> List[List[float]]:
+    def get_embedding_as(self, text: str, dtype=np.float32) -> np.ndarray:
+        """
+        Obtient un embedding sous forme de tableau NumPy du type demandé
+        
+        Args:
+            text: Texte à embedder
+            dtype: Type NumPy du résultat (float32 par défaut)
+            
+        Returns:
+            Embedding du texte
+        """
+        key = self._cache_key(text)
+        cached = self.cache.get(key, dtype=dtype)
+        if cached is not None:
+            return cached
+        
+        self.cache.set(key, self.provider.embed_text(text))
+        return self.cache.get(key, dtype=dtype)
+    
+    def get_embeddings(
+        self,
+        texts: List[str],
+        use_cache: bool = True,
+        use_batch_api: bool = False,
+        as_array: bool = False
+    ) -> Union[List[List[float]], np.ndarray]:
         """
         Obtient des embeddings pour plusieurs textes
         
         Args:
             texts: Liste des textes à embedder
             use_cache: Utiliser le cache (optionnel)
+            use_batch_api: Passer par l'API Batch du fournisseur pour les
+                textes absents du cache (ingestion hors ligne, optionnel)
+            as_array: Retourner une matrice NumPy (n, d) float32 plutôt
+                qu'une liste de listes (optionnel)
             
         Returns:
-            Liste des embeddings
+            Liste des embeddings (ou matrice si as_array)
         """
+        embed = self.provider.embed_texts_batch if use_batch_api else self.provider.embed_texts
+        
         if not use_cache:
-            return self.provider.embed_texts(texts)
+            embeddings = embed(texts)
+            return np.asarray(embeddings, dtype=np.float32) if as_array else embeddings
         
-        embeddings = []
-        texts_to_embed = []
-        indices_to_embed = []
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32) if as_array else []
         
         # Vérifier le cache
-        for i, text in enumerate(texts):
-            if text in self.cache:
-                embeddings.append(self.cache[text])
-            else:
-                texts_to_embed.append(text)
-                indices_to_embed.append(i)
-                embeddings.append(None)  # Placeholder
-        
-        # Générer les embeddings manquants
+        cached = self.cache.get_many([self._cache_key(text) for text in texts])
+        hit = np.fromiter((vector is not None for vector in cached), dtype=bool, count=len(texts))
+        miss_positions = np.flatnonzero(~hit)
+        
+        # Générer les embeddings manquants (une seule fois par texte unique)
+        texts_to_embed = list(dict.fromkeys(texts[i] for i in miss_positions))
+        new_embeddings = None
         if texts_to_embed:
-            new_embeddings = self.provider.embed_texts(texts_to_embed)
-            
-            # Mettre à jour le cache et les résultats
-            for i, embedding in enumerate(new_embeddings):
-                text = texts_to_embed[i]
-                original_index = indices_to_embed[i]
-                self.cache[text] = embedding
-                embeddings[original_index] = embedding
+            new_embeddings = np.asarray(embed(texts_to_embed), dtype=np.float32)
+            for text, embedding in zip(texts_to_embed, new_embeddings):
+                self.cache.set(self._cache_key(text), embedding)
         
-        return embeddings
+        # Assembler le résultat dans une matrice préallouée
+        dim = new_embeddings.shape[1] if new_embeddings is not None else cached[0].shape[0]
+        out = np.empty((len(texts), dim), dtype=np.float32)
+        if hit.any():
+            out[hit] = np.stack([vector for vector in cached if vector is not None])
+        if new_embeddings is not None:
+            row_of = {text: j for j, text in enumerate(texts_to_embed)}
+            out[miss_positions] = new_embeddings[[row_of[texts[i]] for i in miss_positions]]
+        
+        return out if as_array else out.tolist()
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Alias de get_embeddings (compatibilité avec l'interface Langchain)"""
+        return self.get_embeddings(list(texts))
     
     def clear_cache(self):
-        """Vide le cache des embeddings"""
+        """Vide le cache des embeddings (pour toutes les instances s'il est partagé)"""
         self.cache.clear()
     
     def get_cache_size(self) -> int:
@@ -4,9 +4,8 @@ Générateur utilisant Mistral AI pour la génération de texte.
 
 import logging
 from typing import Dict, Any
-from mistralai import Mistral
-
-from ..utils.config import config
+from ..utils.clients import get_mistral_client
+from ..utils.config import config, get_config
 
 logger = logging.getLogger(__name__)
 
@@ -15,12 +14,32 @@ class MistralGenerator:
     Générateur de texte utilisant Mistral AI.
     """
     
+    _PROMPT_TEMPLATE = """Contexte:
+{context}
+
+Question: {question}
+
+Instructions:
+- Répondez de manière précise et contextuelle
+- Basez-vous uniquement sur les informations du contexte
+- Si l'information n'est pas disponible dans le contexte, indiquez-le clairement
+- Structurez votre réponse de manière claire et organisée
+
+Réponse:"""
+    
     def __init__(self):
         """Initialise le générateur Mistral."""
-        self.client = Mistral(api_key=config.mistral_api_key)
-        self.model = config.mistral_generation_model
+        self.client = get_mistral_client(config.mistral_api_key)
+        self.reload_config()
         logger.info(f"MistralGenerator initialisé avec le modèle: {self.model}")
     
+    def reload_config(self):
+        """Relit les paramètres de génération depuis la configuration."""
+        cfg = get_config()
+        self.model = cfg.mistral_generation_model
+        self.max_tokens = cfg.max_tokens
+        self.temperature = cfg.temperature
+    
     def generate(self, question: str, context: str) -> str:
         """
         Génère une réponse basée sur la question et le contexte.
@@ -49,8 +68,8 @@ class MistralGenerator:
                         "content": prompt
                     }
                 ],
-                max_tokens=config.max_tokens,
-                temperature=config.temperature
+                max_tokens=self.max_tokens,
+                temperature=self.temperature
             )
             
             answer = response.choices[0].message.content
@@ -72,15 +91,4 @@ class MistralGenerator:
         Returns:
             Le prompt formaté
         """
-        return f"""Contexte:
-{context}
-
-Question: {question}
-
-Instructions:
-- Répondez de manière précise et contextuelle
-- Basez-vous uniquement sur les informations du contexte
-- Si l'information n'est pas disponible dans le contexte, indiquez-le clairement
-- Structurez votre réponse de manière claire et organisée
-
-Réponse:"""
+        return self._PROMPT_TEMPLATE.format(context=context, question=question)
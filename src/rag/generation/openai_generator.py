@@ -3,10 +3,10 @@ Générateur utilisant OpenAI pour la génération de texte.
 """
 
 import logging
-from typing import Dict, Any
-from openai import OpenAI
-
-from ..utils.config import config
+from typing import Dict, Any, Iterator, List, Optional
+from ..cache import CompletionCache
+from ..utils.clients import get_openai_client
+from ..utils.config import config, get_config
 
 logger = logging.getLogger(__name__)
 
@@ -15,12 +15,38 @@ class OpenAIGenerator:
     Générateur de texte utilisant OpenAI.
     """
     
+    _PROMPT_TEMPLATE = """Contexte:
+{context}
+
+Question: {question}
+
+Instructions:
+- Répondez de manière précise et contextuelle
+- Basez-vous uniquement sur les informations du contexte
+- Si l'information n'est pas disponible dans le contexte, indiquez-le clairement
+- Structurez votre réponse de manière claire et organisée
+
+Réponse:"""
+    
     def __init__(self):
         """Initialise le générateur OpenAI."""
-        self.client = OpenAI(api_key=config.openai_api_key)
-        self.model = config.openai_generation_model
+        self.client = get_openai_client(config.openai_api_key)
+        self.system_prompt = "Vous êtes un assistant IA spécialisé dans l'analyse de documents. Répondez de manière précise et contextuelle en vous basant uniquement sur les informations fournies dans le contexte."
+        self.reload_config()
+        self.cache = (
+            CompletionCache(config.generation_cache_path, ttl=config.generation_cache_ttl)
+            if config.generation_cache_path else None
+        )
         logger.info(f"OpenAIGenerator initialisé avec le modèle: {self.model}")
     
+    def reload_config(self):
+        """Relit les paramètres de génération depuis la configuration."""
+        cfg = get_config()
+        self.model = cfg.openai_generation_model
+        self.max_tokens = cfg.max_tokens
+        self.temperature = cfg.temperature
+        self.cache_nondeterministic = cfg.generation_cache_nondeterministic
+    
     def generate(self, question: str, context: str) -> str:
         """
         Génère une réponse basée sur la question et le contexte.
@@ -32,35 +58,102 @@ class OpenAIGenerator:
         Returns:
             La réponse générée
         """
+        return "".join(self.generate_stream(question, context))
+    
+    def generate_stream(self, question: str, context: str) -> Iterator[str]:
+        """
+        Génère une réponse en streaming, fragment par fragment.
+        
+        Les fragments sont produits au fur et à mesure de leur réception :
+        le premier arrive sans attendre la fin de la génération. Le flux
+        n'avance que lorsque l'appelant consomme l'itérateur (la lecture
+        de la réponse HTTP est suspendue entre deux fragments).
+        
+        Args:
+            question: La question de l'utilisateur
+            context: Le contexte récupéré
+            
+        Yields:
+            Les fragments de texte de la réponse
+        """
         try:
             # Construire le prompt
             prompt = self._build_prompt(question, context)
             
+            # Réponse déjà générée pour ce prompt
+            cache_key = self._cache_key(prompt)
+            if cache_key is not None:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    logger.info("Réponse OpenAI servie depuis le cache")
+                    yield cached
+                    return
+            
             # Générer la réponse
-            response = self.client.chat.completions.create(
+            stream = self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Vous êtes un assistant IA spécialisé dans l'analyse de documents. Répondez de manière précise et contextuelle en vous basant uniquement sur les informations fournies dans le contexte."
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
-                max_tokens=config.max_tokens,
-                temperature=config.temperature
+                messages=self._build_messages(prompt),
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                stream=True
             )
             
-            answer = response.choices[0].message.content
+            parts = []
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+            
+            if cache_key is not None:
+                self.cache.set(cache_key, "".join(parts))
+            
             logger.info("Réponse générée avec succès par OpenAI")
-            return answer
             
         except Exception as e:
             logger.error(f"Erreur lors de la génération OpenAI: {e}")
             raise
     
+    def _cache_key(self, prompt: str) -> Optional[str]:
+        """
+        Calcule la clé de cache du prompt.
+        
+        Args:
+            prompt: Le prompt utilisateur
+            
+        Returns:
+            La clé, ou None si le cache est désactivé ou la génération
+            non déterministe (temperature > 0)
+        """
+        if self.cache is None:
+            return None
+        if self.temperature > 0 and not self.cache_nondeterministic:
+            return None
+        return self.cache.make_key(self.model, self.temperature, self.max_tokens, prompt)
+    
+    def _build_messages(self, prompt: str) -> List[Dict[str, str]]:
+        """
+        Construit les messages de la conversation.
+        
+        Args:
+            prompt: Le prompt utilisateur
+            
+        Returns:
+            Les messages système et utilisateur
+        """
+        return [
+            {
+                "role": "system",
+                "content": self.system_prompt
+            },
+            {
+                "role": "user", 
+                "content": prompt
+            }
+        ]
+    
     def _build_prompt(self, question: str, context: str) -> str:
         """
         Construit le prompt pour la génération.
@@ -72,15 +165,4 @@ class OpenAIGenerator:
         Returns:
             Le prompt formaté
         """
-        return f"""Contexte:
-{context}
-
-Question: {question}
-
-Instructions:
-- Répondez de manière précise et contextuelle
-- Basez-vous uniquement sur les informations du contexte
-- Si l'information n'est pas disponible dans le contexte, indiquez-le clairement
-- Structurez votre réponse de manière claire et organisée
-
-Réponse:"""
+        return self._PROMPT_TEMPLATE.format(context=context, question=question)
@@ -11,6 +11,7 @@ Ce module implémente les embeddings Langchain selon la documentation officielle
 
 from typing import List, Dict, Any, Optional, Union
 import logging
+import numpy as np
 from langchain_mistralai import MistralAIEmbeddings
 from langchain_openai import OpenAIEmbeddings
 from langchain_cohere import CohereEmbeddings
@@ -22,6 +23,9 @@ from ..utils.config import config
 
 logger = logging.getLogger(__name__)
 
+# Lignes converties en float32 à la fois par similarities()
+_SIMILARITY_BLOCK = 4096
+
 
 class LangchainEmbeddingProvider:
     """Fournisseur d'embeddings avec Langchain"""
@@ -291,6 +295,11 @@ class LangchainDocumentProcessor:
             embedding_provider: Fournisseur d'embeddings
         """
         self.embedding_provider = LangchainEmbeddingProvider(embedding_provider)
+        # Embeddings des documents (une ligne par document, float16) ; la
+        # capacité double à chaque agrandissement, seules _n_embeddings lignes
+        # sont occupées
+        self._embedding_buffer: Optional[np.ndarray] = None
+        self._n_embeddings = 0
     
     def process_documents(
         self,
@@ -308,7 +317,7 @@ class LangchainDocumentProcessor:
             Liste des documents Langchain
         """
         documents = []
-        metadatas = metadatas or [{}] * len(texts)
+        metadatas = metadatas or [{} for _ in texts]
         
         for text, metadata in zip(texts, metadatas):
             document = Document(
@@ -319,20 +328,101 @@ class LangchainDocumentProcessor:
         
         return documents
     
-    def embed_documents(self, documents: List[Document]) -> List[Document]:
-        """Ajoute les embeddings aux documents"""
+    def embed_documents(
+        self,
+        documents: List[Document],
+        store_in_metadata: bool = True
+    ) -> List[Document]:
+        """
+        Ajoute les embeddings aux documents
+        
+        Les embeddings sont aussi rangés dans une matrice unique (float16) et
+        chaque document reçoit l'indice de sa ligne dans ses métadonnées
+        ("embedding_row"), lisible avec get_embedding().
+        
+        Args:
+            documents: Documents Langchain
+            store_in_metadata: Conserver aussi l'embedding en liste dans
+                metadata["embedding"] ; False évite cette copie par document
+                lorsque la matrice suffit
+            
+        Returns:
+            Les documents, métadonnées complétées
+        """
         try:
+            if not documents:
+                return documents
+            
             texts = [doc.page_content for doc in documents]
             embeddings = self.embedding_provider.embed_documents(texts)
             
-            # Ajouter les embeddings aux métadonnées
-            for doc, embedding in zip(documents, embeddings):
-                doc.metadata["embedding"] = embedding
+            offset = self._append_embeddings(np.asarray(embeddings, dtype=np.float16))
+            
+            # Référencer la ligne de chaque document dans ses métadonnées
+            for i, (doc, embedding) in enumerate(zip(documents, embeddings)):
+                doc.metadata["embedding_row"] = offset + i
+                if store_in_metadata:
+                    doc.metadata["embedding"] = embedding
             
             return documents
         except Exception as e:
             logger.error(f"Erreur lors de l'embedding des documents: {str(e)}")
             raise
+    
+    def _append_embeddings(self, block: np.ndarray) -> int:
+        """Ajoute des lignes à la matrice (croissance géométrique) et retourne l'indice de la première"""
+        offset = self._n_embeddings
+        needed = offset + len(block)
+        if self._embedding_buffer is None:
+            self._embedding_buffer = np.empty((needed, block.shape[1]), dtype=np.float16)
+        elif needed > len(self._embedding_buffer):
+            grown = np.empty((max(needed, 2 * len(self._embedding_buffer)), block.shape[1]), dtype=np.float16)
+            grown[:offset] = self._embedding_buffer[:offset]
+            self._embedding_buffer = grown
+        self._embedding_buffer[offset:needed] = block
+        self._n_embeddings = needed
+        return offset
+    
+    @property
+    def embedding_matrix(self) -> Optional[np.ndarray]:
+        """Matrice (n_documents, d) des embeddings calculés (vue, sans copie)"""
+        if self._embedding_buffer is None:
+            return None
+        return self._embedding_buffer[:self._n_embeddings]
+    
+    def get_embedding(self, document: Document) -> np.ndarray:
+        """
+        Retourne l'embedding d'un document passé par embed_documents()
+        
+        Args:
+            document: Document Langchain
+            
+        Returns:
+            Embedding float32 du document
+        """
+        return self._embedding_buffer[document.metadata["embedding_row"]].astype(np.float32)
+    
+    def similarities(self, query_embedding: List[float]) -> np.ndarray:
+        """
+        Calcule le produit scalaire d'une requête avec tous les documents
+        
+        Args:
+            query_embedding: Embedding de la requête
+            
+        Returns:
+            Scores indexés par "embedding_row"
+        """
+        matrix = self.embedding_matrix
+        if matrix is None:
+            return np.empty(0, dtype=np.float32)
+        # Calcul en float32 (NumPy n'a pas de BLAS pour float16), par blocs :
+        # seuls _SIMILARITY_BLOCK lignes sont converties à la fois
+        query = np.asarray(query_embedding, dtype=np.float32)
+        scores = np.empty(len(matrix), dtype=np.float32)
+        for start in range(0, len(matrix), _SIMILARITY_BLOCK):
+            block = matrix[start:start + _SIMILARITY_BLOCK]
+            np.dot(block.astype(np.float32), query, out=scores[start:start + len(block)])
+        return scores
 
 
 class LangchainRAGWithReranking:
@@ -10,23 +10,162 @@ Ce module implémente des chaînes Langchain avancées pour le RAG :
 """
 
 from typing import List, Dict, Any, Optional, Union
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 import logging
+import threading
 from langchain.chains import RetrievalQA, ConversationalRetrievalChain
+from langchain.chains.conversational_retrieval.base import _get_chat_history
+from langchain.chains.combine_documents.refine import RefineDocumentsChain
 from langchain.memory import ConversationBufferMemory, ConversationSummaryMemory
 from langchain.prompts import PromptTemplate
 from langchain.schema import BaseRetriever, Document
 from langchain.agents import AgentExecutor, create_react_agent
 from langchain.tools import Tool
+from langchain_core.prompts import format_document
+from langchain_core.vectorstores import VectorStoreRetriever
 from langchain.mistralai import MistralAI
 from langchain_openai import OpenAI
 from langchain_cohere import CohereRerank
 from langchain_community.vectorstores import SupabaseVectorStore
 from langchain_community.embeddings import MistralAIEmbeddings, OpenAIEmbeddings
 
+from ..cache import SemanticCache
+from ..cache.embedding_cache import QueryKey
+from ..utils.clients import get_cohere_client_v2, get_http_client
 from ..utils.config import config
 
 logger = logging.getLogger(__name__)
 
+# Actif pendant la planification d'une étape : les actions sont alors
+# soumises au pool au lieu d'être exécutées immédiatement
+_tool_dispatch = threading.local()
+
+
+class ParallelToolExecutor(AgentExecutor):
+    """
+    AgentExecutor exécutant en parallèle les actions d'une même étape
+    
+    Lorsque l'agent émet plusieurs actions indépendantes, chaque appel
+    d'outil est soumis à tool_pool ; les résultats sont ensuite rassemblés
+    dans l'ordre des actions et l'état (scratchpad, mémoire) n'est mis à
+    jour que dans le thread principal.
+    """
+    
+    tool_pool: Any = None
+    
+    def _perform_agent_action(self, name_to_tool_map, color_mapping, agent_action, run_manager=None):
+        perform = super()._perform_agent_action
+        if self.tool_pool is None or not getattr(_tool_dispatch, "active", False):
+            return perform(name_to_tool_map, color_mapping, agent_action, run_manager)
+        return self.tool_pool.submit(perform, name_to_tool_map, color_mapping, agent_action, run_manager)
+    
+    def _take_next_step(self, name_to_tool_map, color_mapping, inputs, intermediate_steps, run_manager=None):
+        _tool_dispatch.active = True
+        try:
+            # Consommer le générateur soumet toutes les actions avant d'attendre
+            outputs = list(self._iter_next_step(
+                name_to_tool_map, color_mapping, inputs, intermediate_steps, run_manager
+            ))
+        finally:
+            _tool_dispatch.active = False
+        
+        return self._consume_next_step([
+            output.result() if isinstance(output, Future) else output
+            for output in outputs
+        ])
+
+
+class BatchedRefineDocumentsChain(RefineDocumentsChain):
+    """
+    Chaîne refine traitant les documents par groupes
+    
+    Les documents sont regroupés par batch_size avant l'affinage : chaque
+    étape reçoit un contexte combiné, ce qui divise le nombre d'appels LLM
+    (10 documents, groupes de 3 : 4 appels au lieu de 10).
+    """
+    
+    batch_size: int = 3
+    
+    @classmethod
+    def from_refine_chain(cls, chain: RefineDocumentsChain, batch_size: int) -> "BatchedRefineDocumentsChain":
+        """Construit la version groupée d'une chaîne refine existante"""
+        return cls(
+            initial_llm_chain=chain.initial_llm_chain,
+            refine_llm_chain=chain.refine_llm_chain,
+            document_variable_name=chain.document_variable_name,
+            initial_response_name=chain.initial_response_name,
+            document_prompt=chain.document_prompt,
+            return_intermediate_steps=chain.return_intermediate_steps,
+            batch_size=batch_size
+        )
+    
+    def _group_documents(self, docs: List[Document]) -> List[Document]:
+        """Fusionne les documents par groupes de batch_size"""
+        return [
+            Document(
+                page_content="\n\n".join(
+                    format_document(doc, self.document_prompt)
+                    for doc in docs[start:start + self.batch_size]
+                ),
+                metadata=docs[start].metadata
+            )
+            for start in range(0, len(docs), self.batch_size)
+        ]
+    
+    def combine_docs(self, docs: List[Document], callbacks=None, **kwargs):
+        return super().combine_docs(self._group_documents(docs), callbacks=callbacks, **kwargs)
+    
+    async def acombine_docs(self, docs: List[Document], callbacks=None, **kwargs):
+        return await super().acombine_docs(self._group_documents(docs), callbacks=callbacks, **kwargs)
+
+
+class CachedEmbeddingRetriever(BaseRetriever):
+    """
+    Récupérateur vectoriel réutilisant les embeddings de questions de RAGChain
+    
+    La recherche passe par similarity_search_by_vector avec l'embedding
+    fourni par embed (RAGChain.embed_question) : une question déjà embeddée
+    pour le cache des réponses ne refait pas d'appel à l'API d'embeddings.
+    """
+    
+    vectorstore: Any
+    embed: Any
+    search_kwargs: Dict[str, Any] = {}
+    
+    def _get_relevant_documents(self, query: str, *, run_manager=None) -> List[Document]:
+        return self.vectorstore.similarity_search_by_vector(self.embed(query), **self.search_kwargs)
+
+
+class CachedChatHistory:
+    """
+    Formateur d'historique incrémental pour ConversationalRetrievalChain
+    
+    Produit le même texte que le formateur par défaut de langchain
+    (_get_chat_history), mais ne formate que les messages ajoutés depuis
+    l'appel précédent au lieu de reconcaténer tout l'historique à chaque
+    question. Un historique vidé ou réécrit est reformaté entièrement.
+    """
+    
+    def __init__(self):
+        self._text = ""
+        self._count = 0
+        self._last = None
+        self._lock = threading.Lock()
+    
+    def __call__(self, chat_history) -> str:
+        with self._lock:
+            if self._count > len(chat_history) or (
+                self._count and chat_history[self._count - 1] is not self._last
+            ):
+                self._text, self._count, self._last = "", 0, None
+            if self._count < len(chat_history):
+                self._text += _get_chat_history(chat_history[self._count:])
+                self._count = len(chat_history)
+                self._last = chat_history[-1]
+            return self._text
+
 
 class RAGChain:
     """Chaîne RAG avec Langchain"""
@@ -57,6 +196,7 @@ class RAGChain:
         self._init_memory(memory_type)
         self._init_retriever()
         self._init_chain()
+        self._init_cache()
     
     def _init_llm(self):
         """Initialise le modèle de langage"""
@@ -70,7 +210,8 @@ class RAGChain:
             self.llm = OpenAI(
                 model=config.openai_generation_model,
                 temperature=config.temperature,
-                api_key=config.openai_api_key
+                api_key=config.openai_api_key,
+                http_client=get_http_client()
             )
         else:
             raise ValueError(f"Fournisseur LLM non supporté: {self.llm_provider}")
@@ -78,6 +219,8 @@ class RAGChain:
     def _init_embeddings(self):
         """Initialise les embeddings"""
         if self.embedding_provider == "mistral":
+            # Pas de client partagé : l'intégration Mistral de langchain crée
+            # son propre client httpx (URL de base et en-tête d'authentification)
             self.embeddings = MistralAIEmbeddings(
                 model=config.mistral_embedding_model,
                 api_key=config.mistral_api_key
@@ -85,17 +228,50 @@ class RAGChain:
         elif self.embedding_provider == "openai":
             self.embeddings = OpenAIEmbeddings(
                 model=config.openai_embedding_model,
-                api_key=config.openai_api_key
+                api_key=config.openai_api_key,
+                http_client=get_http_client()
             )
         else:
             raise ValueError(f"Fournisseur d'embeddings non supporté: {self.embedding_provider}")
     
+    def _init_cache(self):
+        """
+        Initialise le cache des requêtes à deux niveaux
+        
+        - Embeddings des questions, par question normalisée (LRU exact)
+        - Réponses, par similarité cosinus des questions (cache sémantique)
+        """
+        self._embed_question = lru_cache(maxsize=config.query_embedding_cache_size)(
+            lambda question: self.embeddings.embed_query(question.text)
+        )
+        self.answer_cache = SemanticCache(
+            threshold=config.answer_cache_threshold,
+            max_entries=config.answer_cache_max_entries,
+            ttl=config.answer_cache_ttl
+        )
+    
+    def embed_question(self, question: str) -> List[float]:
+        """
+        Calcule l'embedding d'une question (mis en cache par question normalisée)
+        
+        Seule la clé du cache est normalisée (casse, espaces) : l'embedding
+        est calculé sur la question telle qu'écrite.
+        
+        Args:
+            question: Question à embedder
+            
+        Returns:
+            Embedding de la question
+        """
+        return self._embed_question(QueryKey(question.strip()))
+    
     def _init_memory(self, memory_type: str):
         """Initialise la mémoire conversationnelle"""
         if not self.use_memory:
             self.memory = None
             return
         
+        self._chat_history = CachedChatHistory()
         if memory_type == "buffer":
             self.memory = ConversationBufferMemory(
                 memory_key="chat_history",
@@ -121,30 +297,65 @@ class RAGChain:
     
     def _init_chain(self):
         """Initialise la chaîne RAG"""
+        chain_type = config.rag_chain_type
+        
         if self.memory:
             self.chain = ConversationalRetrievalChain.from_llm(
                 llm=self.llm,
                 retriever=self.retriever,
                 memory=self.memory,
-                return_source_documents=True
+                chain_type=chain_type,
+                return_source_documents=True,
+                get_chat_history=self._chat_history
             )
+            if chain_type == "refine":
+                self.chain.combine_docs_chain = BatchedRefineDocumentsChain.from_refine_chain(
+                    self.chain.combine_docs_chain, config.refine_batch_size
+                )
         else:
             self.chain = RetrievalQA.from_chain_type(
                 llm=self.llm,
-                chain_type="stuff",
+                chain_type=chain_type,
                 retriever=self.retriever,
                 return_source_documents=True
             )
+            if chain_type == "refine":
+                self.chain.combine_documents_chain = BatchedRefineDocumentsChain.from_refine_chain(
+                    self.chain.combine_documents_chain, config.refine_batch_size
+                )
     
     def set_retriever(self, retriever: BaseRetriever):
-        """Définit le récupérateur"""
+        """
+        Définit le récupérateur
+        
+        Un récupérateur de similarité sur un vector store utilisant les
+        embeddings de la chaîne est remplacé par un CachedEmbeddingRetriever :
+        la recherche réutilise l'embedding de la question calculé par query().
+        """
+        if (
+            isinstance(retriever, VectorStoreRetriever)
+            and retriever.search_type == "similarity"
+            and retriever.vectorstore.embeddings is self.embeddings
+        ):
+            retriever = CachedEmbeddingRetriever(
+                vectorstore=retriever.vectorstore,
+                embed=self.embed_question,
+                search_kwargs=retriever.search_kwargs
+            )
         self.retriever = retriever
         self._init_chain()
+        self.clear_answer_cache()
     
     def query(self, question: str) -> Dict[str, Any]:
         """
         Pose une question à la chaîne RAG
         
+        Sans mémoire conversationnelle, une question proche (similarité
+        >= answer_cache_threshold) d'une question déjà posée reçoit la
+        réponse en cache sans nouvel appel au LLM (pendant answer_cache_ttl
+        secondes, ou jusqu'à clear_answer_cache()). Avec mémoire, la réponse
+        dépend de l'historique et n'est jamais mise en cache.
+        
         Args:
             question: Question à poser
             
@@ -155,17 +366,64 @@ class RAGChain:
             if self.memory:
                 result = self.chain({"question": question})
             else:
+                embedding = self.embed_question(question)
+                hit = self.answer_cache.get(embedding)
+                if hit is not None:
+                    logger.info(f"Réponse servie depuis le cache (similarité {hit[1]:.3f})")
+                    return dict(hit[0])
                 result = self.chain({"query": question})
             
-            return {
-                "answer": result["answer"],
+            response = {
+                "answer": result.get("answer", result.get("result")),
                 "source_documents": result.get("source_documents", []),
                 "chat_history": result.get("chat_history", [])
             }
+            if not self.memory:
+                self.answer_cache.set(embedding, response)
+            
+            return response
         except Exception as e:
             logger.error(f"Erreur lors de la requête: {str(e)}")
             raise
     
+    async def aquery(self, question: str) -> Dict[str, Any]:
+        """
+        Pose une question à la chaîne RAG (version asynchrone)
+        
+        Args:
+            question: Question à poser
+            
+        Returns:
+            Réponse avec sources
+        """
+        try:
+            if self.memory:
+                result = await self.chain.ainvoke({"question": question})
+            else:
+                embedding = await asyncio.to_thread(self.embed_question, question)
+                hit = self.answer_cache.get(embedding)
+                if hit is not None:
+                    logger.info(f"Réponse servie depuis le cache (similarité {hit[1]:.3f})")
+                    return dict(hit[0])
+                result = await self.chain.ainvoke({"query": question})
+            
+            response = {
+                "answer": result.get("answer", result.get("result")),
+                "source_documents": result.get("source_documents", []),
+                "chat_history": result.get("chat_history", [])
+            }
+            if not self.memory:
+                self.answer_cache.set(embedding, response)
+            
+            return response
+        except Exception as e:
+            logger.error(f"Erreur lors de la requête: {str(e)}")
+            raise
+    
+    def clear_answer_cache(self):
+        """Oublie les réponses en cache (à appeler après l'ingestion de documents)"""
+        self.answer_cache.clear()
+    
     def clear_memory(self):
         """Efface la mémoire conversationnelle"""
         if self.memory:
@@ -183,6 +441,7 @@ class RAGAgent:
             rag_chain: Chaîne RAG à utiliser
         """
         self.rag_chain = rag_chain
+        self._pool = ThreadPoolExecutor(max_workers=config.tool_concurrency_limit)
         self._init_tools()
         self._init_agent()
     
@@ -223,11 +482,12 @@ class RAGAgent:
             prompt=agent_prompt
         )
         
-        self.agent_executor = AgentExecutor(
+        self.agent_executor = ParallelToolExecutor(
             agent=self.agent,
             tools=self.tools,
             verbose=True,
-            handle_parsing_errors=True
+            handle_parsing_errors=True,
+            tool_pool=self._pool
         )
     
     def _rag_search(self, query: str) -> str:
@@ -290,7 +550,8 @@ class DocumentProcessingChain:
             self.llm = OpenAI(
                 model=config.openai_generation_model,
                 temperature=config.temperature,
-                api_key=config.openai_api_key
+                api_key=config.openai_api_key,
+                http_client=get_http_client()
             )
     
     def _init_prompts(self):
@@ -323,14 +584,17 @@ class DocumentProcessingChain:
         
         Catégorie:
         """)
+        
+        # Gabarits statiques : formatage direct par str.format, sans passer
+        # par l'analyse de PromptTemplate à chaque appel
+        self._summarize_fn = self.summarize_prompt.template.format
+        self._extract_keywords_fn = self.extract_keywords_prompt.template.format
+        self._classify_fn = self.classify_prompt.template.format
     
     def summarize_document(self, document: str, max_words: int = 100) -> str:
         """Résume un document"""
         try:
-            prompt = self.summarize_prompt.format(
-                document=document,
-                max_words=max_words
-            )
+            prompt = self._summarize_fn(document=document, max_words=max_words)
             response = self.llm.invoke(prompt)
             return response.content
         except Exception as e:
@@ -340,7 +604,7 @@ class DocumentProcessingChain:
     def extract_keywords(self, document: str) -> List[str]:
         """Extrait les mots-clés d'un document"""
         try:
-            prompt = self.extract_keywords_prompt.format(document=document)
+            prompt = self._extract_keywords_fn(document=document)
             response = self.llm.invoke(prompt)
             keywords = response.content.strip().split(',')
             return [kw.strip() for kw in keywords if kw.strip()]
@@ -351,12 +615,85 @@ class DocumentProcessingChain:
     def classify_document(self, document: str) -> str:
         """Classe un document"""
         try:
-            prompt = self.classify_prompt.format(document=document)
+            prompt = self._classify_fn(document=document)
             response = self.llm.invoke(prompt)
             return response.content.strip()
         except Exception as e:
             logger.error(f"Erreur lors de la classification: {str(e)}")
             raise
+    
+    async def asummarize_document(self, document: str, max_words: int = 100) -> str:
+        """Résume un document (version asynchrone)"""
+        try:
+            prompt = self._summarize_fn(document=document, max_words=max_words)
+            response = await self.llm.ainvoke(prompt)
+            return response.content
+        except Exception as e:
+            logger.error(f"Erreur lors du résumé: {str(e)}")
+            raise
+    
+    async def aextract_keywords(self, document: str) -> List[str]:
+        """Extrait les mots-clés d'un document (version asynchrone)"""
+        try:
+            prompt = self._extract_keywords_fn(document=document)
+            response = await self.llm.ainvoke(prompt)
+            keywords = response.content.strip().split(',')
+            return [kw.strip() for kw in keywords if kw.strip()]
+        except Exception as e:
+            logger.error(f"Erreur lors de l'extraction des mots-clés: {str(e)}")
+            raise
+    
+    async def aclassify_document(self, document: str) -> str:
+        """Classe un document (version asynchrone)"""
+        try:
+            prompt = self._classify_fn(document=document)
+            response = await self.llm.ainvoke(prompt)
+            return response.content.strip()
+        except Exception as e:
+            logger.error(f"Erreur lors de la classification: {str(e)}")
+            raise
+    
+    async def aprocess_batch(
+        self,
+        documents: List[str],
+        max_concurrency: int = 8,
+        max_words: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Résume, extrait les mots-clés et classe plusieurs documents en parallèle
+        
+        Args:
+            documents: Liste des documents
+            max_concurrency: Nombre maximum d'appels LLM simultanés
+            max_words: Longueur maximale des résumés
+            
+        Returns:
+            Pour chaque document : {summary, keywords, category}
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def limited(coro):
+            async with semaphore:
+                return await coro
+        
+        async def process_one(document: str) -> Dict[str, Any]:
+            summary, keywords, category = await asyncio.gather(
+                limited(self.asummarize_document(document, max_words)),
+                limited(self.aextract_keywords(document)),
+                limited(self.aclassify_document(document))
+            )
+            return {"summary": summary, "keywords": keywords, "category": category}
+        
+        return await asyncio.gather(*(process_one(document) for document in documents))
+    
+    def process_documents(
+        self,
+        documents: List[str],
+        max_concurrency: int = 8,
+        max_words: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Version synchrone de aprocess_batch"""
+        return asyncio.run(self.aprocess_batch(documents, max_concurrency, max_words))
 
 
 class RAGWithReranking:
@@ -373,6 +710,7 @@ class RAGWithReranking:
         self.reranker = CohereRerank(
             model=config.cohere_rerank_model,
             api_key=config.cohere_api_key,
+            client=get_cohere_client_v2(config.cohere_api_key),
             top_n=config.rerank_top_k
         )
     
@@ -402,3 +740,41 @@ class RAGWithReranking:
         except Exception as e:
             logger.error(f"Erreur lors du reranking: {str(e)}")
             raise
+    
+    async def aquery_with_reranking_batch(
+        self,
+        questions: List[str],
+        max_concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Pose plusieurs questions avec reranking en parallèle
+        
+        Récupération, génération et reranking de chaque question sont
+        enchaînés dans une même tâche ; les tâches s'exécutent en parallèle
+        dans la limite de max_concurrency.
+        
+        Args:
+            questions: Questions à poser
+            max_concurrency: Nombre maximum de questions traitées simultanément
+                (config.query_concurrency par défaut)
+            
+        Returns:
+            Réponses avec documents rerankés, dans l'ordre des questions
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or config.query_concurrency)
+        
+        async def query_one(question: str) -> Dict[str, Any]:
+            async with semaphore:
+                result = await self.rag_chain.aquery(question)
+                if result.get("source_documents"):
+                    result["reranked_documents"] = await self.reranker.acompress_documents(
+                        result["source_documents"],
+                        question
+                    )
+                return result
+        
+        try:
+            return await asyncio.gather(*(query_one(question) for question in questions))
+        except Exception as e:
+            logger.error(f"Erreur lors du reranking par lot: {str(e)}")
+            raise
@@ -8,9 +8,12 @@ Ce module implémente l'OCR pour extraire le texte de :
 - Documents non-texte
 """
 
+import multiprocessing
 import os
 import tempfile
-from typing import List, Dict, Any, Optional, Union
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, Literal, Optional, Union
 from pathlib import Path
 import logging
 import cv2
@@ -18,11 +21,80 @@ import numpy as np
 from PIL import Image
 import pytesseract
 import easyocr
-from pdf2image import convert_from_path
+import torch
+from pdf2image import convert_from_path, pdfinfo_from_path
 from ..utils.config import config
+from .preprocessing import NUMBA_AVAILABLE, _BufferPool, fused_preprocess
 
 logger = logging.getLogger(__name__)
 
+# Images intermédiaires du préprocessing, réutilisées d'une page à l'autre
+_buffer_pool = _BufferPool()
+
+class _HalfPrecision(torch.nn.Module):
+    """Exécute un modèle en FP16 en convertissant ses entrées et sorties flottantes"""
+    
+    def __init__(self, module: torch.nn.Module):
+        super().__init__()
+        self.module = module.half()
+    
+    def forward(self, *args):
+        args = [arg.half() if torch.is_tensor(arg) and arg.is_floating_point() else arg for arg in args]
+        return self.module(*args).float()
+
+
+@lru_cache(maxsize=4)
+def _get_easyocr_reader(languages: tuple, gpu: bool, precision: str = "fp32") -> easyocr.Reader:
+    """
+    Retourne le lecteur EasyOCR partagé pour un jeu de langues
+    
+    Le chargement des modèles (détection CRAFT + reconnaissance, ~150 Mo)
+    prend plusieurs secondes : les instances d'OCRProcessor d'un même
+    processus partagent donc le même lecteur (et la même mémoire GPU).
+    
+    Args:
+        languages: Langues du lecteur
+        gpu: Utiliser le GPU
+        precision: Précision du modèle de reconnaissance ("fp32", "fp16"
+            sur GPU, "int8" sur CPU)
+        
+    Returns:
+        Lecteur EasyOCR
+    """
+    if gpu:
+        # Tailles de pages constantes : laisser cuDNN choisir ses algorithmes
+        torch.backends.cudnn.benchmark = True
+    reader = easyocr.Reader(list(languages), gpu=gpu)
+    
+    if precision == "fp16" and gpu:
+        reader.recognizer = _HalfPrecision(reader.recognizer)
+    elif precision == "int8" and not gpu:
+        # Quantification dynamique des couches LSTM et linéaires du CRNN
+        reader.recognizer = torch.quantization.quantize_dynamic(
+            reader.recognizer, {torch.nn.Linear, torch.nn.LSTM}, dtype=torch.qint8
+        )
+    elif precision != "fp32":
+        logger.warning(f"Précision {precision} non disponible {'sur GPU' if gpu else 'sur CPU'}, FP32 utilisé")
+    
+    return reader
+
+
+# Processeur OCR propre à chaque processus du pool (voir batch_process)
+_worker_processor: Optional["OCRProcessor"] = None
+
+
+def _init_worker(ocr_engine: str, languages: List[str], tesseract_path: Optional[str], precision: str):
+    """Crée le processeur OCR d'un processus du pool (les lecteurs EasyOCR ne sont pas sérialisables)"""
+    global _worker_processor
+    # Un processus par cœur : un thread torch chacun, sans sursouscription du CPU
+    torch.set_num_threads(1)
+    _worker_processor = OCRProcessor(ocr_engine, languages, tesseract_path, precision)
+
+
+def _process_one_file(file_path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    """Traite un fichier dans un processus du pool"""
+    return _worker_processor.process_file(file_path)
+
 
 class OCRProcessor:
     """Processeur OCR principal avec support multiple moteurs"""
@@ -31,7 +103,8 @@ class OCRProcessor:
         self, 
         ocr_engine: str = "tesseract",
         languages: List[str] = None,
-        tesseract_path: str = None
+        tesseract_path: str = None,
+        precision: Literal["fp32", "fp16", "int8"] = "fp32"
     ):
         """
         Initialise le processeur OCR
@@ -40,10 +113,15 @@ class OCRProcessor:
             ocr_engine: Moteur OCR ("tesseract", "easyocr", "hybrid")
             languages: Langues supportées
             tesseract_path: Chemin vers tesseract (optionnel)
+            precision: Précision du modèle de reconnaissance EasyOCR
+                ("fp16" sur GPU, "int8" sur CPU)
         """
         self.ocr_engine = ocr_engine
         self.languages = languages or ["fra", "eng"]  # Français et anglais par défaut
         self.tesseract_path = tesseract_path
+        self.precision = precision
+        self._tesseract_config = f"--oem 3 --psm 6 -l {'+'.join(self.languages)}"
+        self.use_gpu = torch.cuda.is_available()
         
         # Initialiser les moteurs OCR
         self._init_ocr_engines()
@@ -64,7 +142,9 @@ class OCRProcessor:
         
         if self.ocr_engine in ["easyocr", "hybrid"]:
             try:
-                self.easyocr_reader = easyocr.Reader(self.languages)
+                self.easyocr_reader = _get_easyocr_reader(
+                    tuple(self.languages), self.use_gpu, self.precision
+                )
                 logger.info("EasyOCR initialisé avec succès")
             except Exception as e:
                 logger.warning(f"EasyOCR non disponible: {str(e)}")
@@ -74,7 +154,8 @@ class OCRProcessor:
     def extract_text_from_image(
         self, 
         image_path: Union[str, Path], 
-        preprocess: bool = True
+        preprocess: bool = True,
+        max_edge: Optional[int] = 2200
     ) -> Dict[str, Any]:
         """
         Extrait le texte d'une image
@@ -82,6 +163,9 @@ class OCRProcessor:
         Args:
             image_path: Chemin vers l'image
             preprocess: Appliquer le préprocessing (optionnel)
+            max_edge: Plus grand côté (pixels) au-delà duquel l'image est
+                réduite avant le préprocessing (None pour désactiver, ignoré
+                si preprocess=False)
             
         Returns:
             Dictionnaire avec le texte extrait et métadonnées
@@ -94,6 +178,8 @@ class OCRProcessor:
             
             # Préprocessing si demandé
             if preprocess:
+                if max_edge:
+                    image = self._limit_size(image, max_edge)
                 image = self._preprocess_image(image)
             
             # Extraire le texte selon le moteur
@@ -138,35 +224,15 @@ class OCRProcessor:
             Dictionnaire avec le texte extrait et métadonnées
         """
         try:
-            # Convertir le PDF en images
-            images = convert_from_path(
-                str(pdf_path), 
-                dpi=dpi,
-                first_page=pages[0] if pages else None,
-                last_page=pages[-1] if pages else None
-            )
-            
-            all_text = []
-            page_results = []
-            
-            for i, image in enumerate(images):
-                # Convertir PIL en OpenCV
-                image_cv = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
-                
-                # Extraire le texte de cette page
-                page_result = self._extract_text_from_cv_image(image_cv)
-                page_result['page_number'] = i + 1
-                
-                all_text.append(page_result['text'])
-                page_results.append(page_result)
+            page_results = list(self.iter_pdf_pages(pdf_path, pages, dpi))
             
             # Combiner tous les textes
-            full_text = '\n\n'.join(all_text)
+            full_text = '\n\n'.join(page_result['text'] for page_result in page_results)
             
             return {
                 'text': full_text,
                 'pages': page_results,
-                'total_pages': len(images),
+                'total_pages': len(page_results),
                 'source': str(pdf_path),
                 'engine': self.ocr_engine,
                 'dpi': dpi
@@ -176,24 +242,116 @@ class OCRProcessor:
             logger.error(f"Erreur lors de l'extraction PDF: {str(e)}")
             raise
     
+    def iter_pdf_pages(
+        self,
+        pdf_path: Union[str, Path],
+        pages: Optional[List[int]] = None,
+        dpi: int = 300
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Extrait le texte d'un PDF scanné page par page
+        
+        Chaque page est rastérisée puis traitée individuellement : une seule
+        image de page (~25 Mo à 300 DPI en A4) est en mémoire à la fois,
+        quel que soit le nombre de pages du document. Avec EasyOCR sur GPU,
+        les pages sont reconnues par groupes de config.ocr_gpu_page_batch.
+        
+        Args:
+            pdf_path: Chemin vers le PDF
+            pages: Pages à traiter (optionnel, toutes si None)
+            dpi: Résolution pour la conversion
+            
+        Yields:
+            Le résultat OCR de chaque page
+        """
+        if pages:
+            first_page, last_page = pages[0], pages[-1]
+        else:
+            first_page, last_page = 1, pdfinfo_from_path(str(pdf_path))["Pages"]
+        
+        batch_pages = config.ocr_gpu_page_batch if self.ocr_engine == "easyocr" and self.use_gpu else 1
+        batch: List[np.ndarray] = []
+        
+        for i, page_number in enumerate(range(first_page, last_page + 1)):
+            image = convert_from_path(
+                str(pdf_path),
+                dpi=dpi,
+                first_page=page_number,
+                last_page=page_number
+            )[0]
+            
+            # Convertir PIL en OpenCV, directement en niveaux de gris : les
+            # moteurs OCR n'utilisent pas la couleur (1 canal au lieu de 3)
+            image_cv = cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2GRAY)
+            del image
+            
+            if batch_pages > 1:
+                batch.append(image_cv)
+                if len(batch) == batch_pages or page_number == last_page:
+                    first_index = i + 2 - len(batch)
+                    for offset, page_result in enumerate(self._extract_batch_with_easyocr(batch)):
+                        page_result['page_number'] = first_index + offset
+                        yield page_result
+                    batch = []
+                continue
+            
+            # Extraire le texte de cette page
+            page_result = self._extract_text_from_cv_image(image_cv)
+            page_result['page_number'] = i + 1
+            
+            yield page_result
+    
+    @staticmethod
+    def _limit_size(image: np.ndarray, max_edge: int) -> np.ndarray:
+        """
+        Réduit l'image pour que son plus grand côté ne dépasse pas max_edge
+        
+        Le coût de Tesseract et du préprocessing croît avec le nombre de
+        pixels ; une photo de téléphone (4000x3000) ramenée à 2200 pixels
+        garde une résolution suffisante pour le texte courant.
+        
+        Args:
+            image: Image OpenCV
+            max_edge: Taille maximale du plus grand côté
+            
+        Returns:
+            Image éventuellement réduite (proportions conservées)
+        """
+        scale = min(1.0, max_edge / max(image.shape[:2]))
+        if scale >= 1.0:
+            return image
+        return cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    
     def _preprocess_image(self, image: np.ndarray) -> np.ndarray:
         """Préprocesse l'image pour améliorer l'OCR"""
         try:
-            # Convertir en niveaux de gris
-            if len(image.shape) == 3:
-                gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            else:
-                gray = image
-            
-            # Réduction du bruit
-            denoised = cv2.medianBlur(gray, 3)
+            if config.ocr_fused_preprocess and NUMBA_AVAILABLE:
+                return fused_preprocess(image, clip_limit=2.0, tiles=8)
             
-            # Amélioration du contraste
-            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-            enhanced = clahe.apply(denoised)
+            shape = image.shape[:2]
+            pooled = []
             
-            # Binarisation
-            _, binary = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+            try:
+                # Convertir en niveaux de gris
+                if len(image.shape) == 3:
+                    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=_buffer_pool.acquire(shape))
+                    pooled.append(gray)
+                else:
+                    gray = image
+                
+                # Réduction du bruit
+                denoised = cv2.medianBlur(gray, 3, dst=_buffer_pool.acquire(shape))
+                pooled.append(denoised)
+                
+                # Amélioration du contraste
+                clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+                enhanced = clahe.apply(denoised, dst=_buffer_pool.acquire(shape))
+                pooled.append(enhanced)
+                
+                # Binarisation (l'image retournée n'est pas prise dans la réserve)
+                _, binary = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+            finally:
+                _buffer_pool.release(*pooled)
             
             return binary
             
@@ -202,20 +360,24 @@ class OCRProcessor:
             return image
     
     def _extract_with_tesseract(self, image: np.ndarray) -> Dict[str, Any]:
-        """Extrait le texte avec Tesseract"""
+        """Extrait le texte avec Tesseract (une seule passe OCR)"""
         try:
-            # Configuration Tesseract
-            config_tesseract = f"--oem 3 --psm 6 -l {'+'.join(self.languages)}"
-            
-            # Extraction du texte
-            text = pytesseract.image_to_string(image, config=config_tesseract)
-            
             # Extraction des données structurées
-            data = pytesseract.image_to_data(image, config=config_tesseract, output_type=pytesseract.Output.DICT)
+            data = pytesseract.image_to_data(
+                image, config=self._tesseract_config, output_type=pytesseract.Output.DICT
+            )
+            
+            # Reconstituer le texte ligne par ligne à partir des mots
+            lines = {}
+            for word, block, par, line in zip(data['text'], data['block_num'], data['par_num'], data['line_num']):
+                if word.strip():
+                    lines.setdefault((block, par, line), []).append(word)
+            text = '\n'.join(' '.join(words) for words in lines.values())
             
-            # Calculer la confiance moyenne
-            confidences = [int(conf) for conf in data['conf'] if int(conf) > 0]
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0
+            # Calculer la confiance moyenne (les mots non reconnus valent -1)
+            confidences = np.asarray(data['conf'], dtype=np.float32)
+            valid = confidences > 0
+            avg_confidence = float(confidences[valid].mean()) if valid.any() else 0
             
             return {
                 'text': text.strip(),
@@ -232,43 +394,86 @@ class OCRProcessor:
         """Extrait le texte avec EasyOCR"""
         try:
             # Extraction avec EasyOCR
-            results = self.easyocr_reader.readtext(image)
-            
-            # Combiner tous les textes
-            text_parts = []
-            confidences = []
+            with torch.inference_mode():
+                results = self.easyocr_reader.readtext(image)
             
-            for (bbox, text, confidence) in results:
-                if confidence > 0.5:  # Seuil de confiance
-                    text_parts.append(text)
-                    confidences.append(confidence)
-            
-            full_text = ' '.join(text_parts)
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0
-            
-            return {
-                'text': full_text,
-                'confidence': avg_confidence,
-                'word_count': len(full_text.split()),
-                'char_count': len(full_text),
-                'detections': results
-            }
+            return self._easyocr_result(results)
             
         except Exception as e:
             logger.error(f"Erreur EasyOCR: {str(e)}")
             return {'text': '', 'confidence': 0, 'word_count': 0, 'char_count': 0}
     
+    def _extract_batch_with_easyocr(self, images: List[np.ndarray]) -> List[Dict[str, Any]]:
+        """
+        Extrait le texte de plusieurs pages en une passe EasyOCR (GPU)
+        
+        readtext_batched exige des images de même taille : les pages de
+        tailles différentes sont traitées une par une.
+        
+        Args:
+            images: Images OpenCV des pages
+            
+        Returns:
+            Résultat OCR de chaque page, dans l'ordre
+        """
+        if len({image.shape for image in images}) > 1:
+            return [self._extract_with_easyocr(image) for image in images]
+        
+        try:
+            with torch.inference_mode():
+                batch_results = self.easyocr_reader.readtext_batched(images, batch_size=8)
+            return [self._easyocr_result(results) for results in batch_results]
+            
+        except Exception as e:
+            logger.warning(f"Erreur EasyOCR par lot, traitement page par page: {str(e)}")
+            return [self._extract_with_easyocr(image) for image in images]
+    
+    @staticmethod
+    def _easyocr_result(results: List[Any]) -> Dict[str, Any]:
+        """Combine les détections EasyOCR au-dessus du seuil de confiance"""
+        # Une seule passe : seuls les textes retenus sont conservés
+        parts = []
+        sum_confidence = 0.0
+        for _, text, confidence in results:
+            if confidence > 0.5:
+                parts.append(text)
+                sum_confidence += confidence
+        
+        full_text = ' '.join(parts)
+        avg_confidence = sum_confidence / len(parts) if parts else 0
+        
+        return {
+            'text': full_text,
+            'confidence': avg_confidence,
+            'word_count': len(full_text.split()),
+            'char_count': len(full_text),
+            'detections': results
+        }
+    
     def _extract_with_hybrid(self, image: np.ndarray) -> Dict[str, Any]:
-        """Extrait le texte avec approche hybride"""
+        """
+        Extrait le texte avec approche hybride
+        
+        Tesseract est lancé en premier ; EasyOCR, plus coûteux, n'est
+        utilisé que si le texte Tesseract est vide ou de confiance
+        inférieure à config.ocr_hybrid_confidence_threshold.
+        """
         try:
+            threshold = config.ocr_hybrid_confidence_threshold
+            
             # Essayer Tesseract d'abord
             tesseract_result = self._extract_with_tesseract(image)
+            tesseract_confidence = tesseract_result['confidence']
+            if tesseract_result['text'].strip() and tesseract_confidence >= threshold:
+                tesseract_result['method_used'] = 'tesseract'
+                return tesseract_result
             
-            # Essayer EasyOCR
+            # Essayer EasyOCR (confiance 0-1, ramenée sur l'échelle 0-100 de Tesseract)
             easyocr_result = self._extract_with_easyocr(image)
+            easyocr_confidence = easyocr_result['confidence'] * 100
             
             # Choisir le meilleur résultat
-            if tesseract_result['confidence'] > easyocr_result['confidence']:
+            if tesseract_confidence > easyocr_confidence:
                 result = tesseract_result
                 result['method_used'] = 'tesseract'
             else:
@@ -276,7 +481,10 @@ class OCRProcessor:
                 result['method_used'] = 'easyocr'
             
             # Combiner les textes si les confidences sont proches
-            if abs(tesseract_result['confidence'] - easyocr_result['confidence']) < 10:
+            if (
+                max(tesseract_confidence, easyocr_confidence) < threshold
+                and abs(tesseract_confidence - easyocr_confidence) < 10
+            ):
                 combined_text = f"{tesseract_result['text']}\n{easyocr_result['text']}"
                 result['text'] = combined_text
                 result['method_used'] = 'hybrid'
@@ -298,50 +506,86 @@ class OCRProcessor:
         else:
             raise ValueError(f"Moteur OCR non supporté: {self.ocr_engine}")
     
+    def process_file(self, file_path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+        """
+        Traite un fichier (PDF ou image)
+        
+        Args:
+            file_path: Chemin du fichier
+            
+        Returns:
+            Résultat OCR, résultat d'erreur, ou None si le format n'est pas supporté
+        """
+        try:
+            file_path = Path(file_path)
+            
+            if file_path.suffix.lower() == '.pdf':
+                return self.extract_text_from_pdf(file_path)
+            elif file_path.suffix.lower() in ['.png', '.jpg', '.jpeg', '.tiff', '.bmp']:
+                return self.extract_text_from_image(file_path)
+            
+            logger.warning(f"Format de fichier non supporté: {file_path}")
+            return None
+            
+        except Exception as e:
+            logger.error(f"Erreur lors du traitement de {file_path}: {str(e)}")
+            return {
+                'source': str(file_path),
+                'text': '',
+                'error': str(e)
+            }
+    
     def batch_process(
         self, 
         file_paths: List[Union[str, Path]], 
-        output_dir: Optional[Union[str, Path]] = None
+        output_dir: Optional[Union[str, Path]] = None,
+        max_workers: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Traite plusieurs fichiers en batch
         
+        L'OCR étant limité par le CPU, les fichiers sont répartis sur un pool
+        de processus (un OCRProcessor par processus, démarrés en "spawn" :
+        un processus forké hériterait du lecteur EasyOCR en cache et d'un
+        contexte CUDA inutilisable). Avec EasyOCR sur GPU, les fichiers
+        sont traités dans le processus courant, qui partage le modèle.
+        
         Args:
             file_paths: Liste des chemins de fichiers
             output_dir: Répertoire de sortie (optionnel)
+            max_workers: Nombre de processus (optionnel, un par cœur ; 1 pour
+                traiter les fichiers dans le processus courant)
             
         Returns:
             Liste des résultats pour chaque fichier
         """
-        results = []
+        max_workers = max_workers or os.cpu_count() or 1
         
-        for file_path in file_paths:
-            try:
-                file_path = Path(file_path)
-                
-                if file_path.suffix.lower() == '.pdf':
-                    result = self.extract_text_from_pdf(file_path)
-                elif file_path.suffix.lower() in ['.png', '.jpg', '.jpeg', '.tiff', '.bmp']:
-                    result = self.extract_text_from_image(file_path)
-                else:
-                    logger.warning(f"Format de fichier non supporté: {file_path}")
-                    continue
-                
-                # Sauvegarder si répertoire de sortie spécifié
-                if output_dir:
-                    output_path = Path(output_dir) / f"{file_path.stem}_ocr.txt"
-                    with open(output_path, 'w', encoding='utf-8') as f:
-                        f.write(result['text'])
-                
-                results.append(result)
-                
-            except Exception as e:
-                logger.error(f"Erreur lors du traitement de {file_path}: {str(e)}")
-                results.append({
-                    'source': str(file_path),
-                    'text': '',
-                    'error': str(e)
-                })
+        gpu_model = self.use_gpu and self.ocr_engine in ["easyocr", "hybrid"]
+        
+        if max_workers == 1 or len(file_paths) <= 1 or gpu_model:
+            outputs = [self.process_file(file_path) for file_path in file_paths]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=min(max_workers, len(file_paths)),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.ocr_engine, self.languages, self.tesseract_path, self.precision)
+            ) as executor:
+                outputs = list(executor.map(_process_one_file, file_paths, chunksize=4))
+        
+        results = []
+        for file_path, result in zip(file_paths, outputs):
+            if result is None:
+                continue
+            
+            # Sauvegarder si répertoire de sortie spécifié
+            if output_dir and 'error' not in result:
+                output_path = Path(output_dir) / f"{Path(file_path).stem}_ocr.txt"
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    f.write(result['text'])
+            
+            results.append(result)
         
         return results
 
@@ -349,14 +593,25 @@ class OCRProcessor:
 class DocumentOCRProcessor:
     """Processeur OCR spécialisé pour les documents du système RAG"""
     
-    def __init__(self, ocr_processor: OCRProcessor = None):
+    def __init__(self, ocr_processor: OCRProcessor = None, embeddings=None):
         """
         Initialise le processeur OCR pour documents
         
         Args:
             ocr_processor: Processeur OCR (optionnel)
+            embeddings: Objet exposant embed_documents(textes) (optionnel,
+                EmbeddingManager Mistral avec cache persistant par défaut)
         """
         self.ocr_processor = ocr_processor or OCRProcessor()
+        self._embeddings = embeddings
+    
+    @property
+    def embeddings(self):
+        """Fournisseur d'embeddings (créé au premier usage)"""
+        if self._embeddings is None:
+            from ..embeddings import EmbeddingManager
+            self._embeddings = EmbeddingManager()
+        return self._embeddings
     
     def process_document_for_rag(
         self, 
@@ -407,3 +662,51 @@ class DocumentOCRProcessor:
         except Exception as e:
             logger.error(f"Erreur lors du traitement du document {file_path}: {str(e)}")
             raise
+    
+    def batch_process_for_rag(
+        self,
+        file_paths: List[Union[str, Path]],
+        batch_size: int = None,
+        metadata: Dict[str, Any] = None,
+        max_workers: int = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Traite plusieurs documents pour le RAG et calcule leurs embeddings
+        
+        L'OCR des fichiers est lancé en parallèle (Tesseract et EasyOCR
+        libèrent le GIL), puis les textes obtenus sont embeddés par lots
+        de batch_size en un seul appel API par lot.
+        
+        Args:
+            file_paths: Liste des chemins de fichiers
+            batch_size: Nombre de textes par appel d'embeddings (optionnel)
+            metadata: Métadonnées communes à tous les documents (optionnel)
+            max_workers: Nombre de fichiers traités simultanément (optionnel)
+            
+        Returns:
+            Documents formatés pour le RAG, avec une clé 'embedding'
+        """
+        batch_size = batch_size or config.ocr_embedding_batch_size
+        
+        def process(file_path: Union[str, Path]) -> Dict[str, Any]:
+            try:
+                return self.process_document_for_rag(file_path, metadata)
+            except Exception as e:
+                return {'content': '', 'source': str(file_path), 'error': str(e)}
+        
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            documents = list(executor.map(process, file_paths))
+        
+        # Embeddings par lots, uniquement pour les documents avec du texte
+        to_embed = [doc for doc in documents if doc['content'].strip()]
+        for start in range(0, len(to_embed), batch_size):
+            batch = to_embed[start:start + batch_size]
+            try:
+                vectors = self.embeddings.embed_documents([doc['content'] for doc in batch])
+            except Exception as e:
+                logger.error(f"Erreur lors de l'embedding des documents OCR: {str(e)}")
+                raise
+            for doc, vector in zip(batch, vectors):
+                doc['embedding'] = vector
+        
+        return documents
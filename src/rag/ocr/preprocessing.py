@@ -0,0 +1,289 @@
+"""
+Préprocessing fusionné des images OCR
+=====================================
+
+Noyaux Numba regroupant les étapes de _preprocess_image (niveaux de gris,
+filtre médian 3x3, CLAHE, binarisation d'Otsu) en un minimum de passes sur
+l'image : la conversion en gris est faite à la volée par le filtre médian
+et l'histogramme global d'Otsu est calculé pendant l'application du CLAHE.
+
+Les résultats suivent les conventions d'OpenCV (coefficients de gris,
+bords répliqués, extension par réflexion des images dont la taille n'est
+pas multiple du nombre de tuiles, écrêtage et interpolation du CLAHE) ; le
+chemin OpenCV reste la référence lorsque Numba n'est pas installé.
+"""
+
+import threading
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # Numba est optionnel
+    numba = None
+
+NUMBA_AVAILABLE = numba is not None
+
+# Nombre de blocs de lignes pour le calcul parallèle de l'histogramme global
+_HIST_BLOCKS = 64
+
+
+if numba is not None:
+    @numba.njit(cache=True, inline="always")
+    def _gray_at(img, y, x):
+        if img.shape[2] == 1:
+            return np.int32(img[y, x, 0])
+        # Coefficients BGR -> gris d'OpenCV en virgule fixe (14 bits)
+        return (np.int32(img[y, x, 0]) * 1868 + np.int32(img[y, x, 1]) * 9617
+                + np.int32(img[y, x, 2]) * 4899 + 8192) >> 14
+
+    @numba.njit(cache=True, inline="always")
+    def _gray_row(img, y, row):
+        w = img.shape[1]
+        for x in range(w):
+            row[x + 1] = _gray_at(img, y, x)
+        row[0] = row[1]
+        row[w + 1] = row[w]
+
+    @numba.njit(cache=True, inline="always")
+    def _median9(a0, a1, a2, a3, a4, a5, a6, a7, a8):
+        # Réseau de tri minimal pour la médiane de 9 valeurs (19 échanges)
+        a1, a2 = min(a1, a2), max(a1, a2)
+        a4, a5 = min(a4, a5), max(a4, a5)
+        a7, a8 = min(a7, a8), max(a7, a8)
+        a0, a1 = min(a0, a1), max(a0, a1)
+        a3, a4 = min(a3, a4), max(a3, a4)
+        a6, a7 = min(a6, a7), max(a6, a7)
+        a1, a2 = min(a1, a2), max(a1, a2)
+        a4, a5 = min(a4, a5), max(a4, a5)
+        a7, a8 = min(a7, a8), max(a7, a8)
+        a3 = max(a0, a3)
+        a5 = min(a5, a8)
+        a4, a7 = min(a4, a7), max(a4, a7)
+        a6 = max(a3, a6)
+        a4 = max(a1, a4)
+        a2 = min(a2, a5)
+        a4 = min(a4, a7)
+        a4, a2 = min(a4, a2), max(a4, a2)
+        a4 = max(a6, a4)
+        return min(a4, a2)
+
+    @numba.njit(cache=True, parallel=True)
+    def _gray_median3(img):
+        h, w = img.shape[0], img.shape[1]
+        out = np.empty((h, w), dtype=np.uint8)
+        rows_per_block = (h + _HIST_BLOCKS - 1) // _HIST_BLOCKS
+
+        for b in numba.prange(_HIST_BLOCKS):
+            y_start = b * rows_per_block
+            y_end = min(y_start + rows_per_block, h)
+            if y_start >= y_end:
+                continue
+
+            # Fenêtre glissante de 3 lignes en gris (bords répliqués)
+            rows = np.empty((3, w + 2), dtype=np.int32)
+            _gray_row(img, max(y_start - 1, 0), rows[0])
+            _gray_row(img, y_start, rows[1])
+            for y in range(y_start, y_end):
+                _gray_row(img, min(y + 1, h - 1), rows[(y - y_start + 2) % 3])
+                top = rows[(y - y_start) % 3]
+                mid = rows[(y - y_start + 1) % 3]
+                bot = rows[(y - y_start + 2) % 3]
+                for x in range(w):
+                    out[y, x] = _median9(
+                        top[x], top[x + 1], top[x + 2],
+                        mid[x], mid[x + 1], mid[x + 2],
+                        bot[x], bot[x + 1], bot[x + 2]
+                    )
+        return out
+
+    @numba.njit(cache=True, inline="always")
+    def _clahe_tile_size(h, w, tiles):
+        # Comme OpenCV : si une dimension n'est pas multiple de tiles, l'image
+        # est étendue à droite et en bas (dans les deux dimensions) jusqu'au
+        # multiple suivant ; les tuiles ont toutes la même taille
+        if h % tiles != 0 or w % tiles != 0:
+            h += tiles - h % tiles
+            w += tiles - w % tiles
+        return h // tiles, w // tiles
+
+    @numba.njit(cache=True, inline="always")
+    def _reflect101(i, n):
+        # Indice dans l'image étendue -> indice source (BORDER_REFLECT_101)
+        if i < n:
+            return i
+        return max(2 * (n - 1) - i, 0)
+
+    @numba.njit(cache=True, parallel=True)
+    def _clahe_luts(gray, tiles, clip_limit):
+        h, w = gray.shape
+        tile_h, tile_w = _clahe_tile_size(h, w, tiles)
+        area = tile_h * tile_w
+        luts = np.zeros((tiles, tiles, 256), dtype=np.float32)
+
+        for t in numba.prange(tiles * tiles):
+            ty = t // tiles
+            tx = t % tiles
+
+            # Histogramme de la tuile, pixels de l'extension lus par réflexion
+            hist = np.zeros(256, dtype=np.int32)
+            for y in range(ty * tile_h, (ty + 1) * tile_h):
+                sy = _reflect101(y, h)
+                for x in range(tx * tile_w, (tx + 1) * tile_w):
+                    hist[gray[sy, _reflect101(x, w)]] += 1
+
+            # Écrêtage et redistribution de l'excédent (comme OpenCV)
+            clip = max(int(clip_limit * area / 256), 1)
+            excess = 0
+            for v in range(256):
+                if hist[v] > clip:
+                    excess += hist[v] - clip
+                    hist[v] = clip
+            batch = excess // 256
+            residual = excess - batch * 256
+            for v in range(256):
+                hist[v] += batch
+            if residual > 0:
+                step = max(256 // residual, 1)
+                v = 0
+                while v < 256 and residual > 0:
+                    hist[v] += 1
+                    residual -= 1
+                    v += step
+
+            scale = 255.0 / area
+            total = 0
+            for v in range(256):
+                total += hist[v]
+                luts[ty, tx, v] = min(round(total * scale), 255.0)
+        return luts
+
+    @numba.njit(cache=True, parallel=True, fastmath=True)
+    def _apply_clahe(gray, luts, tiles):
+        h, w = gray.shape
+        tile_h, tile_w = _clahe_tile_size(h, w, tiles)
+        out = np.empty((h, w), dtype=np.uint8)
+        hists = np.zeros((_HIST_BLOCKS, 256), dtype=np.int64)
+        rows_per_block = (h + _HIST_BLOCKS - 1) // _HIST_BLOCKS
+
+        for b in numba.prange(_HIST_BLOCKS):
+            for y in range(b * rows_per_block, min((b + 1) * rows_per_block, h)):
+                tyf = y / tile_h - 0.5
+                ty1 = int(np.floor(tyf))
+                ya = tyf - ty1
+                ty2 = min(ty1 + 1, tiles - 1)
+                ty1 = max(ty1, 0)
+                for x in range(w):
+                    txf = x / tile_w - 0.5
+                    tx1 = int(np.floor(txf))
+                    xa = txf - tx1
+                    tx2 = min(tx1 + 1, tiles - 1)
+                    tx1 = max(tx1, 0)
+                    v = gray[y, x]
+                    top = luts[ty1, tx1, v] * (1 - xa) + luts[ty1, tx2, v] * xa
+                    bottom = luts[ty2, tx1, v] * (1 - xa) + luts[ty2, tx2, v] * xa
+                    res = int(top * (1 - ya) + bottom * ya + 0.5)
+                    res = min(max(res, 0), 255)
+                    out[y, x] = res
+                    hists[b, res] += 1
+        return out, hists.sum(axis=0)
+
+
+class _BufferPool:
+    """
+    Réserve de tableaux NumPy réutilisables, indexés par (forme, type)
+
+    Évite d'allouer puis libérer plusieurs images intermédiaires pleine
+    taille à chaque page ; les tableaux de moins de MIN_BYTES ne sont pas
+    conservés.
+    """
+
+    MIN_BYTES = 256 * 1024
+
+    def __init__(self, max_per_key: int = 4):
+        """
+        Initialise la réserve
+
+        Args:
+            max_per_key: Nombre maximum de tableaux conservés par (forme, type)
+        """
+        self.max_per_key = max_per_key
+        self._free: Dict[Tuple[Tuple[int, ...], str], List[np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """
+        Fournit un tableau (contenu non initialisé)
+
+        Args:
+            shape: Forme du tableau
+            dtype: Type des éléments
+
+        Returns:
+            Tableau réutilisé ou nouvellement alloué
+        """
+        key = (tuple(shape), np.dtype(dtype).str)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                return free.pop()
+        return np.empty(shape, dtype=dtype)
+
+    def release(self, *arrays: np.ndarray) -> None:
+        """Rend des tableaux à la réserve"""
+        for arr in arrays:
+            if arr is None or arr.nbytes < self.MIN_BYTES:
+                continue
+            key = (arr.shape, arr.dtype.str)
+            with self._lock:
+                free = self._free.setdefault(key, [])
+                if len(free) < self.max_per_key:
+                    free.append(arr)
+
+
+def otsu_threshold(hist: np.ndarray) -> int:
+    """
+    Calcule le seuil d'Otsu d'un histogramme de niveaux de gris
+
+    Args:
+        hist: Histogramme (256,)
+
+    Returns:
+        Seuil maximisant la variance inter-classes
+    """
+    hist = hist.astype(np.float64)
+    total = hist.sum()
+    levels = np.arange(256, dtype=np.float64)
+    weight_bg = np.cumsum(hist)
+    weight_fg = total - weight_bg
+    sum_bg = np.cumsum(hist * levels)
+    mean_bg = np.divide(sum_bg, weight_bg, out=np.zeros(256), where=weight_bg > 0)
+    mean_fg = np.divide(sum_bg[-1] - sum_bg, weight_fg, out=np.zeros(256), where=weight_fg > 0)
+    variance = weight_bg * weight_fg * (mean_bg - mean_fg) ** 2
+    return int(np.argmax(variance))
+
+
+def fused_preprocess(image: np.ndarray, clip_limit: float = 2.0, tiles: int = 8) -> np.ndarray:
+    """
+    Niveaux de gris, médian 3x3, CLAHE et binarisation d'Otsu (Numba)
+
+    Args:
+        image: Image uint8 BGR (h, w, 3) ou en niveaux de gris (h, w)
+        clip_limit: Limite d'écrêtage du CLAHE
+        tiles: Nombre de tuiles du CLAHE par dimension
+
+    Returns:
+        Image binaire uint8 (0 ou 255)
+    """
+    if numba is None:
+        raise RuntimeError("Numba n'est pas installé")
+
+    img = np.ascontiguousarray(image, dtype=np.uint8)
+    if img.ndim == 2:
+        img = img[:, :, None]
+
+    gray = _gray_median3(img)
+    enhanced, hist = _apply_clahe(gray, _clahe_luts(gray, tiles, clip_limit), tiles)
+    threshold = otsu_threshold(hist)
+    return np.where(enhanced > threshold, np.uint8(255), np.uint8(0))
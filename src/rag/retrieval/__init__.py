@@ -2,7 +2,7 @@
 Module de récupération du système RAG.
 """
 
-from .vector_retriever import VectorRetriever
-from .reranker import CohereReranker
+from .vector_retriever import VectorRetriever, get_default_retriever
+from .reranker import CohereReranker, get_default_reranker
 
-__all__ = ['VectorRetriever', 'CohereReranker']
\ No newline at end of file
+__all__ = ['VectorRetriever', 'CohereReranker', 'get_default_reranker', 'get_default_retriever']
\ No newline at end of file
@@ -6,28 +6,98 @@ Ce module implémente le reranking des résultats de récupération
 en utilisant l'API Cohere pour améliorer la pertinence des documents.
 """
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 import cohere
-from typing import List, Dict, Any, Tuple
+import hashlib
 import logging
-from ..utils.config import config
+import re
+import threading
+import time
+import numpy as np
+from ..utils.clients import get_cohere_client, make_async_http_client
+from ..utils.config import config, get_config
 
 logger = logging.getLogger(__name__)
 
+# Extensions des documents ingérés : "node.js" ou "asp.net" restent des
+# requêtes en langage naturel
+_DOCUMENT_EXTENSIONS = (
+    'pdf', 'docx', 'doc', 'txt', 'md', 'rtf', 'odt', 'csv', 'xlsx', 'pptx',
+    'html', 'json', 'png', 'jpg', 'jpeg', 'tiff', 'tif', 'bmp'
+)
+
+# Requête littérale : texte entre guillemets ou nom de fichier exact (au
+# moins une lettre avant l'extension : "3.14" n'est pas un nom de fichier)
+_LITERAL_QUERY = re.compile(
+    r'^\s*(["«“](?P<quoted>[^"»”]+)["»”]'
+    r'|(?P<filename>[\w.-]*[^\W\d_][\w-]*\.(?i:' + '|'.join(_DOCUMENT_EXTENSIONS) + r')))\s*$'
+)
+
+
+def is_literal(query: str) -> Optional[str]:
+    """
+    Détecte une requête littérale (citation exacte ou nom de fichier)
+    
+    Args:
+        query: Requête de l'utilisateur
+        
+    Returns:
+        Le littéral recherché, ou None pour une requête en langage naturel
+    """
+    match = _LITERAL_QUERY.match(query)
+    if match is None:
+        return None
+    return match.group('quoted') or match.group('filename')
+
+
+def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices des k meilleurs scores, triés par score décroissant
+    
+    Args:
+        scores: Scores (n,)
+        k: Nombre d'indices à retourner
+        
+    Returns:
+        Indices sélectionnés par argpartition puis triés
+    """
+    n = len(scores)
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    idx = np.argpartition(-scores, k - 1)[:k] if k < n else np.arange(n)
+    return idx[np.argsort(-scores[idx], kind='stable')]
+
+
+def _digest(text: str) -> bytes:
+    """Empreinte courte d'un texte pour les clés du cache de scores"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
 
 class CohereReranker:
     """Reranker utilisant l'API Cohere pour améliorer la pertinence des résultats"""
     
-    def __init__(self, api_key: str = None, model: str = None):
+    def __init__(self, api_key: str = None, model: str = None, max_workers: int = 8):
         """
         Initialise le reranker Cohere
         
         Args:
             api_key: Clé API Cohere (optionnel, utilise la config par défaut)
             model: Modèle de reranking (optionnel, utilise la config par défaut)
+            max_workers: Nombre maximum d'appels de reranking simultanés (batch_rerank)
         """
         self.api_key = api_key or config.cohere_api_key
         self.model = model or config.cohere_rerank_model
-        self.client = cohere.Client(self.api_key)
+        self.client = get_cohere_client(self.api_key)
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        
+        # Scores déjà calculés : (empreinte requête, empreinte document) -> (score, expiration)
+        self._scores: "OrderedDict[Tuple[bytes, bytes], Tuple[float, float]]" = OrderedDict()
+        self._scores_lock = threading.Lock()
         
     def rerank(
         self, 
@@ -38,6 +108,12 @@ class CohereReranker:
         """
         Rerank les documents par rapport à la requête
         
+        Les requêtes littérales (citation, nom de fichier) ne sont pas
+        envoyées à Cohere : les documents contenant le littéral passent en
+        tête, dans l'ordre d'origine. Les scores déjà calculés pour un couple
+        (requête, document) sont réutilisés pendant rerank_cache_ttl secondes ;
+        seuls les documents inconnus sont envoyés à Cohere.
+        
         Args:
             query: Requête de l'utilisateur
             documents: Liste des documents à reranker
@@ -52,39 +128,180 @@ class CohereReranker:
         top_k = top_k or config.rerank_top_k
         
         try:
-            # Appel à l'API Cohere pour le reranking
-            response = self.client.rerank(
-                model=self.model,
-                query=query,
-                documents=documents,
-                top_k=min(top_k, len(documents))
-            )
-            
-            # Formatage des résultats
-            reranked_results = []
-            for result in response.results:
-                reranked_results.append({
-                    'document': documents[result.index],
-                    'score': result.relevance_score,
-                    'index': result.index,
-                    'original_rank': result.index
-                })
-            
-            logger.info(f"Reranking terminé: {len(reranked_results)} documents rerankés")
-            return reranked_results
+            literal = is_literal(query)
+            if literal is not None:
+                return self._literal_results(documents, literal, top_k)
+            
+            query_key = _digest(query)
+            doc_keys = [_digest(doc) for doc in documents]
+            scores = self._cached_scores(query_key, doc_keys)
+            
+            missing = self._unscored(scores, doc_keys)
+            if missing:
+                # Appel à l'API Cohere pour les documents non encore notés
+                response = self.client.rerank(
+                    model=self.model,
+                    query=query,
+                    documents=[documents[i] for i in missing],
+                    top_n=len(missing)
+                )
+                self._merge_scores(response, missing, scores, query_key, doc_keys)
+            
+            return self._ranked_results(documents, scores, top_k)
             
         except Exception as e:
             logger.error(f"Erreur lors du reranking: {str(e)}")
-            # En cas d'erreur, retourner les documents dans l'ordre original
-            return [
-                {
-                    'document': doc,
-                    'score': 0.5,  # Score par défaut
-                    'index': i,
-                    'original_rank': i
-                }
-                for i, doc in enumerate(documents[:top_k])
-            ]
+            return self._default_results(documents, top_k)
+    
+    async def rerank_async(
+        self, 
+        query: str, 
+        documents: List[str], 
+        top_k: int = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Rerank les documents par rapport à la requête (version asynchrone)
+        
+        Même comportement que rerank (littéraux, cache des scores), avec le
+        client Cohere asynchrone : plusieurs rerankings, ou un reranking et
+        une autre recherche, peuvent être attendus ensemble avec asyncio.gather.
+        
+        Args:
+            query: Requête de l'utilisateur
+            documents: Liste des documents à reranker
+            top_k: Nombre de documents à retourner (optionnel)
+            
+        Returns:
+            Liste des documents rerankés avec scores
+        """
+        if not documents:
+            return []
+            
+        top_k = top_k or config.rerank_top_k
+        
+        try:
+            literal = is_literal(query)
+            if literal is not None:
+                return self._literal_results(documents, literal, top_k)
+            
+            query_key = _digest(query)
+            doc_keys = [_digest(doc) for doc in documents]
+            scores = self._cached_scores(query_key, doc_keys)
+            
+            missing = self._unscored(scores, doc_keys)
+            if missing:
+                # Client asynchrone propre à cet appel : un client HTTP
+                # asynchrone reste lié à la boucle d'événements qui l'utilise
+                async with make_async_http_client() as http_client:
+                    response = await cohere.AsyncClient(self.api_key, httpx_client=http_client).rerank(
+                        model=self.model,
+                        query=query,
+                        documents=[documents[i] for i in missing],
+                        top_n=len(missing)
+                    )
+                self._merge_scores(response, missing, scores, query_key, doc_keys)
+            
+            return self._ranked_results(documents, scores, top_k)
+            
+        except Exception as e:
+            logger.error(f"Erreur lors du reranking: {str(e)}")
+            return self._default_results(documents, top_k)
+    
+    @staticmethod
+    def _literal_results(documents: List[str], literal: str, top_k: int) -> List[Dict[str, Any]]:
+        """Documents contenant le littéral en tête, sans appel à Cohere"""
+        needle = literal.lower()
+        order = sorted(range(len(documents)), key=lambda i: needle not in documents[i].lower())
+        return [
+            {
+                'document': documents[i],
+                'score': 1.0 if needle in documents[i].lower() else 0.0,
+                'index': i,
+                'original_rank': i
+            }
+            for i in order[:top_k]
+        ]
+    
+    @staticmethod
+    def _unscored(scores: List[Optional[float]], doc_keys: List[bytes]) -> List[int]:
+        """Index des documents à envoyer à Cohere (un seul par contenu identique)"""
+        first = {}
+        for i, score in enumerate(scores):
+            if score is None:
+                first.setdefault(doc_keys[i], i)
+        return list(first.values())
+    
+    def _merge_scores(
+        self,
+        response: Any,
+        missing: List[int],
+        scores: List[Optional[float]],
+        query_key: bytes,
+        doc_keys: List[bytes]
+    ) -> None:
+        """Reporte les scores Cohere sur tous les documents de même contenu et les met en cache"""
+        by_key = {doc_keys[missing[result.index]]: result.relevance_score for result in response.results}
+        for i, doc_key in enumerate(doc_keys):
+            if scores[i] is None and doc_key in by_key:
+                scores[i] = by_key[doc_key]
+        self._store_scores({(query_key, doc_key): score for doc_key, score in by_key.items()})
+    
+    @staticmethod
+    def _ranked_results(documents: List[str], scores: List[Optional[float]], top_k: int) -> List[Dict[str, Any]]:
+        """Formate les top_k documents par score décroissant"""
+        # Sélection des top_k par partition (O(n)) puis tri des seuls retenus
+        scored = np.array([-np.inf if score is None else score for score in scores])
+        ranked = [int(i) for i in _top_k_indices(scored, top_k) if scores[i] is not None]
+        
+        reranked_results = []
+        for i in ranked:
+            reranked_results.append({
+                'document': documents[i],
+                'score': scores[i],
+                'index': i,
+                'original_rank': i
+            })
+        
+        logger.info("Reranking terminé: %d documents rerankés", len(reranked_results))
+        return reranked_results
+    
+    @staticmethod
+    def _default_results(documents: List[str], top_k: int) -> List[Dict[str, Any]]:
+        """En cas d'erreur, les documents dans l'ordre original"""
+        return [
+            {
+                'document': doc,
+                'score': 0.5,  # Score par défaut
+                'index': i,
+                'original_rank': i
+            }
+            for i, doc in enumerate(documents[:top_k])
+        ]
+    
+    def _cached_scores(self, query_key: bytes, doc_keys: List[bytes]) -> List[Optional[float]]:
+        """Scores en cache (None si absent ou expiré) pour chaque document"""
+        now = time.monotonic()
+        scores = []
+        with self._scores_lock:
+            for doc_key in doc_keys:
+                entry = self._scores.get((query_key, doc_key))
+                if entry is not None and entry[1] > now:
+                    self._scores.move_to_end((query_key, doc_key))
+                    scores.append(entry[0])
+                else:
+                    scores.append(None)
+        return scores
+    
+    def _store_scores(self, scores: Dict[Tuple[bytes, bytes], float]) -> None:
+        """Enregistre des scores Cohere (éviction LRU au-delà de rerank_cache_max_entries)"""
+        cfg = get_config()
+        expires_at = time.monotonic() + cfg.rerank_cache_ttl
+        with self._scores_lock:
+            for key, score in scores.items():
+                self._scores[key] = (score, expires_at)
+                self._scores.move_to_end(key)
+            while len(self._scores) > cfg.rerank_cache_max_entries:
+                self._scores.popitem(last=False)
     
     def rerank_with_metadata(
         self, 
@@ -134,6 +351,9 @@ class CohereReranker:
         """
         Rerank en batch pour plusieurs requêtes
         
+        Les appels à Cohere sont envoyés en parallèle (au plus max_workers
+        simultanément) ; les résultats sont retournés dans l'ordre des requêtes.
+        
         Args:
             queries: Liste des requêtes
             documents_batches: Liste des batches de documents
@@ -142,14 +362,37 @@ class CohereReranker:
         Returns:
             Liste des résultats rerankés pour chaque requête
         """
+        futures = [
+            self._pool.submit(self.rerank, query, documents, top_k)
+            for query, documents in zip(queries, documents_batches)
+        ]
+        
         results = []
-        for query, documents in zip(queries, documents_batches):
-            reranked = self.rerank(query, documents, top_k)
-            results.append(reranked)
+        for future, documents in zip(futures, documents_batches):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # rerank gère déjà les erreurs d'API : une requête ne bloque pas le lot
+                logger.error(f"Erreur lors du reranking en batch: {str(e)}")
+                results.append(self._default_results(documents, top_k or config.rerank_top_k))
             
         return results
 
 
+@lru_cache(maxsize=1)
+def get_default_reranker() -> CohereReranker:
+    """
+    Retourne le reranker Cohere partagé (configuration par défaut)
+    
+    Les instances qui n'en fournissent pas partagent ainsi le même pool de
+    threads et le même cache de scores.
+    
+    Returns:
+        Reranker Cohere
+    """
+    return CohereReranker()
+
+
 class HybridReranker:
     """Reranker hybride combinant scores vectoriels et de reranking"""
     
@@ -160,21 +403,28 @@ class HybridReranker:
         Args:
             cohere_reranker: Instance du reranker Cohere
         """
-        self.cohere_reranker = cohere_reranker or CohereReranker()
+        self.cohere_reranker = cohere_reranker or get_default_reranker()
         
     def hybrid_rerank(
         self, 
         query: str, 
         documents_with_scores: List[Dict[str, Any]], 
-        alpha: float = 0.7
+        alpha: Optional[float] = None,
+        top_k: int = None
     ) -> List[Dict[str, Any]]:
         """
         Reranking hybride combinant scores vectoriels et de reranking
         
+        Par défaut, les deux classements sont fusionnés par Reciprocal Rank
+        Fusion (somme des 1 / (hybrid_rrf_k + rang)), insensible aux échelles
+        des scores. Si alpha est fourni, la combinaison pondérée
+        (1 - alpha) * vectoriel + alpha * reranking est utilisée à la place.
+        
         Args:
             query: Requête de l'utilisateur
             documents_with_scores: Documents avec scores vectoriels
-            alpha: Poids du score de reranking (0-1)
+            alpha: Poids du score de reranking (0-1), None pour la fusion RRF
+            top_k: Nombre de documents à retourner (optionnel, tous si None)
             
         Returns:
             Documents avec scores hybrides
@@ -188,27 +438,39 @@ class HybridReranker:
         # Reranker avec Cohere
         reranked_results = self.cohere_reranker.rerank(query, documents)
         
-        # Créer un mapping des scores de reranking
-        rerank_scores = {result['original_rank']: result['score'] for result in reranked_results}
+        # Scores vectoriels et de reranking (0 pour les documents non retenus)
+        n = len(documents_with_scores)
+        vector_scores = np.fromiter(
+            (doc.get('score', 0.0) for doc in documents_with_scores), dtype=np.float64, count=n
+        )
+        rerank_scores = np.zeros(n)
+        if reranked_results:
+            rerank_scores[[result['original_rank'] for result in reranked_results]] = [
+                result['score'] for result in reranked_results
+            ]
         
-        # Calculer les scores hybrides
-        hybrid_results = []
-        for i, doc in enumerate(documents_with_scores):
-            vector_score = doc.get('score', 0.0)
-            rerank_score = rerank_scores.get(i, 0.0)
-            
-            # Score hybride : combinaison pondérée
-            hybrid_score = (1 - alpha) * vector_score + alpha * rerank_score
-            
-            hybrid_doc = {
-                **doc,
-                'vector_score': vector_score,
-                'rerank_score': rerank_score,
-                'hybrid_score': hybrid_score
-            }
-            hybrid_results.append(hybrid_doc)
+        if alpha is None:
+            # Fusion RRF : rang 1 = meilleur score ; les documents non
+            # retenus par le reranker ne reçoivent que leur part vectorielle
+            rrf_k = config.hybrid_rrf_k
+            vector_ranks = np.empty(n)
+            vector_ranks[np.argsort(-vector_scores, kind='stable')] = np.arange(1, n + 1)
+            hybrid_scores = 1.0 / (rrf_k + vector_ranks)
+            for rank, result in enumerate(reranked_results, start=1):
+                hybrid_scores[result['original_rank']] += 1.0 / (rrf_k + rank)
+        else:
+            # Score hybride : combinaison pondérée, en une opération vectorisée
+            hybrid_scores = (1 - alpha) * vector_scores + alpha * rerank_scores
         
-        # Trier par score hybride
-        hybrid_results.sort(key=lambda x: x['hybrid_score'], reverse=True)
+        # Trier par score hybride (seuls les top_k sont triés s'ils sont demandés)
+        order = _top_k_indices(hybrid_scores, top_k or n)
         
-        return hybrid_results
+        return [
+            {
+                **documents_with_scores[i],
+                'vector_score': float(vector_scores[i]),
+                'rerank_score': float(rerank_scores[i]),
+                'hybrid_score': float(hybrid_scores[i])
+            }
+            for i in order
+        ]
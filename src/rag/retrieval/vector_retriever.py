@@ -2,18 +2,33 @@
 Récupérateur vectoriel utilisant Supabase pour la recherche de similarité.
 """
 
+import asyncio
 import json
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
 import numpy as np
-from supabase import Client, create_client
-from mistralai import Mistral
+from supabase import Client
 
+try:
+    import orjson
+except ImportError:  # orjson est optionnel
+    orjson = None
+
+from ..cache import PersistentEmbeddingCache, SemanticCache, get_shared_embedding_cache
+from ..cache.embedding_cache import QueryKey, quantize
 from ..embeddings import EmbeddingProvider
-from ..utils.config import config
+from ..utils.clients import get_mistral_client, get_supabase_client
+from ..utils.config import config, get_config
+from ..utils.retry import api_retry
+from ..utils.similarity import cosine_topk, l2_normalize
 
 logger = logging.getLogger(__name__)
 
+# Colonnes lues pour un document (sans l'embedding, inutile aux appelants)
+_DOCUMENT_COLUMNS = 'id, content, metadata, source, chunk_id, document_id, created_at, updated_at'
+
 class VectorRetriever:
     """
     Récupérateur vectoriel utilisant Supabase comme base de données vectorielle.
@@ -22,17 +37,32 @@ class VectorRetriever:
     def __init__(self):
         """Initialise le récupérateur vectoriel."""
         self.supabase = self._init_supabase()
-        self.mistral = Mistral(api_key=config.mistral_api_key)
+        self.mistral = get_mistral_client(config.mistral_api_key)
+        # Embeddings des requêtes : LRU en mémoire devant le cache persistant partagé
+        # (les échecs ne sont pas mis en cache)
+        self.embedding_cache = get_shared_embedding_cache()
+        # La clé est la requête normalisée ; le texte embeddé reste la requête d'origine
+        self._query_embeddings = lru_cache(maxsize=config.query_embedding_cache_size)(
+            lambda query: self._embed(query.text)
+        )
+        # Résultats des requêtes proches (paraphrases), valables retrieval_cache_ttl secondes
+        self.result_cache = SemanticCache(
+            threshold=config.retrieval_cache_threshold,
+            max_entries=config.retrieval_cache_max_entries,
+            ttl=config.retrieval_cache_ttl
+        )
+        # Matrices d'embeddings normalisées de la recherche côté client, par filtre
+        self._matrix_cache: Dict[str, Tuple[float, List[Dict[str, Any]], np.ndarray]] = {}
         logger.info("VectorRetriever initialisé")
     
     def _init_supabase(self) -> Client:
-        """Initialise le client Supabase."""
+        """Initialise le client Supabase (partagé entre les instances)."""
         try:
             # Utiliser les nouvelles clés API si disponibles
             if config.supabase_publishable_key and config.supabase_secret_key:
-                return create_client(config.supabase_url, config.supabase_secret_key)
+                return get_supabase_client(config.supabase_url, config.supabase_secret_key)
             elif config.supabase_key:
-                return create_client(config.supabase_url, config.supabase_key)
+                return get_supabase_client(config.supabase_url, config.supabase_key)
             else:
                 raise ValueError("Aucune clé API Supabase configurée")
         except Exception as e:
@@ -43,50 +73,186 @@ class VectorRetriever:
         """
         Récupère les documents les plus pertinents pour une requête.
         
+        Sans filtres, une requête proche d'une requête récente (similarité
+        >= retrieval_cache_threshold) reçoit ses résultats en cache, sans
+        nouvelle recherche dans la base. Une requête vide ou de moins de
+        min_query_length caractères ne déclenche aucun appel ; au-delà de
+        max_query_words mots, la requête est tronquée avant l'embedding.
+        
         Args:
             query: La requête de recherche
             max_results: Nombre maximum de résultats à retourner
-            filters: Filtres optionnels pour la recherche
+            filters: Filtres optionnels sur les métadonnées, appliqués côté
+                Postgres (voir scripts/migrate_metadata_filter.sql)
             
         Returns:
             Liste des documents récupérés avec leurs scores
         """
+        cfg = get_config()
+        max_results = max_results or cfg.max_retrieved_chunks
+        
+        query = query.strip()
+        if len(query) < cfg.min_query_length:
+            logger.info("Requête trop courte, aucune recherche effectuée")
+            return []
+        words = query.split()
+        if len(words) > cfg.max_query_words:
+            query = ' '.join(words[:cfg.max_query_words])
+        
         try:
             # Générer l'embedding de la requête
-            query_embedding = self._get_embedding(query)
+            query_embedding = self._get_query_embedding(query)
+            if not any(query_embedding):
+                raise ValueError("Embedding de la requête indisponible")
             
-            # Recherche dans la base de données
-            max_results = max_results or config.max_retrieved_chunks
+            use_cache = not filters
+            if use_cache:
+                hit = self.result_cache.get(query_embedding)
+                if hit is not None and hit[0][0] >= max_results:
+                    logger.info("Résultats servis depuis le cache (similarité %.3f)", hit[1])
+                    return [dict(doc) for doc in hit[0][1][:max_results]]
+            
+            # Recherche hybride en un seul appel RPC si activée
+            if cfg.enable_hybrid:
+                try:
+                    documents = self.hybrid_search(query, max_results, filters)
+                except Exception as e:
+                    if not filters:
+                        raise
+                    # hybrid_search sans paramètre filter : migration non appliquée
+                    logger.warning(
+                        "Recherche hybride filtrée indisponible (appliquer "
+                        "scripts/migrate_metadata_filter.sql), recherche vectorielle: %s", e
+                    )
+                    documents = None
+                if documents is not None:
+                    if use_cache:
+                        self.result_cache.set(query_embedding, (max_results, documents))
+                    return [dict(doc) for doc in documents]
             
             # Utiliser la fonction de recherche vectorielle de Supabase
-            response = self.supabase.rpc(
-                'match_documents',
-                {
-                    'query_embedding': query_embedding,
-                    'match_threshold': config.similarity_threshold,
-                    'match_count': max_results
-                }
-            ).execute()
+            params = {
+                'query_embedding': query_embedding,
+                'match_threshold': cfg.similarity_threshold,
+                'match_count': max_results
+            }
+            if filters:
+                params['filter'] = filters
+            if cfg.hnsw_ef_search:
+                params['ef_search'] = cfg.hnsw_ef_search
+            try:
+                if cfg.enable_binary_search:
+                    # Présélection par distance de Hamming puis reclassement
+                    params['candidate_count'] = cfg.binary_candidate_count
+                    response = self.supabase.rpc('match_documents_binary', params).execute()
+                else:
+                    response = self.supabase.rpc('match_documents', params).execute()
+            except Exception as e:
+                if filters:
+                    logger.warning(
+                        "Recherche vectorielle filtrée indisponible (appliquer "
+                        "scripts/migrate_metadata_filter.sql), recherche côté client: %s", e
+                    )
+                else:
+                    logger.warning(f"Fonction de recherche vectorielle indisponible, recherche côté client: {e}")
+                response = None
             
-            documents = []
-            for row in response.data:
-                documents.append({
-                    'content': row.get('content', ''),
-                    'metadata': row.get('metadata', {}),
-                    'similarity_score': row.get('similarity', 0.0)
-                })
+            if response is None:
+                documents = self._client_side_search(query_embedding, max_results, filters)
+            else:
+                # Lignes converties en place : pas de seconde liste
+                documents = response.data
+                for i, row in enumerate(documents):
+                    documents[i] = {
+                        'content': row.get('content', ''),
+                        'metadata': row.get('metadata', {}),
+                        'similarity_score': row.get('similarity', 0.0)
+                    }
+                logger.info("Récupéré %d documents pour la requête", len(documents))
             
-            logger.info(f"Récupéré {len(documents)} documents pour la requête")
-            return documents
+            if not use_cache:
+                return documents
+            # Copies : les documents en cache ne doivent pas être modifiés par l'appelant
+            self.result_cache.set(query_embedding, (max_results, documents))
+            return [dict(doc) for doc in documents]
             
         except Exception as e:
             logger.error(f"Erreur lors de la récupération: {e}")
             # Fallback: recherche textuelle simple
             return self._fallback_search(query, max_results)
     
+    async def retrieve_async(
+        self,
+        query: str,
+        max_results: int = None,
+        filters: Dict[str, Any] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Version asynchrone de retrieve.
+        
+        La recherche (embedding, appel RPC) s'exécute dans un thread : elle
+        peut être attendue en même temps qu'un reranking ou qu'une autre
+        source avec asyncio.gather.
+        
+        Args:
+            query: La requête de recherche
+            max_results: Nombre maximum de résultats à retourner
+            filters: Filtres optionnels sur les métadonnées
+            
+        Returns:
+            Liste des documents récupérés avec leurs scores
+        """
+        return await asyncio.to_thread(self.retrieve, query, max_results, filters)
+    
+    def hybrid_search(
+        self,
+        query: str,
+        max_results: int = None,
+        filters: Dict[str, Any] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Recherche hybride plein texte + vectorielle fusionnée par RRF côté Postgres.
+        
+        Args:
+            query: La requête de recherche
+            max_results: Nombre maximum de résultats à retourner
+            filters: Filtres optionnels sur les métadonnées (nécessite
+                scripts/migrate_metadata_filter.sql)
+            
+        Returns:
+            Liste des documents récupérés avec leurs scores
+        """
+        query_embedding = self._get_query_embedding(query)
+        max_results = max_results or config.max_retrieved_chunks
+        
+        params = {
+            'q_emb': query_embedding,
+            'q_text': query,
+            'k': max_results,
+            'rrf_k': config.hybrid_rrf_k
+        }
+        if filters:
+            params['filter'] = filters
+        response = self.supabase.rpc('hybrid_search', params).execute()
+        
+        documents = []
+        for row in response.data:
+            documents.append({
+                'content': row.get('content', ''),
+                'metadata': row.get('metadata', {}),
+                'similarity_score': row.get('similarity', 0.0),
+                'rrf_score': row.get('rrf', 0.0)
+            })
+        
+        logger.info("Recherche hybride: récupéré %d documents", len(documents))
+        return documents
+    
     def _get_embedding(self, text: str) -> List[float]:
         """
-        Génère un embedding pour le texte donné.
+        Génère un embedding normalisé (norme L2 unitaire) pour le texte donné.
+        
+        Les embeddings étant stockés normalisés, la recherche peut utiliser
+        le produit scalaire (opérateur <#> de pgvector) au lieu du cosinus.
         
         Args:
             text: Le texte à encoder
@@ -95,20 +261,74 @@ class VectorRetriever:
             L'embedding vectoriel
         """
         try:
-            response = self.mistral.embeddings(
-                model="mistral-embed",
-                input=text
-            )
-            return response.data[0].embedding
+            return list(self._embed(text))
         except Exception as e:
             logger.error(f"Erreur lors de la génération d'embedding: {e}")
             # Retourner un embedding de zéros en cas d'erreur
             return [0.0] * config.vector_dimension
     
+    def _get_query_embedding(self, query: str) -> List[float]:
+        """
+        Génère l'embedding d'une requête, mis en cache par requête normalisée.
+        
+        Une requête déjà vue (à la casse et aux espaces près) ne refait pas
+        d'appel à l'API d'embeddings. Seule la clé du cache est normalisée :
+        l'embedding est calculé sur la requête telle qu'écrite.
+        
+        Args:
+            query: La requête de recherche
+            
+        Returns:
+            L'embedding vectoriel
+        """
+        try:
+            return list(self._query_embeddings(QueryKey(query.strip())))
+        except Exception as e:
+            logger.error(f"Erreur lors de la génération d'embedding: {e}")
+            return [0.0] * config.vector_dimension
+    
+    def _embed(self, text: str) -> Tuple[float, ...]:
+        """
+        Embedding normalisé d'un texte (tuple immuable, partageable via le cache)
+        
+        Le cache d'embeddings persistant (SQLite) est consulté avant l'API :
+        une requête déjà vue lors d'une exécution précédente ne refait pas
+        d'appel. La clé inclut le nom du modèle.
+        """
+        key = PersistentEmbeddingCache.make_key(config.mistral_embedding_model, text)
+        cached = self.embedding_cache.get(key)
+        if cached is not None:
+            return tuple(cached.tolist())
+        
+        embedding = l2_normalize(self._embed_many([text])[0])
+        self.embedding_cache.set(key, embedding)
+        return tuple(embedding.tolist())
+    
+    @api_retry()
+    def _embed_many(self, texts: List[str]) -> np.ndarray:
+        """Appelle l'API d'embeddings pour plusieurs textes en une requête (matrice (n, d) float32)"""
+        response = self.mistral.embeddings.create(
+            model=config.mistral_embedding_model,
+            input=texts
+        )
+        return np.array([data.embedding for data in response.data], dtype=np.float32)
+    
+    def embedding_cache_info(self):
+        """
+        Statistiques du cache des embeddings de requêtes.
+        
+        Returns:
+            Tuple (hits, misses, maxsize, currsize) de functools.lru_cache
+        """
+        return self._query_embeddings.cache_info()
+    
     def add_document(self, content: str, metadata: Dict[str, Any] = None) -> bool:
         """
         Ajoute un document à la base vectorielle.
         
+        Délègue à add_documents : même chemin d'embedding et d'insertion que
+        l'ajout par lots.
+        
         Args:
             content: Le contenu du document
             metadata: Métadonnées du document
@@ -116,28 +336,302 @@ class VectorRetriever:
         Returns:
             True si l'ajout a réussi, False sinon
         """
+        return self.add_documents([{'content': content, 'metadata': metadata}]) == 1
+    
+    def add_documents(self, documents: List[Dict[str, Any]], batch_size: int = 100) -> int:
+        """
+        Ajoute des documents à la base vectorielle par lots.
+        
+        Les documents fournis avec un embedding ('embedding') le réutilisent ;
+        les autres sont embeddés par lots d'un appel API. Chaque lot est
+        ensuite inséré en une requête.
+        
+        Args:
+            documents: Documents {'content': ..., 'metadata': ..., 'embedding' (optionnel)}
+            batch_size: Nombre de documents par lot
+            
+        Returns:
+            Nombre de documents ajoutés
+        """
+        added = sum(
+            self._add_batch(documents[start:start + batch_size], start // batch_size)
+            for start in range(0, len(documents), batch_size)
+        )
+        
+        if added:
+            self._invalidate_caches()
+        logger.info(f"{added}/{len(documents)} documents ajoutés à la base vectorielle")
+        return added
+    
+    async def add_documents_async(
+        self,
+        documents: List[Dict[str, Any]],
+        batch_size: int = 100,
+        concurrency: int = None
+    ) -> int:
+        """
+        Version asynchrone de add_documents.
+        
+        Les lots s'exécutent dans des threads, jusqu'à concurrency à la fois :
+        l'embedding d'un lot se déroule pendant l'insertion du précédent au
+        lieu de l'attendre.
+        
+        Args:
+            documents: Documents {'content': ..., 'metadata': ..., 'embedding' (optionnel)}
+            batch_size: Nombre de documents par lot
+            concurrency: Nombre maximum de lots simultanés
+                (config.embedding_concurrency par défaut)
+            
+        Returns:
+            Nombre de documents ajoutés
+        """
+        semaphore = asyncio.Semaphore(concurrency or config.embedding_concurrency)
+        
+        async def one(start: int) -> int:
+            async with semaphore:
+                return await asyncio.to_thread(
+                    self._add_batch, documents[start:start + batch_size], start // batch_size
+                )
+        
+        added = sum(await asyncio.gather(*[one(start) for start in range(0, len(documents), batch_size)]))
+        
+        if added:
+            self._invalidate_caches()
+        logger.info(f"{added}/{len(documents)} documents ajoutés à la base vectorielle")
+        return added
+    
+    def _add_batch(self, batch: List[Dict[str, Any]], index: int) -> int:
+        """
+        Embedde (si nécessaire) et insère un lot de documents en une requête.
+        
+        Args:
+            batch: Documents du lot
+            index: Numéro du lot (pour les logs)
+            
+        Returns:
+            Nombre de documents insérés (0 en cas d'erreur)
+        """
         try:
-            # Générer l'embedding du contenu
-            embedding = self._get_embedding(content)
+            # Matrice du lot allouée une fois et remplie en place ; les
+            # embeddings manquants sont obtenus en un seul appel
+            embeddings = np.empty((len(batch), config.vector_dimension), dtype=np.float32)
+            missing = []
+            for i, doc in enumerate(batch):
+                if doc.get('embedding') is None:
+                    missing.append(i)
+                else:
+                    embeddings[i] = doc['embedding']
+            if missing:
+                embeddings[missing] = self._embed_many([batch[i]['content'] for i in missing])
+            embeddings = l2_normalize(embeddings)
             
-            # Insérer dans la base de données
-            self.supabase.table('documents').insert({
-                'content': content,
-                'metadata': metadata or {},
-                'embedding': embedding
-            }).execute()
+            self.supabase.table('documents').insert([
+                self._to_storage_row(doc['content'], doc.get('metadata'), embedding)
+                for doc, embedding in zip(batch, embeddings)
+            ]).execute()
+            return len(batch)
+        except Exception as e:
+            logger.error(f"Erreur lors de l'ajout du lot {index}: {e}")
+            return 0
+    
+    def _invalidate_caches(self):
+        """Oublie les résultats et matrices en cache après une écriture."""
+        self.result_cache.clear()
+        self._matrix_cache.clear()
+    
+    def _to_storage_row(
+        self,
+        content: str,
+        metadata: Optional[Dict[str, Any]],
+        embedding: Union[List[float], np.ndarray]
+    ) -> Dict[str, Any]:
+        """
+        Construit la ligne à insérer dans la table documents.
+        
+        Avec store_int8_embeddings, une copie int8 de l'embedding (et son
+        échelle) est ajoutée pour la recherche côté client.
+        
+        Args:
+            content: Le contenu du document
+            metadata: Métadonnées du document
+            embedding: L'embedding normalisé FP32
             
-            logger.info("Document ajouté à la base vectorielle")
-            return True
+        Returns:
+            La ligne au format attendu par la table
+        """
+        row = {
+            'content': content,
+            'metadata': metadata or {},
+            'embedding': self._to_storage_format(embedding)
+        }
+        if config.store_int8_embeddings:
+            values, scale = quantize(np.asarray(embedding, dtype=np.float32), "int8")
+            row['embedding_i8'] = '\\x' + values.tobytes().hex()
+            row['embedding_scale'] = scale
+        return row
+    
+    def _to_storage_format(self, embedding: Union[List[float], np.ndarray]) -> Union[List[float], str]:
+        """
+        Prépare un embedding pour l'insertion dans la base.
+        
+        En demi-précision (colonne halfvec), l'embedding est quantifié en FP16
+        et envoyé sous forme de littéral pgvector, chaque composante utilisant
+        sa représentation décimale la plus courte. Lorsque orjson est
+        installé, le littéral est écrit en une passe depuis le tableau (en
+        FP16, valeurs FP16 exactes écrites en FP32, relues à l'identique par
+        halfvec).
+        
+        Args:
+            embedding: L'embedding FP32
+            
+        Returns:
+            L'embedding au format attendu par la colonne
+        """
+        if config.embedding_storage_dtype == "float16":
+            half = np.asarray(embedding, dtype=np.float16)
+            if orjson is not None:
+                return orjson.dumps(half.astype(np.float32), option=orjson.OPT_SERIALIZE_NUMPY).decode()
+            return '[' + ','.join(map(str, half)) + ']'
+        vector = np.asarray(embedding, dtype=np.float32)
+        if orjson is not None:
+            # Littéral '[...]' écrit directement depuis le tableau, sans liste Python
+            return orjson.dumps(vector, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        return vector.tolist()
+    
+    def _client_side_search(
+        self,
+        query_embedding: List[float],
+        max_results: int,
+        filters: Dict[str, Any] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Recherche vectorielle exhaustive côté client (sans fonction RPC).
+        
+        Les embeddings sont rassemblés en une matrice (n, d) normalisée et
+        toutes les similarités sont calculées en un seul produit matriciel,
+        puis les k meilleurs documents sont sélectionnés par argpartition.
+        La matrice normalisée est conservée retrieval_cache_ttl secondes (et
+        invalidée à chaque écriture) : les requêtes suivantes se réduisent à
+        un produit matrice-vecteur.
+        
+        Args:
+            query_embedding: L'embedding normalisé de la requête
+            max_results: Nombre maximum de résultats
+            filters: Filtres optionnels sur les métadonnées
+            
+        Returns:
+            Liste des documents trouvés avec leurs scores
+        """
+        key = json.dumps(filters or {}, sort_keys=True)
+        cached = self._matrix_cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            _, rows, matrix = cached
+        else:
+            rows, matrix = self._fetch_embeddings(filters)
+            if not rows:
+                return []
+            # Normes calculées une seule fois : les erreurs de quantification
+            # (int8, FP16) sont corrigées avant la mise en cache
+            matrix = l2_normalize(matrix)
+            self._matrix_cache[key] = (time.monotonic() + config.retrieval_cache_ttl, rows, matrix)
+        
+        indices, scores = cosine_topk(matrix, np.asarray(query_embedding, dtype=np.float32), max_results)
+        
+        threshold = config.similarity_threshold
+        documents = []
+        for i, score in zip(indices, scores):
+            if score <= threshold:
+                break
+            documents.append({
+                'content': rows[i].get('content', ''),
+                'metadata': rows[i].get('metadata', {}),
+                'similarity_score': float(score)
+            })
+        
+        logger.info("Recherche côté client: récupéré %d documents", len(documents))
+        return documents
+    
+    def _fetch_embeddings(self, filters: Dict[str, Any] = None) -> Tuple[List[Dict[str, Any]], Optional[np.ndarray]]:
+        """
+        Télécharge les documents et leurs embeddings pour la recherche côté client.
+        
+        Les embeddings sont demandés sous forme binaire, en int8 avec
+        store_int8_embeddings (get_embeddings_int8) ou en FP16
+        (get_embeddings_fp16), et décodés en une seule opération NumPy ; à
+        défaut, la colonne est lue sous forme de texte '[...]' et décodée en
+        un seul passage (_parse_embeddings).
+        
+        Args:
+            filters: Filtres optionnels sur les métadonnées
             
+        Returns:
+            Tuple (lignes, matrice (n, d) float32), ([], None) si aucun document
+        """
+        if config.store_int8_embeddings:
+            try:
+                rows = self.supabase.rpc('get_embeddings_int8', {'filter': filters or {}}).execute().data
+                if rows:
+                    raw = bytes.fromhex(''.join(row['emb'][2:] for row in rows))
+                    values = np.frombuffer(raw, dtype=np.int8).reshape(len(rows), -1)
+                    scales = np.array([row['scale'] for row in rows], dtype=np.float32)
+                    return rows, values.astype(np.float32) * scales[:, None]
+            except Exception as e:
+                logger.warning(f"Export int8 des embeddings indisponible: {e}")
+        
+        try:
+            rows = self.supabase.rpc('get_embeddings_fp16', {'filter': filters or {}}).execute().data
+            if not rows:
+                return [], None
+            
+            # bytea est renvoyé en hexadécimal ('\\x...'), 4 octets d'en-tête par vecteur
+            raw = bytes.fromhex(''.join(row['emb'][2:] for row in rows))
+            packed = np.frombuffer(raw, dtype=np.uint8).reshape(len(rows), -1)[:, 4:]
+            matrix = np.ascontiguousarray(packed).view('>f2').astype(np.float32)
+            return rows, matrix
         except Exception as e:
-            logger.error(f"Erreur lors de l'ajout du document: {e}")
-            return False
+            logger.warning(f"Export binaire des embeddings indisponible: {e}")
+        
+        request = self.supabase.table('documents').select('content, metadata, embedding')
+        if filters:
+            request = request.contains('metadata', filters)
+        rows = [row for row in request.execute().data if row.get('embedding')]
+        if not rows:
+            return [], None
+        
+        return rows, self._parse_embeddings([row['embedding'] for row in rows])
+    
+    @staticmethod
+    def _parse_embeddings(values: List[Union[str, List[float]]]) -> np.ndarray:
+        """
+        Décode des embeddings renvoyés par PostgREST en une matrice float32.
+        
+        Les colonnes vector/halfvec arrivent sous forme de texte '[...]' :
+        toutes les lignes sont concaténées et décodées en un seul appel
+        np.fromstring au lieu d'un json.loads par ligne.
+        
+        Args:
+            values: Embeddings sous forme de texte '[...]' ou de listes
+            
+        Returns:
+            Matrice (n, d) float32
+        """
+        if not all(isinstance(value, str) for value in values):
+            loads = orjson.loads if orjson is not None else json.loads
+            return np.array([
+                loads(value) if isinstance(value, str) else value
+                for value in values
+            ], dtype=np.float32)
+        
+        flat = np.fromstring(','.join(value.strip()[1:-1] for value in values), dtype=np.float32, sep=',')
+        return flat.reshape(len(values), -1)
     
     def _fallback_search(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         """
         Recherche de fallback en cas d'erreur avec les embeddings.
         
+        Recherche plein texte indexée (voir scripts/create_text_search_function.sql),
+        ou, si la fonction n'existe pas, recherche textuelle simple.
+        
         Args:
             query: La requête de recherche
             max_results: Nombre maximum de résultats
@@ -146,8 +640,20 @@ class VectorRetriever:
             Liste des documents trouvés
         """
         try:
+            try:
+                response = self.supabase.rpc('text_search', {'q_text': query, 'k': max_results}).execute()
+                documents = [{
+                    'content': row.get('content', ''),
+                    'metadata': row.get('metadata', {}),
+                    'similarity_score': row.get('rank', 0.0)
+                } for row in response.data]
+                logger.info("Fallback: récupéré %d documents", len(documents))
+                return documents
+            except Exception as e:
+                logger.warning(f"Fonction text_search indisponible, recherche textuelle simple: {e}")
+            
             # Recherche textuelle simple
-            response = self.supabase.table('documents').select('*').ilike('content', f'%{query}%').limit(max_results).execute()
+            response = self.supabase.table('documents').select('content, metadata').ilike('content', f'%{query}%').limit(max_results).execute()
             
             documents = []
             for row in response.data:
@@ -157,7 +663,7 @@ class VectorRetriever:
                     'similarity_score': 0.5  # Score par défaut
                 })
             
-            logger.info(f"Fallback: récupéré {len(documents)} documents")
+            logger.info("Fallback: récupéré %d documents", len(documents))
             return documents
             
         except Exception as e:
@@ -175,7 +681,11 @@ class VectorRetriever:
             Le document ou None si non trouvé
         """
         try:
-            response = self.supabase.table('documents').select('*').eq('id', document_id).execute()
+            try:
+                # Requête paramétrée (scripts/create_document_lookup_functions.sql)
+                response = self.supabase.rpc('get_doc_by_id', {'doc_id': document_id}).execute()
+            except Exception:
+                response = self.supabase.table('documents').select(_DOCUMENT_COLUMNS).eq('id', document_id).execute()
             
             if response.data:
                 return response.data[0]
@@ -185,6 +695,33 @@ class VectorRetriever:
             logger.error(f"Erreur lors de la récupération du document {document_id}: {e}")
             return None
     
+    def get_documents_by_source(self, source: str) -> List[Dict[str, Any]]:
+        """
+        Récupère les chunks d'un document source.
+        
+        Args:
+            source: La source du document
+            
+        Returns:
+            Les chunks de la source, par ordre de chunk_id
+        """
+        try:
+            try:
+                response = self.supabase.rpc('get_docs_by_source', {'src': source}).execute()
+            except Exception:
+                response = (
+                    self.supabase.table('documents')
+                    .select(_DOCUMENT_COLUMNS)
+                    .eq('source', source)
+                    .order('chunk_id')
+                    .execute()
+                )
+            return response.data or []
+            
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération des documents de {source}: {e}")
+            return []
+    
     def delete_document(self, document_id: str) -> bool:
         """
         Supprime un document de la base vectorielle.
@@ -197,9 +734,25 @@ class VectorRetriever:
         """
         try:
             self.supabase.table('documents').delete().eq('id', document_id).execute()
+            self._invalidate_caches()
             logger.info(f"Document {document_id} supprimé")
             return True
             
         except Exception as e:
             logger.error(f"Erreur lors de la suppression du document {document_id}: {e}")
-            return False
\ No newline at end of file
+            return False
+
+
+@lru_cache(maxsize=1)
+def get_default_retriever() -> VectorRetriever:
+    """
+    Retourne le récupérateur vectoriel partagé
+    
+    Les composants construits à chaque requête (applications web, workers)
+    réutilisent ainsi le même client Supabase, ses connexions persistantes
+    et les caches d'embeddings et de résultats.
+    
+    Returns:
+        Récupérateur vectoriel
+    """
+    return VectorRetriever()
@@ -2,8 +2,8 @@
 Utilitaires du système RAG.
 """
 
-from .config import config
+from .config import get_config
 from .text_processing import TextProcessor, CharacterSplitter
 from .logging import setup_logging
 
-__all__ = ['config', 'TextProcessor', 'CharacterSplitter', 'setup_logging']
\ No newline at end of file
+__all__ = ['get_config', 'TextProcessor', 'CharacterSplitter', 'setup_logging']
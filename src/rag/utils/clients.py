@@ -0,0 +1,138 @@
+"""
+Clients API partagés
+====================
+
+Les clients Mistral, OpenAI et Cohere sont créés une seule fois par clé API
+et partagés par tous les composants (embeddings, génération, reranking) :
+ils utilisent le même client HTTP, dont le pool de connexions keep-alive
+évite de refaire une poignée de main TCP/TLS à chaque nouvelle instance.
+Le client Supabase est lui aussi partagé par (URL, clé).
+
+Lorsque le paquet h2 est installé (httpx[http2]), les clients HTTP
+négocient HTTP/2 : les requêtes simultanées sont multiplexées sur une
+même connexion TLS au lieu d'ouvrir une connexion par requête.
+"""
+
+import atexit
+from functools import lru_cache
+
+import cohere
+import httpx
+from mistralai import Mistral
+from openai import OpenAI
+from supabase import Client as SupabaseClient, create_client
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:  # HTTP/2 optionnel (pip install httpx[http2])
+    HTTP2_AVAILABLE = False
+
+HTTP_TIMEOUT = 30.0
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=30.0)
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    """
+    Retourne le client HTTP synchrone partagé (pool de connexions persistantes)
+    
+    Returns:
+        Client httpx, HTTP/2 si disponible
+    """
+    return httpx.Client(http2=HTTP2_AVAILABLE, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+
+
+def make_async_http_client() -> httpx.AsyncClient:
+    """
+    Crée un client HTTP asynchrone (HTTP/2 si disponible)
+
+    Non mis en cache : un client asynchrone reste lié à la boucle
+    d'événements qui l'utilise.
+
+    Returns:
+        Client httpx asynchrone
+    """
+    return httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+
+
+@lru_cache(maxsize=8)
+def get_mistral_client(api_key: str) -> Mistral:
+    """
+    Retourne le client Mistral partagé pour une clé API
+
+    Args:
+        api_key: Clé API Mistral
+
+    Returns:
+        Client Mistral
+    """
+    return Mistral(api_key=api_key, client=get_http_client())
+
+
+@lru_cache(maxsize=8)
+def get_openai_client(api_key: str) -> OpenAI:
+    """
+    Retourne le client OpenAI partagé pour une clé API
+
+    Args:
+        api_key: Clé API OpenAI
+
+    Returns:
+        Client OpenAI
+    """
+    return OpenAI(api_key=api_key, http_client=get_http_client())
+
+
+@lru_cache(maxsize=8)
+def get_cohere_client(api_key: str) -> cohere.Client:
+    """
+    Retourne le client Cohere partagé pour une clé API
+
+    Args:
+        api_key: Clé API Cohere
+
+    Returns:
+        Client Cohere
+    """
+    return cohere.Client(api_key, httpx_client=get_http_client())
+
+
+@lru_cache(maxsize=8)
+def get_cohere_client_v2(api_key: str) -> cohere.ClientV2:
+    """
+    Retourne le client Cohere v2 partagé pour une clé API (attendu par
+    langchain_cohere)
+
+    Args:
+        api_key: Clé API Cohere
+
+    Returns:
+        Client Cohere v2
+    """
+    return cohere.ClientV2(api_key, httpx_client=get_http_client())
+
+
+@lru_cache(maxsize=8)
+def get_supabase_client(url: str, key: str) -> SupabaseClient:
+    """
+    Retourne le client Supabase partagé pour une URL et une clé
+
+    Args:
+        url: URL du projet Supabase
+        key: Clé API Supabase
+
+    Returns:
+        Client Supabase
+    """
+    return create_client(url, key)
+
+
+@atexit.register
+def close_http_clients() -> None:
+    """Ferme le client HTTP partagé et oublie les clients qui l'utilisent"""
+    if get_http_client.cache_info().currsize:
+        get_http_client().close()
+    for factory in (get_http_client, get_mistral_client, get_openai_client, get_cohere_client,
+                    get_cohere_client_v2, get_supabase_client):
+        factory.cache_clear()
@@ -6,13 +6,14 @@ Gestion centralisée de la configuration pour le système RAG.
 """
 
 import os
+from functools import lru_cache
 from typing import Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field
-from dotenv import load_dotenv
+from dotenv import dotenv_values, find_dotenv
 
-# Charger les variables d'environnement
-load_dotenv()
+# Variables d'environnement définies par le fichier .env (et non par le shell)
+_dotenv_keys: set = set()
 
 
 class RAGConfig(BaseSettings):
@@ -50,29 +51,145 @@ class RAGConfig(BaseSettings):
     mistral_embedding_model: str = "mistral-embed"
     openai_embedding_model: str = "text-embedding-3-small"
     
+    # Découpage des requêtes d'embeddings (taille des sous-lots, requêtes simultanées)
+    embedding_sub_batch_size: int = 256
+    embedding_concurrency: int = 4
+    
+    # Cache d'embeddings (LRU en mémoire + SQLite sur disque)
+    embedding_cache_path: Optional[str] = ".rag_cache/embeddings.db"
+    embedding_cache_max_entries: int = 10000
+    embedding_cache_dtype: str = "float16"  # "float32", "float16" ou "int8"
+    
+    # Cache sémantique des résultats de VectorRetriever.retrieve
+    retrieval_cache_threshold: float = 0.95
+    retrieval_cache_max_entries: int = 1000
+    retrieval_cache_ttl: float = 15 * 60
+    
+    # Ingestion OCR : nombre de documents embeddés par appel API
+    ocr_embedding_batch_size: int = 32
+    # Préprocessing OCR par noyaux Numba fusionnés (sinon OpenCV)
+    ocr_fused_preprocess: bool = False
+    # Pages de PDF reconnues ensemble par EasyOCR lorsque le GPU est disponible
+    ocr_gpu_page_batch: int = 8
+    # Mode hybride : confiance Tesseract (0-100) au-delà de laquelle EasyOCR n'est pas lancé
+    ocr_hybrid_confidence_threshold: float = 85.0
+    
+    # Cache des réponses de RAGChain (question exacte puis question proche)
+    query_embedding_cache_size: int = 1024
+    answer_cache_threshold: float = 0.97
+    answer_cache_max_entries: int = 256
+    answer_cache_ttl: float = 15 * 60
+    
     # Generation Models
     mistral_generation_model: str = "mistral-large-latest"
     openai_generation_model: str = "gpt-4"
     
+    # Cache des réponses générées (SQLite). Désactivé si temperature > 0,
+    # sauf si generation_cache_nondeterministic est activé.
+    generation_cache_path: Optional[str] = ".rag_cache/completions.db"
+    generation_cache_ttl: int = 7 * 86400
+    generation_cache_nondeterministic: bool = False
+    
     # Vector Database Settings
     vector_dimension: int = 1024  # Mistral embeddings dimension
     similarity_threshold: float = 0.7
     max_retrieved_chunks: int = 5
+    # Requêtes plus courtes ignorées (sans appel API), requêtes trop longues tronquées
+    min_query_length: int = 3
+    max_query_words: int = 512
+    
+    # Stockage des embeddings ("float32", ou "float16" après migrate_halfvec.sql)
+    embedding_storage_dtype: str = "float32"
+    
+    # Recherche en deux étapes sur la quantification binaire (migrate_halfvec.sql)
+    enable_binary_search: bool = False
+    binary_candidate_count: int = 500
+    # Candidats explorés par les index HNSW (migrate_hnsw_search_params.sql)
+    hnsw_ef_search: Optional[int] = None
+    
+    # Copie int8 des embeddings pour la recherche côté client (migrate_int8_embeddings.sql)
+    store_int8_embeddings: bool = False
+    
+    # Recherche hybride (plein texte + vectorielle, fusion RRF)
+    enable_hybrid: bool = False
+    hybrid_rrf_k: int = 60
     
     # Reranking Settings
     cohere_rerank_model: str = "rerank-multilingual-v3.0"
     rerank_top_k: int = 3
+    # Cache des scores Cohere par (requête, document)
+    rerank_cache_ttl: float = 15 * 60
+    rerank_cache_max_entries: int = 10000
     enable_reranking: bool = True
     
+    # Combinaison des documents dans RAGChain : "stuff" (un seul prompt) ou
+    # "refine" (affinage par groupes de refine_batch_size documents)
+    rag_chain_type: str = "stuff"
+    refine_batch_size: int = 3
+    
+    # Traitement des requêtes en lot
+    query_concurrency: int = 16
+    
+    # Agents : nombre d'appels d'outils exécutés simultanément
+    tool_concurrency_limit: int = Field(4, env="TOOL_CONCURRENCY_LIMIT")
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
 
 
+def _load_dotenv() -> None:
+    """
+    Charge le fichier .env dans os.environ
+    
+    Les variables déjà définies par l'environnement restent prioritaires ;
+    celles qui viennent d'un chargement précédent du fichier sont remplacées
+    (ou retirées) pour suivre ses modifications.
+    """
+    values = {key: value for key, value in dotenv_values(find_dotenv()).items() if value is not None}
+    for key in _dotenv_keys - values.keys():
+        os.environ.pop(key, None)
+        _dotenv_keys.discard(key)
+    for key, value in values.items():
+        if key in os.environ and key not in _dotenv_keys:
+            continue
+        os.environ[key] = value
+        _dotenv_keys.add(key)
+
+
+@lru_cache(maxsize=1)
 def get_config() -> RAGConfig:
-    """Obtenir la configuration du système RAG"""
+    """
+    Obtenir la configuration du système RAG
+    
+    Le fichier .env est lu et la configuration validée une seule fois, au
+    premier accès ; get_config.cache_clear() force leur relecture.
+    """
+    _load_dotenv()
     return RAGConfig()
 
 
-# Instance globale de configuration
-config = get_config()
+class _LazyConfig:
+    """
+    Configuration globale résolue à chaque accès
+    
+    `from ..utils.config import config` n'instancie pas RAGConfig : chaque
+    lecture d'attribut passe par get_config(), au moment de l'utilisation
+    (et suit donc un get_config.cache_clear()). Les fonctions qui lisent
+    plusieurs paramètres lient plutôt cfg = get_config() une fois par appel.
+    """
+    
+    __slots__ = ()
+    
+    def __getattr__(self, name: str):
+        return getattr(get_config(), name)
+    
+    def __setattr__(self, name: str, value) -> None:
+        setattr(get_config(), name, value)
+    
+    def __repr__(self) -> str:
+        return repr(get_config())
+
+
+# Instance globale de configuration (validée au premier accès à un attribut)
+config = _LazyConfig()
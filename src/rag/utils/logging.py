@@ -18,6 +18,10 @@ def setup_logging(
     """
     Configure le système de logging
     
+    Un nouvel appel avec les mêmes paramètres (ex: à chaque réexécution
+    d'un script Streamlit) retourne le logger déjà configuré sans
+    recréer ses handlers.
+    
     Args:
         level: Niveau de logging (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Fichier de log (optionnel)
@@ -35,15 +39,21 @@ def setup_logging(
     
     # Configuration du logger principal
     logger = logging.getLogger("rag_system")
-    logger.setLevel(getattr(logging, level.upper()))
+    settings = (level.upper(), log_file, format_string)
+    if getattr(logger, "_rag_settings", None) == settings and logger.handlers:
+        return logger
+    
+    level_value = getattr(logging, settings[0])
+    logger.setLevel(level_value)
     
-    # Supprimer les handlers existants
+    # Supprimer (et fermer) les handlers existants
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
+        handler.close()
     
     # Handler pour la console
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, level.upper()))
+    console_handler.setLevel(level_value)
     console_formatter = logging.Formatter(format_string)
     console_handler.setFormatter(console_formatter)
     logger.addHandler(console_handler)
@@ -51,13 +61,14 @@ def setup_logging(
     # Handler pour le fichier (si spécifié)
     if log_file:
         file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(getattr(logging, level.upper()))
+        file_handler.setLevel(level_value)
         file_formatter = logging.Formatter(format_string)
         file_handler.setFormatter(file_formatter)
         logger.addHandler(file_handler)
     
     # Éviter la duplication des logs
     logger.propagate = False
+    logger._rag_settings = settings
     
     return logger
 
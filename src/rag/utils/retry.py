@@ -0,0 +1,124 @@
+"""
+Relance des appels API
+======================
+
+Politique de relance commune aux appels vers les fournisseurs (Mistral,
+OpenAI) : backoff exponentiel avec gigue, limité aux erreurs transitoires
+(429, 5xx, erreurs réseau), en respectant l'en-tête Retry-After lorsqu'il
+est présent.
+"""
+
+import logging
+from typing import Optional
+
+import httpx
+from tenacity import (
+    RetryCallState,
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+# Statuts indiquant une requête trop volumineuse (à découper)
+BATCH_SIZE_STATUS_CODES = {413, 422, 429}
+
+_backoff = wait_random_exponential(multiplier=1, min=1, max=60)
+
+
+def _response(exc: BaseException) -> Optional[httpx.Response]:
+    """Réponse HTTP associée à une exception du SDK (OpenAI ou Mistral)"""
+    return getattr(exc, "response", None) or getattr(exc, "raw_response", None)
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """
+    Indique si une erreur d'API mérite d'être relancée
+
+    Args:
+        exc: Exception levée par le client
+
+    Returns:
+        True pour les limites de débit, erreurs serveur et erreurs réseau
+    """
+    if isinstance(exc, httpx.TransportError):
+        return True
+
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        response = _response(exc)
+        status = getattr(response, "status_code", None)
+    if status is None:
+        # Erreurs de connexion des SDK (ex: openai.APIConnectionError)
+        return isinstance(exc.__cause__, httpx.TransportError)
+    return status in RETRYABLE_STATUS_CODES
+
+
+def is_batch_size_error(exc: BaseException) -> bool:
+    """
+    Indique si une erreur d'API est due à la taille du lot envoyé
+
+    Args:
+        exc: Exception levée par le client (après épuisement des relances)
+
+    Returns:
+        True si réduire la taille du lot peut permettre à la requête d'aboutir
+    """
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(_response(exc), "status_code", None)
+    if status in BATCH_SIZE_STATUS_CODES:
+        return True
+    if status == 400:
+        message = str(exc).lower()
+        return any(hint in message for hint in ("token", "too many", "too large"))
+    return False
+
+
+def _wait(retry_state: RetryCallState) -> float:
+    """Délai avant la prochaine tentative : Retry-After si fourni, sinon backoff"""
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    response = _response(exc) if exc is not None else None
+    headers = getattr(response, "headers", None)
+
+    if headers is not None:
+        retry_after = headers.get("retry-after")
+        try:
+            if retry_after is not None:
+                return min(float(retry_after), 60.0)
+        except ValueError:
+            pass
+
+    return _backoff(retry_state)
+
+
+def _log_retry(retry_state: RetryCallState) -> None:
+    """Journalise chaque relance"""
+    exc = retry_state.outcome.exception()
+    logger.warning(
+        f"Erreur transitoire sur {retry_state.fn.__qualname__} "
+        f"(tentative {retry_state.attempt_number}), nouvelle tentative dans "
+        f"{retry_state.next_action.sleep:.1f}s: {str(exc)}"
+    )
+
+
+def api_retry(max_attempts: int = 5):
+    """
+    Décorateur de relance pour les appels API (fonctions sync ou async)
+
+    Args:
+        max_attempts: Nombre maximum de tentatives
+
+    Returns:
+        Décorateur tenacity
+    """
+    return retry(
+        retry=retry_if_exception(is_transient_error),
+        wait=_wait,
+        stop=stop_after_attempt(max_attempts),
+        before_sleep=_log_retry,
+        reraise=True,
+    )
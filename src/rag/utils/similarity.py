@@ -0,0 +1,177 @@
+"""
+Utilitaires de similarité vectorielle
+=====================================
+
+Ce module regroupe les opérations NumPy sur les embeddings :
+- Normalisation L2
+- Calcul de similarité cosinus
+- Recherche des plus proches voisins (noyaux Numba optionnels)
+- Signatures LSH par projections aléatoires
+"""
+
+from typing import List, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # Numba est optionnel
+    numba = None
+
+ArrayLike = Union[Sequence[float], Sequence[Sequence[float]], np.ndarray]
+
+# En dessous de ce nombre de lignes, le coût d'appel de BLAS domine :
+# une boucle compilée par Numba est plus rapide que le produit matriciel.
+NUMBA_MAX_ROWS = 2048
+
+
+def l2_normalize(vectors: ArrayLike, eps: float = 1e-12) -> np.ndarray:
+    """
+    Normalise des embeddings à une norme L2 unitaire
+    
+    Une fois les vecteurs normalisés, la similarité cosinus se réduit à
+    un simple produit scalaire.
+    
+    Args:
+        vectors: Vecteur (d,) ou matrice (n, d)
+        eps: Norme minimale en dessous de laquelle un vecteur est laissé tel quel
+        
+    Returns:
+        Tableau float32 normalisé de même forme
+    """
+    arr = np.asarray(vectors, dtype=np.float32)
+    
+    if arr.ndim == 1:
+        norm = float(np.linalg.norm(arr))
+        return arr / norm if norm > eps else arr.copy()
+    
+    norms = np.linalg.norm(arr, axis=1, keepdims=True)
+    norms[norms < eps] = 1.0
+    return arr / norms
+
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True)
+    def _top1_dot_numba(matrix: np.ndarray, query: np.ndarray) -> Tuple[int, float]:
+        best = -np.inf
+        idx = -1
+        for i in range(matrix.shape[0]):
+            score = 0.0
+            for j in range(matrix.shape[1]):
+                score += matrix[i, j] * query[j]
+            if score > best:
+                best = score
+                idx = i
+        return idx, best
+    
+    @numba.njit(cache=True, parallel=True, fastmath=True)
+    def _dot_scores_numba(matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+        scores = np.empty(matrix.shape[0], dtype=np.float32)
+        for i in numba.prange(matrix.shape[0]):
+            acc = np.float32(0.0)
+            for j in range(matrix.shape[1]):
+                acc += matrix[i, j] * query[j]
+            scores[i] = acc
+        return scores
+    
+    @numba.njit(cache=True, fastmath=True)
+    def _lsh_signatures_numba(vector: np.ndarray, projections: np.ndarray) -> np.ndarray:
+        n_tables, dim, n_bits = projections.shape
+        signatures = np.zeros(n_tables, dtype=np.int64)
+        for t in range(n_tables):
+            for b in range(n_bits):
+                acc = np.float32(0.0)
+                for j in range(dim):
+                    acc += vector[j] * projections[t, j, b]
+                if acc > 0:
+                    signatures[t] |= np.int64(1) << b
+        return signatures
+else:
+    _top1_dot_numba = None
+    _dot_scores_numba = None
+    _lsh_signatures_numba = None
+
+
+def top1_similarity(matrix: np.ndarray, query: np.ndarray) -> Tuple[int, float]:
+    """
+    Trouve la ligne de la matrice la plus similaire à la requête
+    
+    Les vecteurs doivent être normalisés : le produit scalaire est alors
+    égal à la similarité cosinus. Pour les petites matrices, un noyau Numba
+    est utilisé s'il est disponible ; sinon, un produit matriciel NumPy.
+    
+    Args:
+        matrix: Matrice (n, d) de vecteurs normalisés
+        query: Vecteur (d,) normalisé
+        
+    Returns:
+        Tuple (index, score), (-1, -1.0) si la matrice est vide
+    """
+    if matrix.shape[0] == 0:
+        return -1, -1.0
+    
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    query = np.ascontiguousarray(query, dtype=np.float32)
+    
+    if _top1_dot_numba is not None and matrix.shape[0] < NUMBA_MAX_ROWS:
+        idx, best = _top1_dot_numba(matrix, query)
+        return int(idx), float(best)
+    
+    scores = matrix @ query
+    idx = int(np.argmax(scores))
+    return idx, float(scores[idx])
+
+
+def cosine_topk(matrix: np.ndarray, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Trouve les k lignes de la matrice les plus similaires à la requête
+    
+    Les vecteurs doivent être normalisés. Les scores sont calculés par un
+    noyau Numba parallèle pour les petites matrices (sinon par BLAS), puis
+    les k meilleurs sont sélectionnés par argpartition.
+    
+    Args:
+        matrix: Matrice (n, d) de vecteurs normalisés
+        query: Vecteur (d,) normalisé
+        k: Nombre de voisins
+        
+    Returns:
+        Tuple (indices, scores) triés par score décroissant
+    """
+    n = matrix.shape[0]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    query = np.ascontiguousarray(query, dtype=np.float32)
+    
+    if _dot_scores_numba is not None and n < NUMBA_MAX_ROWS:
+        scores = _dot_scores_numba(matrix, query)
+    else:
+        scores = matrix @ query
+    
+    idx = np.argpartition(-scores, k - 1)[:k] if k < n else np.arange(n)
+    idx = idx[np.argsort(-scores[idx])]
+    return idx, scores[idx]
+
+
+def lsh_signatures(vector: np.ndarray, projections: np.ndarray) -> Tuple[int, ...]:
+    """
+    Calcule les signatures LSH (projections aléatoires) d'un vecteur
+    
+    Args:
+        vector: Vecteur (d,)
+        projections: Projections (n_tables, d, n_bits), n_bits <= 63
+        
+    Returns:
+        Une signature entière par table (bit b = signe de la projection b)
+    """
+    vector = np.ascontiguousarray(vector, dtype=np.float32)
+    
+    if _lsh_signatures_numba is not None:
+        return tuple(int(sig) for sig in _lsh_signatures_numba(vector, projections))
+    
+    bits = np.einsum("d,tdb->tb", vector, projections) > 0
+    weights = np.left_shift(1, np.arange(projections.shape[2], dtype=np.int64))
+    return tuple(int(sig) for sig in bits @ weights)
@@ -10,12 +10,24 @@ Ce module contient les utilitaires de traitement de texte :
 
 import re
 import tiktoken
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from abc import ABC, abstractmethod
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Expressions régulières compilées une seule fois
+_CONTROL_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]')
+_WHITESPACE = re.compile(r'\s+')
+_SENTENCE_END = re.compile(r'[.!?]+')
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str) -> tiktoken.Encoding:
+    """Encodage tiktoken d'un modèle, chargé une seule fois par processus"""
+    return tiktoken.encoding_for_model(model)
+
 
 class DocumentSplitter(ABC):
     """Classe abstraite pour le découpage de documents"""
@@ -35,24 +47,22 @@ class CharacterSplitter(DocumentSplitter):
     
     def split(self, text: str, **kwargs) -> List[Dict[str, Any]]:
         """Découpe le texte par caractères"""
-        chunks = []
-        start = 0
+        chunks = (
+            (start, text[start:start + self.chunk_size])
+            for start in range(0, len(text), self.chunk_size - self.chunk_overlap)
+        )
         
-        while start < len(text):
-            end = start + self.chunk_size
-            chunk_text = text[start:end]
-            
-            if chunk_text.strip():
-                chunks.append({
-                    'content': chunk_text,
-                    'start': start,
-                    'end': end,
-                    'length': len(chunk_text)
-                })
-            
-            start = end - self.chunk_overlap
-            
-        return chunks
+        # isspace() teste les chunks vides sans créer de copie comme strip()
+        return [
+            {
+                'content': chunk_text,
+                'start': start,
+                'end': start + len(chunk_text),
+                'length': len(chunk_text)
+            }
+            for start, chunk_text in chunks
+            if not chunk_text.isspace()
+        ]
 
 
 class TokenSplitter(DocumentSplitter):
@@ -62,31 +72,27 @@ class TokenSplitter(DocumentSplitter):
         self.model = model
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
-        self.encoding = tiktoken.encoding_for_model(model)
+        self.encoding = _get_encoding(model)
     
     def split(self, text: str, **kwargs) -> List[Dict[str, Any]]:
         """Découpe le texte par tokens"""
         tokens = self.encoding.encode(text)
-        chunks = []
-        start = 0
+        step = self.chunk_size - self.chunk_overlap
+        starts = range(0, len(tokens), step)
         
-        while start < len(tokens):
-            end = start + self.chunk_size
-            chunk_tokens = tokens[start:end]
-            chunk_text = self.encoding.decode(chunk_tokens)
-            
-            if chunk_text.strip():
-                chunks.append({
-                    'content': chunk_text,
-                    'start': start,
-                    'end': end,
-                    'token_count': len(chunk_tokens),
-                    'tokens': chunk_tokens
-                })
-            
-            start = end - self.chunk_overlap
-            
-        return chunks
+        # Un seul appel de décodage pour tous les chunks
+        texts = self.encoding.decode_batch([tokens[start:start + self.chunk_size] for start in starts])
+        
+        return [
+            {
+                'content': chunk_text,
+                'start': start,
+                'end': start + self.chunk_size,
+                'token_count': min(self.chunk_size, len(tokens) - start)
+            }
+            for start, chunk_text in zip(starts, texts)
+            if chunk_text.strip()
+        ]
 
 
 class SentenceSplitter(DocumentSplitter):
@@ -99,38 +105,44 @@ class SentenceSplitter(DocumentSplitter):
     def split(self, text: str, **kwargs) -> List[Dict[str, Any]]:
         """Découpe le texte par phrases"""
         # Découper en phrases
-        sentences = re.split(r'[.!?]+', text)
+        sentences = _SENTENCE_END.split(text)
         sentences = [s.strip() for s in sentences if s.strip()]
         
         chunks = []
-        current_chunk = ""
+        # Phrases du chunk en cours, jointes une seule fois à sa finalisation
+        buffer: List[str] = []
+        buffer_len = 0
         start_char = 0
         
         for sentence in sentences:
             # Vérifier si ajouter cette phrase dépasse la taille limite
-            if len(current_chunk) + len(sentence) > self.chunk_size and current_chunk:
+            if buffer_len + len(sentence) > self.chunk_size and buffer:
                 # Finaliser le chunk actuel
+                chunk_text = " ".join(buffer)
                 chunks.append({
-                    'content': current_chunk.strip(),
+                    'content': chunk_text,
                     'start': start_char,
-                    'end': start_char + len(current_chunk),
-                    'length': len(current_chunk)
+                    'end': start_char + len(chunk_text),
+                    'length': len(chunk_text)
                 })
                 
                 # Commencer un nouveau chunk avec overlap
-                overlap_text = current_chunk[-self.chunk_overlap:] if len(current_chunk) > self.chunk_overlap else current_chunk
-                current_chunk = overlap_text + " " + sentence
-                start_char += len(current_chunk) - len(overlap_text) - len(sentence) - 1
+                overlap_text = chunk_text[-self.chunk_overlap:].lstrip() if self.chunk_overlap > 0 else ""
+                start_char += len(chunk_text) - len(overlap_text)
+                buffer = [overlap_text, sentence] if overlap_text else [sentence]
+                buffer_len = len(overlap_text) + 1 + len(sentence) if overlap_text else len(sentence)
             else:
-                current_chunk += " " + sentence if current_chunk else sentence
+                buffer_len += len(sentence) + 1 if buffer else len(sentence)
+                buffer.append(sentence)
         
         # Ajouter le dernier chunk
-        if current_chunk.strip():
+        if buffer:
+            chunk_text = " ".join(buffer)
             chunks.append({
-                'content': current_chunk.strip(),
+                'content': chunk_text,
                 'start': start_char,
-                'end': start_char + len(current_chunk),
-                'length': len(current_chunk)
+                'end': start_char + len(chunk_text),
+                'length': len(chunk_text)
             })
         
         return chunks
@@ -145,10 +157,10 @@ class TextProcessor:
     def clean_text(self, text: str) -> str:
         """Nettoie le texte"""
         # Supprimer les caractères de contrôle
-        text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]', '', text)
+        text = _CONTROL_CHARS.sub('', text)
         
         # Normaliser les espaces
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE.sub(' ', text)
         
         # Supprimer les espaces en début/fin
         text = text.strip()
@@ -163,34 +175,52 @@ class TextProcessor:
         # Découper
         chunks = self.splitter.split(clean_text, **kwargs)
         
-        # Ajouter des métadonnées
+        # Ajouter des métadonnées (le texte est déjà nettoyé : seuls les
+        # espaces de bord des chunks restent à retirer)
         for i, chunk in enumerate(chunks):
             chunk['chunk_id'] = i
-            chunk['content'] = self.clean_text(chunk['content'])
+            chunk['content'] = chunk['content'].strip()
         
         return chunks
     
     def split_documents(self, documents: List[Dict[str, Any]], **kwargs) -> List[Dict[str, Any]]:
-        """Découpe plusieurs documents"""
+        """
+        Découpe plusieurs documents
+        
+        Les chunks d'un document partagent le même dictionnaire
+        document_metadata, lui-même partagé entre documents aux métadonnées
+        identiques : ne pas le modifier via un chunk.
+        """
         all_chunks = []
+        interned: Dict[Any, Dict[str, Any]] = {}
         
         for doc_idx, document in enumerate(documents):
             content = document.get('content', document.get('text', ''))
             chunks = self.split_document(content, **kwargs)
             
-            # Ajouter les métadonnées du document original
+            # Métadonnées du document original, résolues une fois par document
+            document_fields = {
+                'document_id': document.get('id', doc_idx),
+                'document_metadata': _intern_metadata(interned, document.get('metadata', {})),
+                'source': document.get('source', 'unknown')
+            }
             for chunk in chunks:
-                chunk.update({
-                    'document_id': document.get('id', doc_idx),
-                    'document_metadata': document.get('metadata', {}),
-                    'source': document.get('source', 'unknown')
-                })
+                chunk.update(document_fields)
             
             all_chunks.extend(chunks)
         
         return all_chunks
 
 
+def _intern_metadata(interned: Dict[Any, Dict[str, Any]], metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Retourne une instance partagée des métadonnées identiques déjà vues"""
+    try:
+        key = tuple(sorted(metadata.items()))
+        return interned.setdefault(key, metadata)
+    except TypeError:  # valeurs non hachables (listes, dictionnaires)
+        return metadata
+
+
 def create_splitter(splitter_type: str = "character", **kwargs) -> DocumentSplitter:
     """Factory pour créer des splitters"""
     if splitter_type == "character":
@@ -0,0 +1,67 @@
+"""
+Tests du préprocessing OCR fusionné (Numba) contre le chemin OpenCV.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+pytest.importorskip("numba")
+
+# Chargement direct du module : le paquet rag.ocr importe torch et easyocr
+_MODULE_NAME = "rag.ocr.preprocessing"
+_MODULE_PATH = Path(__file__).resolve().parents[1] / "src" / "rag" / "ocr" / "preprocessing.py"
+
+if _MODULE_NAME in sys.modules:
+    preprocessing = sys.modules[_MODULE_NAME]
+else:
+    _spec = importlib.util.spec_from_file_location(_MODULE_NAME, _MODULE_PATH)
+    preprocessing = importlib.util.module_from_spec(_spec)
+    sys.modules[_MODULE_NAME] = preprocessing
+    _spec.loader.exec_module(preprocessing)
+
+# Tailles multiples ou non du nombre de tuiles (8)
+SIZES = [(64, 64), (100, 90), (101, 64), (37, 53), (2200, 1700)]
+
+
+def _document_like(h: int, w: int, seed: int = 0) -> np.ndarray:
+    """Image en niveaux de gris lisse, sur toute la plage 0-255"""
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 256, (h, w)).astype(np.uint8)
+    blurred = cv2.GaussianBlur(noise, (0, 0), 3)
+    return cv2.normalize(blurred, None, 0, 255, cv2.NORM_MINMAX)
+
+
+def _opencv_path(gray: np.ndarray):
+    """Chemin OpenCV de OCRProcessor._preprocess_image (CLAHE, image binaire)"""
+    denoised = cv2.medianBlur(gray, 3)
+    enhanced = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)).apply(denoised)
+    _, binary = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return denoised, enhanced, binary
+
+
+@pytest.mark.parametrize("h,w", SIZES)
+def test_clahe_matches_opencv(h, w):
+    gray = _document_like(h, w)
+    denoised, expected, _ = _opencv_path(gray)
+
+    luts = preprocessing._clahe_luts(denoised, 8, 2.0)
+    enhanced, _ = preprocessing._apply_clahe(denoised, luts, 8)
+
+    # Arrondis flottants près
+    assert np.abs(enhanced.astype(np.int16) - expected).max() <= 1
+
+
+@pytest.mark.parametrize("h,w", SIZES)
+def test_fused_preprocess_matches_opencv(h, w):
+    gray = _document_like(h, w, seed=1)
+    _, _, expected = _opencv_path(gray)
+
+    binary = preprocessing.fused_preprocess(gray, clip_limit=2.0, tiles=8)
+
+    assert binary.shape == expected.shape
+    assert np.mean(binary != expected) < 0.005
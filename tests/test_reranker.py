@@ -0,0 +1,36 @@
+"""
+Tests de la détection des requêtes littérales du reranker.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+reranker = pytest.importorskip("rag.retrieval.reranker")
+
+
+@pytest.mark.parametrize("query", [
+    "3.14",
+    "node.js",
+    "asp.net",
+    "2023.pdf",
+    "Comment installer node.js ?",
+    "quelle est la valeur de pi",
+])
+def test_natural_language_queries_are_not_literal(query):
+    assert reranker.is_literal(query) is None
+
+
+@pytest.mark.parametrize("query,literal", [
+    ("rapport.pdf", "rapport.pdf"),
+    ("Rapport_2023.PDF", "Rapport_2023.PDF"),
+    ("  scan-01.jpeg ", "scan-01.jpeg"),
+    ("compte.rendu.docx", "compte.rendu.docx"),
+    ('"clause 3.2"', "clause 3.2"),
+    ("« délai de préavis »", " délai de préavis "),
+])
+def test_literal_queries(query, literal):
+    assert reranker.is_literal(query) == literal
@@ -3,15 +3,46 @@
 Interface web Flask pour tester le système RAG.
 """
 
-from flask import Flask, render_template_string, request, jsonify
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import DefaultJSONProvider
+import gzip
+import hashlib
 import sys
 from pathlib import Path
 import os
 
+try:
+    import orjson
+except ImportError:  # orjson est optionnel
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # brotli est optionnel (gzip sinon)
+    brotli = None
+
 # Ajouter le répertoire src au path
 sys.path.append(str(Path(__file__).parent / "src"))
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Sérialisation JSON par orjson (réponses en bytes, sans passer par json)"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, default=self.default), mimetype=self.mimetype)
+
+
 app = Flask(__name__)
+if orjson is not None:
+    # jsonify passe par app.json
+    app.json = OrjsonProvider(app)
 
 # Template HTML simple
 HTML_TEMPLATE = """
@@ -584,9 +615,34 @@ HTML_TEMPLATE = """
 </html>
 """
 
+# Le template n'a pas de variables : il est rendu (et compressé) une seule
+# fois au démarrage, variantes par Content-Encoding de la plus compacte à
+# la moins compacte
+_INDEX_BYTES = app.jinja_env.from_string(HTML_TEMPLATE).render().encode('utf-8')
+_INDEX_ETAG = hashlib.blake2b(_INDEX_BYTES, digest_size=8).hexdigest()
+_INDEX_VARIANTS = {}
+if brotli is not None:
+    _INDEX_VARIANTS['br'] = brotli.compress(_INDEX_BYTES, quality=11)
+_INDEX_VARIANTS['gzip'] = gzip.compress(_INDEX_BYTES, 9)
+
 @app.route('/')
 def index():
-    return render_template_string(HTML_TEMPLATE)
+    encoding = next((e for e in _INDEX_VARIANTS if request.accept_encodings[e]), None)
+    body = _INDEX_VARIANTS[encoding] if encoding else _INDEX_BYTES
+    # Une ETag par représentation
+    etag = f'{_INDEX_ETAG}-{encoding}' if encoding else _INDEX_ETAG
+    headers = {
+        'ETag': f'"{etag}"',
+        'Cache-Control': 'public, max-age=300',
+        'Vary': 'Accept-Encoding'
+    }
+    
+    # Page inchangée depuis la dernière visite : 304 sans corps
+    if etag in request.if_none_match:
+        return Response(status=304, headers=headers)
+    if encoding:
+        headers['Content-Encoding'] = encoding
+    return Response(body, mimetype='text/html', headers=headers)
 
 @app.route('/api/rag', methods=['POST'])
 def rag_api():
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Point d'entrée WSGI de l'interface web Flask (production).
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Les workers gevent traitent de nombreuses requêtes simultanées : les appels
+aux API (Mistral, OpenAI, Cohere, Supabase) sont des attentes réseau. Le
+patch de la bibliothèque standard (socket, ssl, threading) doit précéder
+tout autre import, pour que httpx et requests deviennent coopératifs.
+"""
+
+from gevent import monkey
+
+monkey.patch_all()
+
+from web_app import app  # noqa: E402
+
+__all__ = ['app']